@@ -0,0 +1,130 @@
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Tuple, Type, Union
+
+from autonet_arista.eos import metrics
+from autonet_arista.eos.exceptions import DeviceUnavailable
+
+CLOSED = 'closed'
+HALF_OPEN = 'half-open'
+OPEN = 'open'
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+"""Values reported by the `arista_circuit_breaker_state` gauge."""
+
+
+class CircuitBreaker(object):
+    """
+    Tracks consecutive failures to communicate with a device.
+
+    Once `failure_threshold` consecutive failures occur the breaker
+    opens, and calls fail immediately with :py:exc:`DeviceUnavailable`
+    rather than waiting on an unresponsive device.  After
+    `reset_timeout` seconds the breaker becomes half-open and a single
+    call is let through as a probe.  If the probe succeeds the breaker
+    closes, otherwise it opens again.
+    """
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._set_state(CLOSED)
+
+    def _set_state(self, state: str):
+        self.state = state
+        metrics.set_gauge('arista_circuit_breaker_state',
+                          STATE_VALUES[state], device=self.name)
+
+    def _acquire(self):
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    metrics.increment('arista_circuit_breaker_rejected_total',
+                                      device=self.name)
+                    raise DeviceUnavailable(self.name, remaining)
+                self._set_state(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                # Only one probe is allowed through at a time.
+                if self._probing:
+                    metrics.increment('arista_circuit_breaker_rejected_total',
+                                      device=self.name)
+                    raise DeviceUnavailable(self.name, 0)
+                self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    metrics.increment('arista_circuit_breaker_opened_total',
+                                      device=self.name)
+                self._opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    @contextmanager
+    def guard(self, failures: Tuple[Type[Exception], ...]):
+        """
+        Context manager that wraps a call to the device.  Exceptions
+        of the types given in `failures` count as failures, any other
+        outcome counts as a success since the device responded.
+
+        :param failures: Exception types that indicate the device is
+                         unhealthy.
+        :return:
+        """
+        if self.failure_threshold <= 0:
+            yield
+            return
+        self._acquire()
+        failed = False
+        try:
+            yield
+        except failures:
+            failed = True
+            raise
+        finally:
+            if failed:
+                self.record_failure()
+            else:
+                self.record_success()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(device_id: Union[str, int], failure_threshold: int,
+                reset_timeout: float) -> CircuitBreaker:
+    """
+    Returns the circuit breaker for a given device, creating it if
+    required.
+
+    :param device_id: The device ID.
+    :param failure_threshold: The number of consecutive failures that
+                              open the breaker.  `0` disables it.
+    :param reset_timeout: The number of seconds to wait before probing
+                          an open breaker.
+    :return:
+    """
+    with _breakers_lock:
+        if device_id not in _breakers:
+            _breakers[device_id] = CircuitBreaker(
+                str(device_id), failure_threshold, reset_timeout)
+        breaker = _breakers[device_id]
+        breaker.failure_threshold = failure_threshold
+        breaker.reset_timeout = reset_timeout
+        return breaker
@@ -1,6 +1,10 @@
 VIRTUAL_INTERFACE_TYPES = ['loopback', 'vlan', 'portChannel', 'subinterface']
 PHYSICAL_INTERFACE_TYPES = ['ethernet']
 DESCRIPTION_TAG = '[an]'
+IF_NAME_CACHE_SIZE = 4096
+ADDRESS_CACHE_SIZE = 16384
+READ_CACHE_SIZE = 64
+SNAPSHOT_CAPABILITIES = ['interface', 'interface:lag', 'bridge:vlan', 'vrf', 'tunnels:vxlan']
 
 SPEED_DUPLEX_MAP = {
     '100full': (100, 'full'),
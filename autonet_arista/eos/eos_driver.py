@@ -1,6 +1,16 @@
+import copy
+import functools
 import logging
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
 
-from typing import List, Union
+from contextlib import contextmanager
+from functools import cached_property
+from typing import List, Optional, Union
 
 from autonet.config import config
 from autonet.core.device import AutonetDevice
@@ -10,19 +20,63 @@ from autonet.core.objects import vlan as an_vlan
 from autonet.core.objects import vrf as an_vrf
 from autonet.core.objects import vxlan as an_vxlan
 from autonet.drivers.device.driver import DeviceDriver
-from conf_engine.options import BooleanOption, StringOption
-from pyeapi.client import CommandError, HttpsEapiConnection, Node
-
+from conf_engine.options import BooleanOption, NumberOption, StringOption
+from pyeapi.client import CommandError, Node
+from pyeapi.eapilib import ConnectionError as EapiConnectionError
+
+from autonet_arista.eos import breaker
+from autonet_arista.eos import facts
+from autonet_arista.eos import jobs
+from autonet_arista.eos import locks
+from autonet_arista.eos import metrics
+from autonet_arista.eos import profiling
+from autonet_arista.eos import save_queue
+from autonet_arista.eos import snapshots
+from autonet_arista.eos import tracing
+from autonet_arista.eos import transport
+from autonet_arista.eos import write_queue
+from autonet_arista.eos.exceptions import ConfigSaveError, ConfigSessionError, \
+    DeviceCommunicationError, DeviceUnavailable
+from autonet_arista.eos.tasks import common as common_task
 from autonet_arista.eos.tasks import interface as if_task
 from autonet_arista.eos.tasks import lag as lag_task
 from autonet_arista.eos.tasks import vlan as vlan_task
 from autonet_arista.eos.tasks import vrf as vrf_task
 from autonet_arista.eos.tasks import vxlan as vxlan_task
-from autonet_arista.eos.const import PHYSICAL_INTERFACE_TYPES, VIRTUAL_INTERFACE_TYPES
+from autonet_arista.eos.const import PHYSICAL_INTERFACE_TYPES, SNAPSHOT_CAPABILITIES, \
+    VIRTUAL_INTERFACE_TYPES
+from autonet_arista.eos.util import get_backoff_delay, get_commit_timer, get_fingerprint, \
+    intern_strings
 
 arista_opts =[
     BooleanOption('tls_verify', default=True),
-    StringOption('tls_ciphers', default='DEFAULT')
+    StringOption('tls_ciphers', default='DEFAULT'),
+    BooleanOption('tls_session_reuse', default=True),
+    StringOption('lock_backend', default='local', choices=['local', 'file']),
+    StringOption('lock_dir', default=tempfile.gettempdir()),
+    NumberOption('write_coalesce_window', default=0, cast=float, minimum=0),
+    StringOption('save_strategy', default=save_queue.SAVE_SYNC,
+                 choices=save_queue.SAVE_STRATEGIES),
+    NumberOption('commit_timer', default=0, cast=float, minimum=0),
+    StringOption('commit_health_check', default='show version'),
+    NumberOption('connect_timeout', default=10, cast=float, minimum=0),
+    NumberOption('read_timeout', default=60, cast=float, minimum=0),
+    NumberOption('read_retries', default=2, minimum=0),
+    NumberOption('retry_backoff', default=0.5, cast=float, minimum=0),
+    NumberOption('retry_backoff_max', default=8, cast=float, minimum=0),
+    NumberOption('breaker_failure_threshold', default=5, minimum=0),
+    NumberOption('breaker_reset_timeout', default=30, cast=float, minimum=0),
+    NumberOption('facts_ttl', default=3600, cast=float, minimum=0),
+    BooleanOption('profile_enabled', default=False),
+    NumberOption('profile_sample_rate', default=1, cast=float, minimum=0, maximum=1),
+    StringOption('profile_dir', default=os.path.join(tempfile.gettempdir(),
+                                                     'autonet-arista-profiles')),
+    NumberOption('profile_retention', default=100, minimum=1),
+    StringOption('trace_file', default=''),
+    StringOption('change_probe_command', default=''),
+    NumberOption('snapshot_refresh_interval', default=0, cast=float, minimum=0),
+    NumberOption('snapshot_max_age', default=300, cast=float, minimum=0),
+    NumberOption('snapshot_jitter', default=0.1, cast=float, minimum=0, maximum=1)
 ]
 config.register_options(arista_opts, 'arista')
 
@@ -31,40 +85,541 @@ class AristaDriver(DeviceDriver):
     def __init__(self, device: AutonetDevice):
         super().__init__(device)
 
-        # For TLS verification, we can check to see if the option is
-        # set in metadata.  If not then we fall back to the value
-        # present in configuration.  Same with TLS cipher list.
-        tls_verify = self.device.metadata.get('tls_verify',
-                                              config.arista.tls_verify)
-        tls_ciphers = self.device.metadata.get('tls_ciphers',
-                                               config.arista.tls_ciphers)
-        connection = HttpsEapiConnection(
+        # Config sessions are serialized per device, while reads may
+        # proceed in parallel.  The file backend extends this across
+        # worker processes.
+        self._lock = locks.get_device_lock(self.device.device_id,
+                                           config.arista.lock_backend,
+                                           config.arista.lock_dir)
+        # Calls to a device that has stopped responding fail fast
+        # rather than waiting on timeouts.
+        self._breaker = breaker.get_breaker(
+            self.device.device_id,
+            int(self._get_option('breaker_failure_threshold')),
+            float(self._get_option('breaker_reset_timeout')))
+        self._facts = facts.get_facts_cache(self.device.device_id)
+        self._bgp_parse_cache = facts.get_bgp_parse_cache(self.device.device_id)
+        self._read_cache = facts.get_read_cache(self.device.device_id)
+        self._snapshots = snapshots.get_snapshot_store(self.device.device_id)
+        self._bypass_read_cache = False
+        tracing.configure(config.arista.trace_file)
+
+    @cached_property
+    def _eapi(self) -> Node:
+        """
+        The eAPI node for the device.  The connection is created on
+        first use, so requests that fail validation before any device
+        I/O don't pay for it.
+
+        :return:
+        """
+        # SSL contexts are shared by all drivers with the same TLS
+        # settings, and TLS sessions are resumed per device.
+        context = transport.get_ssl_context(
+            self._get_option('tls_verify'), self._get_option('tls_ciphers'))
+        session_key = self.device.device_id \
+            if self._get_option('tls_session_reuse') else None
+        connection = transport.EapiConnection(
             host=str(self.device.address),
             username=self.device.credentials.username,
             password=self.device.credentials.password,
-            enforce_verification=tls_verify)
-        # Set the cipher list that OpenSSL will offer for the
-        # connection. Must be formatted as an OpenSSL cipher list.  See
-        # https://www.openssl.org/docs/man1.1.1/man1/ciphers.html for
-        # more information.
-
-        connection.transport._context.set_ciphers(tls_ciphers)
-        self._eapi = Node(connection)
+            context=context,
+            connect_timeout=float(self._get_option('connect_timeout')),
+            read_timeout=float(self._get_option('read_timeout')),
+            session_key=session_key)
+        return Node(connection)
+
+    def execute(self, capability: str, action: str, request_data: object = None,
+                profile: bool = None, **kwargs):
+        """
+        Executes a driver operation, profiling it with cProfile when
+        profiling is enabled.  Profiles are saved to `profile_dir`,
+        tagged with the device, capability and action.
+
+        :param capability: The capability to be utilized
+        :param action: The request action
+        :param request_data: The request data
+        :param profile: True or False to profile this request or not,
+                        regardless of the `profile_enabled` and
+                        `profile_sample_rate` options.
+        :return:
+        """
+        if profile is None:
+            profile = self._get_option('profile_enabled') and \
+                random.random() < float(self._get_option('profile_sample_rate'))
+        attributes = {**self._get_span_attributes(),
+                      'driver.capability': capability, 'driver.action': action}
+        f_name = self._generate_func_name(capability, action)
+        with tracing.span(f'AristaDriver.{f_name}', attributes):
+            if not profile:
+                return self._execute(capability, action, request_data, **kwargs)
+            path = profiling.get_profile_path(self._get_option('profile_dir'),
+                                              self.device.device_id, capability, action)
+            with profiling.profile(path, int(self._get_option('profile_retention'))):
+                return self._execute(capability, action, request_data, **kwargs)
+
+    def _execute(self, capability: str, action: str, request_data: object = None, **kwargs):
+        # Reads of everything of a kind are served from snapshots that
+        # are kept up to date in the background, if enabled.
+        if action == 'read' and request_data is None and capability in SNAPSHOT_CAPABILITIES \
+                and float(self._get_option('snapshot_refresh_interval')) > 0:
+            return self._read_snapshot(capability)
+        if action == 'read':
+            return super().execute(capability, action, request_data, **kwargs)
+        with self._uncached_reads():
+            return super().execute(capability, action, request_data, **kwargs)
+
+    def _read_snapshot(self, capability: str) -> list:
+        """
+        Read everything of a kind from the device snapshot.  A snapshot
+        older than `snapshot_refresh_interval` is still returned, and is
+        refreshed in the background.  A snapshot older than
+        `snapshot_max_age`, or one discarded by a change to the device,
+        is refreshed before returning.
+
+        :param capability: The capability to read.
+        :return:
+        """
+        interval = float(self._get_option('snapshot_refresh_interval'))
+        refresh = functools.partial(self._refresh_in_background, self.device, capability)
+        refresher = snapshots.get_refresher()
+        refresher.schedule(self.device.device_id, capability, refresh, interval,
+                           float(self._get_option('snapshot_jitter')))
+        labels = {'device': str(self.device.device_id)}
+        snapshot = self._snapshots.get(capability)
+        if snapshot is None or snapshot.age > float(self._get_option('snapshot_max_age')):
+            metrics.increment('arista_snapshot_reads_total', result='miss', **labels)
+            return self._refresh_snapshot(capability)
+        if snapshot.age > interval:
+            metrics.increment('arista_snapshot_reads_total', result='stale', **labels)
+            refresher.refresh(self.device.device_id, capability, refresh)
+        else:
+            metrics.increment('arista_snapshot_reads_total', result='fresh', **labels)
+        # Callers may modify the objects they are given, so each is
+        # given a copy of its own.
+        return copy.deepcopy(snapshot.value)
+
+    def _refresh_snapshot(self, capability: str) -> list:
+        """
+        Read everything of a kind from the device and save it as the
+        device snapshot.
+
+        :param capability: The capability to read.
+        :return:
+        """
+        generation = self._snapshots.generation
+        value = self._get_cap_function(capability, 'read')(request_data=None)
+        self._snapshots.set(capability, value, generation)
+        return copy.deepcopy(value)
+
+    @classmethod
+    def _refresh_in_background(cls, device: AutonetDevice, capability: str):
+        # Background refreshes use a driver of their own, since an eAPI
+        # connection can't be shared between threads.
+        cls(device)._refresh_snapshot(capability)
+
+    def _get_span_attributes(self, commands=None) -> dict:
+        """
+        Returns the attributes to record on a tracing span for this
+        device, including the command count and request size of
+        `commands` if given.
+
+        :param commands: A command or list of commands.
+        :return:
+        """
+        attributes = {'device.id': str(self.device.device_id)}
+        if commands is not None:
+            attributes.update(tracing.get_command_attributes(commands))
+        return attributes
+
+    def _get_option(self, name: str):
+        """
+        Returns the value of an option from the `arista` config group.
+        If the option is set in the device metadata then that value is
+        used instead of the value present in configuration.
+
+        :param name: The option name.
+        :return:
+        """
+        return self.device.metadata.get(name, getattr(config.arista, name))
 
     def _exec_admin(self, *commands):
-        results = self._eapi.enable(*commands)
-        return tuple([r['result'] for r in results])
+        # Show commands are idempotent, so they are retried with backoff
+        # when the device can't be reached.  Command errors are not
+        # retried since they will simply fail again.
+        retries = int(self._get_option('read_retries'))
+        with tracing.span('eapi.enable', self._get_span_attributes(commands[0])) as span:
+            for attempt in range(retries + 1):
+                try:
+                    with self._lock.read(), self._breaker.guard((EapiConnectionError,)):
+                        results = self._eapi.enable(*commands)
+                    break
+                except EapiConnectionError as e:
+                    if attempt == retries:
+                        raise DeviceCommunicationError(self.device, e.message) from e
+                    delay = get_backoff_delay(
+                        attempt, float(self._get_option('retry_backoff')),
+                        float(self._get_option('retry_backoff_max')))
+                    logging.warning(f"eAPI request to {self.device} failed, retrying "
+                                    f"in {delay:.2f} seconds: {e.message}")
+                    time.sleep(delay)
+            results = tuple([r['result'] for r in results])
+            if span:
+                span.set_attribute('eapi.attempts', attempt + 1)
+        return results
+
+    def _exec_admin_conditional(self, *commands):
+        """
+        Execute show commands, returning the output of the last
+        identical request if the device configuration hasn't changed
+        since.  Changes are detected by running `change_probe_command`
+        first, so large outputs are only fetched when the probe output
+        differs.  When no probe command is set this is the same as
+        :py:meth:`_exec_admin`.
+
+        :param commands: Show commands to execute.
+        :return:
+        """
+        probe = self._get_option('change_probe_command')
+        if not probe or self._bypass_read_cache:
+            return self._exec_admin(*commands)
+        probe_result, = self._exec_admin(probe)
+        fingerprint = get_fingerprint(probe_result)
+        key = (commands[0],) if isinstance(commands[0], str) else tuple(commands[0])
+        labels = {'device': str(self.device.device_id)}
+        results = self._read_cache.get(key, fingerprint)
+        if results is not None:
+            metrics.increment('arista_conditional_reads_total', result='hit', **labels)
+            # Callers may modify the output they are given, so each is
+            # given a copy of its own.
+            return copy.deepcopy(results)
+        # The probe is run again with the commands, and the output is
+        # only cached if the configuration didn't change in between.
+        # Cached output is held for as long as the configuration is
+        # unchanged, so repeated names share one string object.
+        *results, probe_result = self._exec_admin(list(key) + [probe], *commands[1:])
+        results = intern_strings(tuple(results))
+        if get_fingerprint(probe_result) == fingerprint:
+            self._read_cache.set(key, fingerprint, results)
+        metrics.increment('arista_conditional_reads_total', result='miss', **labels)
+        return copy.deepcopy(results)
+
+    @contextmanager
+    def _uncached_reads(self):
+        """
+        Make the reads within the block go to the device, rather than
+        to the read cache.  Reads made while changing the device decide
+        which commands are sent, so they must not be out of date.
+
+        :return:
+        """
+        bypass, self._bypass_read_cache = self._bypass_read_cache, True
+        try:
+            yield
+        finally:
+            self._bypass_read_cache = bypass
+
+    def _exec_admin_bgp(self, *commands, vrf: str = None, vlan: Union[str, int] = None,
+                        header_only: bool = False, conditional: bool = False):
+        """
+        Execute show commands along with the commands needed to fetch
+        the BGP configuration.  When a VRF or VLAN is given, only the
+        BGP configuration relevant to it is fetched.  The outputs of
+        `commands` are returned followed by the textual BGP config.
+
+        :param commands: Show commands to execute.
+        :param vrf: The name of a VRF.
+        :param vlan: A VLAN ID.
+        :param header_only: Fetch only the `router bgp` header and
+                            router ID.
+        :param conditional: Use :py:meth:`_exec_admin_conditional`.
+        :return:
+        """
+        exec_admin = self._exec_admin_conditional if conditional else self._exec_admin
+        bgp_commands = common_task.get_bgp_section_commands(
+            vrf=vrf, vlan=vlan, header_only=header_only)
+        results = exec_admin(list(commands) + bgp_commands)
+        bgp_config = common_task.get_bgp_section(
+            [r['output'] for r in results[len(commands):]])
+        # The scoped sections only include the `router bgp` header if a
+        # router ID or the requested object is configured.  Fall back to
+        # the full config otherwise, since the ASN is always required.
+        if not bgp_config and (vrf is not None or vlan is not None or header_only):
+            show_bgp_config, = exec_admin('show running-config section bgp')
+            bgp_config = show_bgp_config['output']
+        return results[:len(commands)] + (bgp_config,)
+
+    def _parse_bgp_config(self, text_config: str, partial: bool = False) -> dict:
+        """
+        Parse textual BGP configuration, reparsing only the `vrf` and
+        `vlan` blocks that changed since the device was last read.
+
+        :param text_config: The textual BGP configuration.
+        :param partial: The configuration was scoped to a single VRF or
+                        VLAN.
+        :return:
+        """
+        return common_task.parse_bgp_vpn_config(
+            text_config, cache=self._bgp_parse_cache, partial=partial)
+
+    def _get_bgp_facts(self) -> dict:
+        """
+        Returns the BGP ASN and router ID of the device.  These rarely
+        change, so they are cached for `facts_ttl` seconds or until
+        the driver changes the ASN or router ID.
+
+        :return:
+        """
+        ttl = float(self._get_option('facts_ttl'))
+        bgp_facts = self._facts.get(facts.BGP_FACTS, ttl)
+        if bgp_facts is None:
+            show_bgp_config, = self._exec_admin_bgp(header_only=True)
+            bgp_facts = common_task.get_bgp_facts(show_bgp_config)
+            # A device without BGP is fetched again next time, so that
+            # BGP configured outside the driver is picked up.
+            if bgp_facts['asn'] is not None:
+                self._facts.set(facts.BGP_FACTS, bgp_facts)
+        return bgp_facts
 
     def _exec_config(self, commands):
+        return self._exec_config_many([commands])
+
+    def _exec_config_many(self, batches: List[List[str]]):
+        # When a coalescing window is set, commands from concurrent
+        # requests are collected and applied in a single config session.
+        window = float(self._get_option('write_coalesce_window'))
+        if window > 0:
+            queue = write_queue.get_write_queue(self.device.device_id, window)
+            return queue.submit_batches(batches, self._exec_config_batches)
+        return self._exec_config_batches(batches)
+
+    def _exec_config_batches(self, batches: List[List[str]]) -> Optional[jobs.ConfigJob]:
+        timer = float(self._get_option('commit_timer'))
+        if timer > 0:
+            return self._exec_config_timed(batches, timer)
+        all_commands = [command for commands in batches for command in commands]
+        attributes = {**self._get_span_attributes(all_commands), 'eapi.batch_count': len(batches)}
+        with tracing.span('eapi.config_session', attributes), self._lock.write():
+            # Reads wait on the lock, so cached facts can't be
+            # repopulated with stale values while the session is open.
+            self._facts.invalidate_for_commands(all_commands)
+            self._read_cache.invalidate()
+            self._snapshots.invalidate()
+            try:
+                with self._breaker.guard((EapiConnectionError,)):
+                    with tracing.span('eapi.session_open', self._get_span_attributes()):
+                        self._eapi.configure_session()
+                    # Each batch is sent separately so that every batch
+                    # starts from the top level of the config session
+                    # rather than the mode left behind by the previous one.
+                    for commands in batches:
+                        with tracing.span('eapi.config', self._get_span_attributes(commands)):
+                            self._eapi.config(commands)
+                    with tracing.span('eapi.commit', self._get_span_attributes()):
+                        self._eapi.commit()
+            except DeviceUnavailable:
+                raise
+            except Exception as e:
+                logging.exception(e)
+                self._abort_config_session()
+                raise self._get_config_error(e) from e
+            self._save_after_commit()
+        return
+
+    def _exec_config_timed(self, batches: List[List[str]], timer: float) -> jobs.ConfigJob:
+        """
+        Commit the batches with a commit timer and return without
+        waiting for confirmation.  The commit is confirmed in the
+        background once the device passes a health check, otherwise
+        the device rolls it back when the timer expires.
+
+        :param batches: Lists of configuration commands.
+        :param timer: The commit timer in seconds.
+        :return: A job tracking the confirmation.
+        """
+        session = f"autonet-{uuid.uuid4().hex}"
+        all_commands = [command for commands in batches for command in commands]
+        attributes = {**self._get_span_attributes(all_commands), 'eapi.batch_count': len(batches),
+                      'eapi.session': session}
+        with tracing.span('eapi.config_session', attributes), self._lock.write():
+            self._facts.invalidate_for_commands(all_commands)
+            self._read_cache.invalidate()
+            self._snapshots.invalidate()
+            try:
+                with self._breaker.guard((EapiConnectionError,)):
+                    for commands in batches:
+                        with tracing.span('eapi.config', self._get_span_attributes(commands)):
+                            self._eapi.run_commands([f'configure session {session}'] + commands)
+                    with tracing.span('eapi.commit', self._get_span_attributes()):
+                        self._eapi.run_commands([f'configure session {session}',
+                                                 f'commit timer {get_commit_timer(timer)}'])
+            except DeviceUnavailable:
+                raise
+            except Exception as e:
+                logging.exception(e)
+                self._abort_config_session(session)
+                raise self._get_config_error(e) from e
+        job = jobs.create_job(self.device.device_id, session)
+        threading.Thread(target=self._confirm_in_background,
+                         args=(self.device, job), daemon=True).start()
+        return job
+
+    @classmethod
+    def _confirm_in_background(cls, device: AutonetDevice, job: jobs.ConfigJob):
+        # The request thread keeps using its driver once the job is
+        # returned, so confirmation uses a driver and eAPI connection of
+        # its own.
+        cls(device)._confirm_commit(job)
+
+    def _confirm_commit(self, job: jobs.ConfigJob):
+        """
+        Confirm a commit made with a commit timer if the device passes
+        the health check, then save the config.
+
+        :param job: The job tracking the commit.
+        :return:
+        """
+        labels = {'device': str(self.device.device_id)}
         try:
-            self._eapi.configure_session()
-            self._eapi.config(commands)
-            self._eapi.commit()
-            self._eapi.run_commands('copy running-config startup-config')
+            self._exec_admin(self._get_option('commit_health_check'))
         except Exception as e:
             logging.exception(e)
-            self._eapi.abort()
-        return
+            logging.error(f"Health check of {self.device} failed, rolling back "
+                          f"session {job.session}.")
+            self._roll_back_commit(job)
+            job.complete(jobs.ROLLED_BACK, str(e))
+            metrics.increment('arista_commit_jobs_total', status=jobs.ROLLED_BACK, **labels)
+            return
+        attributes = {**self._get_span_attributes(), 'eapi.session': job.session}
+        error = None
+        with tracing.span('eapi.confirm', attributes), self._lock.write():
+            try:
+                with self._breaker.guard((EapiConnectionError,)):
+                    self._eapi.run_commands([f'configure session {job.session} commit'])
+            except Exception as e:
+                logging.exception(e)
+                error = e
+            else:
+                try:
+                    self._save_after_commit()
+                except ConfigSaveError:
+                    # Already logged and counted, and there is no request
+                    # left to report it to.
+                    pass
+        if error:
+            self._roll_back_commit(job)
+            job.complete(jobs.FAILED, str(error))
+            metrics.increment('arista_commit_jobs_total', status=jobs.FAILED, **labels)
+            return
+        job.complete(jobs.CONFIRMED)
+        metrics.increment('arista_commit_jobs_total', status=jobs.CONFIRMED, **labels)
+
+    def _roll_back_commit(self, job: jobs.ConfigJob):
+        """
+        Roll back a commit made with a commit timer by aborting its
+        session, then discard the cached reads and facts, which may
+        include the commit.  If the session can't be aborted, the
+        device rolls it back when the timer expires, and the caches are
+        discarded again then.
+
+        :param job: The job tracking the commit.
+        :return:
+        """
+        with self._lock.write():
+            aborted = self._abort_config_session(job.session)
+            self._invalidate_caches()
+        if not aborted:
+            timer = threading.Timer(float(self._get_option('commit_timer')),
+                                    self._invalidate_caches)
+            timer.daemon = True
+            timer.start()
+
+    def _invalidate_caches(self):
+        self._facts.invalidate()
+        self._read_cache.invalidate()
+        self._snapshots.invalidate()
+
+    def _get_config_error(self, e: Exception) -> Exception:
+        """
+        Returns the exception to raise for a failed config session.
+
+        :param e: The exception raised by the session.
+        :return:
+        """
+        if isinstance(e, EapiConnectionError):
+            return DeviceCommunicationError(self.device, e.message)
+        return ConfigSessionError(self.device, str(e))
+
+    def _save_after_commit(self):
+        """
+        Save the running config according to the `save_strategy`.  The
+        caller must hold the write lock.
+        """
+        strategy = self._get_option('save_strategy')
+        if strategy == save_queue.SAVE_NONE:
+            metrics.increment('arista_config_saves_total',
+                              device=str(self.device.device_id),
+                              result='skipped')
+        elif strategy == save_queue.SAVE_ASYNC:
+            self._save_config_async()
+        else:
+            self._save_config()
+
+    def _save_config(self):
+        """
+        Save the running config to the startup config.
+        """
+        labels = {'device': str(self.device.device_id)}
+        try:
+            with tracing.span('eapi.save', self._get_span_attributes()), \
+                    self._breaker.guard((EapiConnectionError,)):
+                self._eapi.run_commands('copy running-config startup-config')
+        except Exception as e:
+            logging.exception(e)
+            metrics.increment('arista_config_saves_total', result='failure', **labels)
+            raise ConfigSaveError(self.device, str(e)) from e
+        metrics.increment('arista_config_saves_total', result='success', **labels)
+
+    def _save_config_async(self):
+        """
+        Queue a save of the running config to run in the background.
+        Failures are logged and reported through metrics only, since
+        the request has already completed.
+        """
+        save = functools.partial(self._save_in_background, self.device)
+        saver = save_queue.get_saver()
+        if not saver.submit(self.device.device_id, save):
+            metrics.increment('arista_config_saves_total',
+                              device=str(self.device.device_id),
+                              result='coalesced')
+
+    @classmethod
+    def _save_in_background(cls, device: AutonetDevice):
+        # The request thread keeps using its driver once the request
+        # returns, so the save uses a driver and eAPI connection of its
+        # own.  The device lock isn't taken, so reads don't wait behind
+        # the save.  EOS copies a consistent running config, and a
+        # commit made during the save queues another save after it.
+        cls(device)._save_config()
+
+    def _abort_config_session(self, session: str = None):
+        """
+        Abort the current config session, or the named session if one
+        is given.  Failures are logged rather than raised so that the
+        original error is the one reported.
+
+        :return: True if the session was aborted.
+        """
+        try:
+            with tracing.span('eapi.abort', self._get_span_attributes()):
+                if session:
+                    self._eapi.run_commands([f'configure session {session}', 'abort'])
+                else:
+                    self._eapi.abort()
+        except Exception as e:
+            logging.exception(e)
+            return False
+        return True
 
     def _interface_read(self, request_data: str = None) -> Union[List[an_if.Interface], an_if.Interface]:
         interfaces = []
@@ -75,7 +630,7 @@ class AristaDriver(DeviceDriver):
                          'show vrf', 'show port-channel detailed')
 
         try:
-            interface_data = self._exec_admin(show_commands)
+            interface_data = self._exec_admin_conditional(show_commands)
         # Handle interface not found gracefully.
         except CommandError:
             return []
@@ -86,8 +641,8 @@ class AristaDriver(DeviceDriver):
                     or 'Management' in eos_interface['name']:
                 # Skip the interfaces we don't care about.
                 continue
-            interfaces.append(if_task.get_interface_object(
-                eos_interface, *interface_data[1:]))
+            interfaces.append(eos_interface)
+        interfaces = if_task.get_interface_objects(interfaces, *interface_data[1:])
 
         return interfaces[0] if request_data else interfaces
 
@@ -101,17 +656,47 @@ class AristaDriver(DeviceDriver):
         self._exec_config(commands)
         return self._interface_read(request_data.name)
 
+    def _interface_bulk_apply(self, request_data: List[an_if.Interface],
+                              update: bool = False) -> List[an_if.Interface]:
+        """
+        Create or update several interfaces in a single config session.
+        Interfaces with identical configuration are applied as interface
+        ranges, and the results are fetched with a single read.
+
+        :param request_data: The `Interface` objects to apply.
+        :param update: True for an update operation, False to replace.
+        :return: The resulting interfaces, in the order requested.
+        """
+        commands = if_task.generate_bulk_interface_commands(request_data, update=update)
+        self._exec_config(commands)
+        interfaces = {interface.name: interface for interface in self._interface_read()}
+        # Subinterface names are matched as given, since expanding them
+        # would drop the subinterface number.
+        names = [interface.name if '.' in interface.name
+                 else common_task.get_fq_if_name(interface.name)
+                 for interface in request_data]
+        return [interfaces[name] for name in names if name in interfaces]
+
     def _interface_delete(self, request_data: str):
         commands = if_task.generate_delete_commands(interface_name=request_data)
         self._exec_config(commands)
 
     def _tunnels_vxlan_read(self, request_data: str = None) -> Union[List[an_vxlan.VXLAN], an_vxlan.VXLAN]:
-        commands = ('show interfaces vxlan1', 'show running-config section bgp')
-        show_int_vxlan, show_bgp_config = self._exec_admin(commands)
         vnid = int(request_data) if request_data else None
+        if vnid:
+            # Find what the VNI is bound to, so that only the BGP config
+            # for that VLAN or VRF needs to be fetched.
+            show_int_vxlan, = self._exec_admin_conditional('show interfaces vxlan1')
+            scope = vxlan_task.get_vxlan_bgp_scope(show_int_vxlan, vnid)
+            if not scope:
+                return []
+            show_bgp_config, = self._exec_admin_bgp(**scope, conditional=True)
+        else:
+            show_int_vxlan, show_bgp_config = self._exec_admin_bgp(
+                'show interfaces vxlan1', conditional=True)
         results = vxlan_task.get_vxlans(
             show_int_vxlan,
-            show_bgp_config['output'],
+            self._parse_bgp_config(show_bgp_config, partial=bool(vnid)),
             vnid=vnid)
 
         if request_data and len(results) == 1:
@@ -127,25 +712,70 @@ class AristaDriver(DeviceDriver):
         commands = vxlan_task.generate_vxlan_commands(vxlan=request_data)
         self._exec_config(commands)
         # Stage one completed.  Now resource allocations are discovered.
-        commands = ('show interfaces vxlan1', 'show running-config section bgp')
-        show_int_vxlan, show_bgp_config = self._exec_admin(commands)
+        show_int_vxlan, = self._exec_admin('show interfaces vxlan1')
         commands = vxlan_task.generate_vxlan_evpn_commands(
-            request_data, show_int_vxlan, show_bgp_config['output'])
+            request_data, show_int_vxlan, self._get_bgp_facts())
         self._exec_config(commands)
         return self._tunnels_vxlan_read(str(request_data.id))
 
     def _tunnels_vxlan_delete(self, request_data: str):
         vxlan = self._tunnels_vxlan_read(request_data)
-        show_bgp_config, = self._exec_admin('show running-config section bgp')
-        commands = vxlan_task.generate_vxlan_delete_commands(vxlan, show_bgp_config['output'])
+        commands = vxlan_task.generate_vxlan_delete_commands(vxlan, self._get_bgp_facts())
+        self._exec_config(commands)
+
+    def _tunnels_vxlan_bulk_create(self, request_data: List[an_vxlan.VXLAN]) -> List[an_vxlan.VXLAN]:
+        """
+        Create several VXLAN tunnels in a single config session, using
+        one BGP facts fetch for all of them.  Only L3 VNIs with an
+        auto-generated RD need the device to allocate resources first,
+        so a separate first stage is run for those alone.
+
+        :param request_data: The `VXLAN` objects to create.
+        :return: The resulting VXLANs, in the order requested.
+        """
+        bgp_facts = self._get_bgp_facts()
+        staged = [vxlan for vxlan in request_data
+                  if vxlan.layer == 3 and vxlan.route_distinguisher == 'auto']
+        show_int_vxlan = None
+        if staged:
+            self._exec_config(vxlan_task.generate_bulk_vxlan_commands(staged))
+            show_int_vxlan, = self._exec_admin('show interfaces vxlan1')
+        unstaged = [vxlan for vxlan in request_data if vxlan not in staged]
+        commands = vxlan_task.generate_bulk_vxlan_commands(unstaged) if unstaged else []
+        commands += vxlan_task.generate_bulk_vxlan_evpn_commands(
+            request_data, show_int_vxlan, bgp_facts)
         self._exec_config(commands)
+        vxlans = {vxlan.id: vxlan for vxlan in self._tunnels_vxlan_read()}
+        return [vxlans[vxlan.id] for vxlan in request_data if vxlan.id in vxlans]
+
+    def _tunnels_vxlan_bulk_delete(self, request_data: List[str]) -> None:
+        """
+        Delete several VXLAN tunnels in a single config session.  VNIs
+        that don't exist are ignored.
+
+        :param request_data: The VNIs to delete.
+        :return:
+        """
+        with self._uncached_reads():
+            vxlans = {vxlan.id: vxlan for vxlan in self._tunnels_vxlan_read()}
+        vxlans = [vxlans[int(vnid)] for vnid in request_data if int(vnid) in vxlans]
+        if vxlans:
+            self._exec_config(vxlan_task.generate_bulk_vxlan_delete_commands(
+                vxlans, self._get_bgp_facts()))
 
     def _vrf_read(self, request_data: str = None) -> Union[List[an_vrf.VRF], an_vrf.VRF]:
-        commands = ['show vrf', 'show running-config section bgp']
-        show_vrf, show_bgp_config = self._exec_admin(commands)
+        try:
+            show_vrf, show_bgp_config = self._exec_admin_bgp(
+                vrf_task.get_show_vrf_command(request_data), vrf=request_data,
+                conditional=True)
+        # Handle VRF not found gracefully.
+        except CommandError:
+            if not request_data:
+                raise
+            return []
         results = vrf_task.get_vrfs(
             show_vrf,
-            show_bgp_config['output'],
+            self._parse_bgp_config(show_bgp_config, partial=bool(request_data)),
             vrf=request_data)
         if request_data and len(results) == 1:
             return results[0]
@@ -153,20 +783,55 @@ class AristaDriver(DeviceDriver):
             return results
 
     def _vrf_create(self, request_data: an_vrf.VRF) -> an_vrf.VRF:
-        show_bgp_config, = self._exec_admin('show running-config section bgp')
-        commands = vrf_task.generate_create_vrf_commands(request_data, show_bgp_config['output'])
+        commands = vrf_task.generate_create_vrf_commands(request_data, self._get_bgp_facts())
         self._exec_config(commands)
         return self._vrf_read(request_data.name)
 
     def _vrf_delete(self, request_data: str) -> None:
         vrf = self._vrf_read(request_data)
-        show_bgp_config, = self._exec_admin('show running-config section bgp')
-        commands = vrf_task.generate_delete_vrf_commands(vrf, show_bgp_config['output'])
+        commands = vrf_task.generate_delete_vrf_commands(vrf, self._get_bgp_facts())
         self._exec_config(commands)
 
+    def _vrf_bulk_create(self, request_data: List[an_vrf.VRF]) -> List[an_vrf.VRF]:
+        """
+        Create several VRFs in a single config session.  The BGP facts
+        are fetched once for all VRFs, and the results are returned
+        from a single read.
+
+        :param request_data: The `VRF` objects to create.
+        :return: The resulting VRFs, in the order requested.
+        """
+        bgp_facts = self._get_bgp_facts()
+        self._exec_config_many([vrf_task.generate_create_vrf_commands(vrf, bgp_facts)
+                                for vrf in request_data])
+        vrfs = {vrf.name: vrf for vrf in self._vrf_read()}
+        return [vrfs[vrf.name] for vrf in request_data if vrf.name in vrfs]
+
+    def _vrf_bulk_delete(self, request_data: List[str]) -> None:
+        """
+        Delete several VRFs in a single config session.  VRFs that don't
+        exist are ignored.
+
+        :param request_data: The names of the VRFs to delete.
+        :return:
+        """
+        with self._uncached_reads():
+            vrfs = {vrf.name: vrf for vrf in self._vrf_read()}
+        bgp_facts = self._get_bgp_facts()
+        batches = [vrf_task.generate_delete_vrf_commands(vrfs[name], bgp_facts)
+                   for name in request_data if name in vrfs]
+        if batches:
+            self._exec_config_many(batches)
+
     def _bridge_vlan_read(self, request_data: Union[str, int]) -> Union[List[an_vlan.VLAN], an_vlan.VLAN]:
-        commands = ['show vlan']
-        show_vlan, = self._exec_admin(commands)
+        commands = [vlan_task.get_show_vlan_command(request_data)]
+        try:
+            show_vlan, = self._exec_admin_conditional(commands)
+        # Handle VLAN not found gracefully.
+        except CommandError:
+            if not request_data:
+                raise
+            return []
         results = vlan_task.get_vlans(show_vlan, vlan_id=request_data)
 
         if request_data and len(results) == 1:
@@ -197,7 +862,7 @@ class AristaDriver(DeviceDriver):
             'show running-config section interface Port-Channel'
         ]
 
-        show_port_channel, show_run_port_channel = self._exec_admin(commands)
+        show_port_channel, show_run_port_channel = self._exec_admin_conditional(commands)
         results = lag_task.get_lags(
             show_port_channel, show_run_port_channel['output'], lag_name=request_data)
 
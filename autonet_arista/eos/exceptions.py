@@ -19,3 +19,43 @@ class NotSwitchport(exc.DriverRequestError):
     def __init__(self):
         super().__init__("This platform cannot perform bridging on the specified"
                          "interface type, valid types are 'ethernet' and 'port-channel'.")
+
+
+class DeviceCommunicationError(exc.AutonetException):
+    """
+    Raised when eAPI on the device cannot be reached or does not
+    respond in time.
+    """
+    def __init__(self, device, message: str):
+        super().__init__(f"Communication with device {device} failed: {message}")
+
+
+class DeviceUnavailable(exc.AutonetException):
+    """
+    Raised without contacting the device when recent attempts to
+    communicate with it have repeatedly failed.
+    """
+    def __init__(self, device, retry_after: float):
+        super().__init__(f"Device {device} is unavailable after repeated "
+                         f"communication failures.  Retry in "
+                         f"{max(retry_after, 0):.0f} seconds.")
+
+
+class ConfigSessionError(exc.AutonetException):
+    """
+    Raised when a config session could not be applied to the device.
+    The session will have been aborted.
+    """
+    def __init__(self, device, message: str):
+        super().__init__(f"Configuration of device {device} failed and was "
+                         f"aborted: {message}")
+
+
+class ConfigSaveError(exc.AutonetException):
+    """
+    Raised when committed configuration could not be saved to the
+    startup configuration.
+    """
+    def __init__(self, device, message: str):
+        super().__init__(f"Configuration of device {device} was committed but "
+                         f"could not be saved: {message}")
@@ -0,0 +1,192 @@
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Union
+
+from autonet_arista.eos import patterns
+from autonet_arista.eos.const import READ_CACHE_SIZE
+from autonet_arista.eos.tasks.common import BgpParseCache
+
+BGP_FACTS = 'bgp'
+"""The BGP ASN and router ID, as returned by `common.get_bgp_facts()`."""
+
+
+
+def _changes_bgp_facts(command: str, bgp_facts: dict) -> bool:
+    # Entering `router bgp` with the cached ASN changes nothing.  A VRF
+    # router ID can't be told apart from the device's in a flat list
+    # of commands, so any router ID change is treated as the device's.
+    if command.startswith(('no router bgp', 'router-id', 'no router-id')):
+        return True
+    match = patterns.BGP_ASN.match(command)
+    return bool(match) and match.group('asn') != bgp_facts.get('asn')
+
+
+FACT_TRIGGERS = {
+    BGP_FACTS: _changes_bgp_facts,
+}
+"""
+Maps facts to a function that returns True if a configuration command
+may change the cached value of the fact.
+"""
+
+
+class FactsCache(object):
+    """
+    Caches facts about a device that rarely change, such as its BGP
+    ASN, so that they don't need to be fetched for every operation.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._facts = {}
+
+    def get(self, name: str, ttl: float) -> Any:
+        """
+        Returns a cached fact, or None if the fact is not cached or is
+        older than `ttl` seconds.
+
+        :param name: The name of the fact.
+        :param ttl: The maximum age of the fact in seconds.
+        :return:
+        """
+        with self._lock:
+            if name not in self._facts:
+                return None
+            value, timestamp = self._facts[name]
+            if time.monotonic() - timestamp > ttl:
+                del self._facts[name]
+                return None
+            return value
+
+    def set(self, name: str, value: Any):
+        with self._lock:
+            self._facts[name] = (value, time.monotonic())
+
+    def invalidate(self, *names: str):
+        """
+        Removes facts from the cache.  If no names are given then all
+        facts are removed.
+
+        :param names: The names of the facts to remove.
+        :return:
+        """
+        with self._lock:
+            for name in names or list(self._facts):
+                self._facts.pop(name, None)
+
+    def invalidate_for_commands(self, commands: List[str]):
+        """
+        Removes any facts that may have been changed by the given
+        configuration commands.
+
+        :param commands: Configuration commands that were committed.
+        :return:
+        """
+        for name, trigger in FACT_TRIGGERS.items():
+            with self._lock:
+                value, _ = self._facts.get(name, (None, None))
+            if value is None:
+                continue
+            if any(trigger(command.strip().lower(), value) for command in commands):
+                self.invalidate(name)
+
+
+class ReadCache(object):
+    """
+    Caches the output of show commands along with a fingerprint of the
+    device configuration they were read at.  Cached output is only
+    returned while the fingerprint is unchanged, and the least recently
+    used entries are discarded beyond `max_entries`.
+
+    Cached output is shared between requests and must not be modified.
+    """
+    def __init__(self, max_entries: int = READ_CACHE_SIZE):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.max_entries = max_entries
+
+    def get(self, key: Hashable, fingerprint: str) -> Optional[Any]:
+        """
+        Returns the cached output for `key`, or None if it is not
+        cached or was read at a different fingerprint.
+
+        :param key: Identifies the commands, typically the commands
+                    themselves.
+        :param fingerprint: The current configuration fingerprint.
+        :return:
+        """
+        with self._lock:
+            cached_fingerprint, value = self._entries.get(key, (None, None))
+            if cached_fingerprint != fingerprint:
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, fingerprint: str, value: Any):
+        with self._lock:
+            self._entries[key] = (fingerprint, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """
+        Removes all cached output.
+
+        :return:
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+_facts_caches = {}
+_facts_caches_lock = threading.Lock()
+
+
+def get_facts_cache(device_id: Union[str, int]) -> FactsCache:
+    """
+    Returns the facts cache for a given device, creating it if required.
+
+    :param device_id: The device ID.
+    :return:
+    """
+    with _facts_caches_lock:
+        if device_id not in _facts_caches:
+            _facts_caches[device_id] = FactsCache()
+        return _facts_caches[device_id]
+
+
+_bgp_parse_caches = {}
+_bgp_parse_caches_lock = threading.Lock()
+
+
+def get_bgp_parse_cache(device_id: Union[str, int]) -> BgpParseCache:
+    """
+    Returns the BGP parse cache for a given device, creating it if
+    required.  See :py:func:`common.parse_bgp_vpn_config`.
+
+    :param device_id: The device ID.
+    :return:
+    """
+    with _bgp_parse_caches_lock:
+        if device_id not in _bgp_parse_caches:
+            _bgp_parse_caches[device_id] = BgpParseCache()
+        return _bgp_parse_caches[device_id]
+
+
+_read_caches = {}
+_read_caches_lock = threading.Lock()
+
+
+def get_read_cache(device_id: Union[str, int]) -> ReadCache:
+    """
+    Returns the read cache for a given device, creating it if required.
+
+    :param device_id: The device ID.
+    :return:
+    """
+    with _read_caches_lock:
+        if device_id not in _read_caches:
+            _read_caches[device_id] = ReadCache()
+        return _read_caches[device_id]
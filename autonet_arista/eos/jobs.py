@@ -0,0 +1,80 @@
+import threading
+import time
+import uuid
+
+from typing import Optional, Union
+
+PENDING = 'pending'
+CONFIRMED = 'confirmed'
+ROLLED_BACK = 'rolled-back'
+FAILED = 'failed'
+
+JOB_RETENTION = 3600
+"""The number of seconds finished jobs are kept for lookup."""
+
+
+class ConfigJob(object):
+    """
+    Tracks a configuration change committed with a commit timer.  The
+    change is live once the job is created, and becomes permanent when
+    it is confirmed.  If it is never confirmed, the device rolls it
+    back when the timer expires.
+    """
+    def __init__(self, device_id: Union[str, int], session: str):
+        self.id = str(uuid.uuid4())
+        self.device_id = device_id
+        self.session = session
+        self.status = PENDING
+        self.error = None
+        self.finished_at = None
+        self._done = threading.Event()
+
+    def complete(self, status: str, error: str = None):
+        self.status = status
+        self.error = error
+        self.finished_at = time.monotonic()
+        self._done.set()
+
+    def wait(self, timeout: float = None) -> str:
+        """
+        Block until the job has finished.
+
+        :param timeout: The maximum number of seconds to wait.
+        :return: The job status.
+        """
+        self._done.wait(timeout)
+        return self.status
+
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def create_job(device_id: Union[str, int], session: str) -> ConfigJob:
+    """
+    Create and register a job for a config session committed with a
+    timer.  Finished jobs older than `JOB_RETENTION` are discarded.
+
+    :param device_id: The device ID.
+    :param session: The name of the config session.
+    :return:
+    """
+    job = ConfigJob(device_id, session)
+    now = time.monotonic()
+    with _jobs_lock:
+        for job_id in [j.id for j in _jobs.values()
+                       if j.finished_at and now - j.finished_at > JOB_RETENTION]:
+            del _jobs[job_id]
+        _jobs[job.id] = job
+    return job
+
+
+def get_job(job_id: str) -> Optional[ConfigJob]:
+    """
+    Returns a job by ID, or None if it doesn't exist.
+
+    :param job_id: The job ID.
+    :return:
+    """
+    with _jobs_lock:
+        return _jobs.get(job_id)
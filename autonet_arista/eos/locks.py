@@ -0,0 +1,137 @@
+import os
+import threading
+
+from contextlib import contextmanager
+from typing import Union
+
+from autonet_arista.eos import patterns
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # Not available on non-POSIX platforms, the file backend will be
+    # unavailable.
+    fcntl = None
+
+
+class DeviceLock(object):
+    """
+    An in-process reader/writer lock.  Any number of readers may hold
+    the lock at the same time, but a writer holds it exclusively.
+    Waiting writers take priority over new readers so that a steady
+    stream of reads cannot starve configuration changes.
+    """
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        """
+        Context manager that holds the lock in shared mode.
+        """
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        """
+        Context manager that holds the lock in exclusive mode.
+        """
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class FileDeviceLock(DeviceLock):
+    """
+    A reader/writer lock that is also held across processes by way of
+    `flock()` on a per-device lock file.  This is useful when Autonet
+    is run with multiple worker processes, such as with gunicorn.
+    """
+    def __init__(self, path: str):
+        if not fcntl:
+            raise RuntimeError('The file lock backend is not supported on '
+                               'this platform.')
+        super().__init__()
+        self.path = path
+
+    @contextmanager
+    def _flock(self, operation: int):
+        with open(self.path, 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @contextmanager
+    def read(self):
+        with super().read(), self._flock(fcntl.LOCK_SH):
+            yield
+
+    @contextmanager
+    def write(self):
+        with super().write(), self._flock(fcntl.LOCK_EX):
+            yield
+
+
+_device_locks = {}
+_device_locks_lock = threading.Lock()
+
+
+def get_lock_path(lock_dir: str, device_id: Union[str, int]) -> str:
+    """
+    Returns the path of the lock file to be used for a device.
+    :param lock_dir: The directory in which lock files are kept.
+    :param device_id: The device ID.
+    :return:
+    """
+    safe_id = patterns.UNSAFE_FILENAME_CHARS.sub('_', str(device_id))
+    return os.path.join(lock_dir, f'autonet-arista-{safe_id}.lock')
+
+
+def get_device_lock(device_id: Union[str, int], backend: str = 'local',
+                    lock_dir: str = None) -> DeviceLock:
+    """
+    Returns the lock for a given device, creating it if required.  The
+    same lock object is returned for every call made with the same
+    device ID from within the same process.
+
+    :param device_id: The device ID.
+    :param backend: Either 'local' for an in-process lock or 'file' to
+                    additionally lock across processes.
+    :param lock_dir: The directory to hold lock files when using the
+                     'file' backend.
+    :return:
+    """
+    with _device_locks_lock:
+        if device_id not in _device_locks:
+            if backend == 'file':
+                lock = FileDeviceLock(get_lock_path(lock_dir, device_id))
+            else:
+                lock = DeviceLock()
+            _device_locks[device_id] = lock
+        return _device_locks[device_id]
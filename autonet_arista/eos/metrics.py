@@ -0,0 +1,72 @@
+import threading
+
+from typing import List, Union
+
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return name, tuple(sorted(labels.items()))
+
+
+def increment(name: str, value: Union[int, float] = 1, **labels):
+    """
+    Increment a counter.
+
+    :param name: The metric name.
+    :param value: The amount to add to the counter.
+    :param labels: Labels identifying the series, such as `device`.
+    :return:
+    """
+    key = _key(name, labels)
+    with _metrics_lock:
+        _metrics[key] = _metrics.get(key, 0) + value
+
+
+def set_gauge(name: str, value: Union[int, float], **labels):
+    """
+    Set a gauge to the given value.
+
+    :param name: The metric name.
+    :param value: The gauge value.
+    :param labels: Labels identifying the series, such as `device`.
+    :return:
+    """
+    with _metrics_lock:
+        _metrics[_key(name, labels)] = value
+
+
+def get_value(name: str, **labels) -> Union[int, float, None]:
+    """
+    Returns the current value of a metric series, or None if the
+    series has not been recorded.
+
+    :param name: The metric name.
+    :param labels: Labels identifying the series.
+    :return:
+    """
+    with _metrics_lock:
+        return _metrics.get(_key(name, labels))
+
+
+def get_metrics() -> List[dict]:
+    """
+    Returns a snapshot of all recorded metrics, suitable for export
+    to a metrics collector.
+
+    .. code-block::
+
+        [
+            {
+                'name': 'arista_circuit_breaker_state',
+                'labels': {'device': 'leaf1'},
+                'value': 0
+            }
+        ]
+
+    :return:
+    """
+    with _metrics_lock:
+        return [{'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in _metrics.items()]
@@ -0,0 +1,31 @@
+"""
+Precompiled regular expressions used by the driver and task functions.
+
+Patterns are compiled once at import rather than looked up in the
+`re` module's internal cache on every call, which is small and is
+shared with every other module in the process.
+"""
+import re
+
+# Interface names.
+IF_NAME = re.compile(r'(?P<if_type>[A-z-]*)(?P<if_id>[\d/]*)')
+PARENT_IF_NAME = re.compile(r'^([\w-]*)\.\d*$')
+
+# BGP configuration.
+BGP_ASN = re.compile(r'router bgp (?P<asn>[0-9]*$)')
+BGP_RID = re.compile(r'router-id (?P<rid>[0-9\.]*)$')
+BGP_VLAN = re.compile(r'vlan (?P<vlan_id>[0-9]*$)')
+BGP_VRF = re.compile(r'vrf (?P<vrf_name>[\S]*$)')
+BGP_RT = re.compile(r'route-target (?P<direction>[\S]*) ?(?P<afi>evpn|vpn-ipv4|vpn-ipv6|) '
+                    r'(?P<rt>[\d\.]*\:[\d]*)$')
+BGP_RD = re.compile(r'rd (?P<rd>[\d\.]*\:[\d]*)$')
+BGP_BLOCK = re.compile(r'   (?P<type>vrf|vlan) (?P<name>\S+)$')
+
+# LAG configuration.
+LAG_IF_CONTEXT = re.compile(r'interface Port-Channel(?P<po_id>\d*)$')
+LAG_ES_CONTEXT = re.compile(r'evpn ethernet-segment$')
+LAG_ESI = re.compile(r'identifier (?P<esi>([0-9abcdef]{4}:){4}[0-9abcdef]{4})$')
+
+# Miscellaneous.
+WHITESPACE = re.compile(r'\s')
+UNSAFE_FILENAME_CHARS = re.compile(r'[^\w.-]')
@@ -0,0 +1,88 @@
+import cProfile
+import glob
+import logging
+import os
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Union
+
+from autonet_arista.eos import patterns
+
+_prune_lock = threading.Lock()
+_profiler_lock = threading.Lock()
+
+
+def get_profile_path(profile_dir: str, device_id: Union[str, int],
+                     capability: str, action: str) -> str:
+    """
+    Returns the path a profile of a driver operation is saved to.
+    :param profile_dir: The directory in which profiles are kept.
+    :param device_id: The device ID.
+    :param capability: The capability of the operation.
+    :param action: The action of the operation.
+    :return:
+    """
+    tag = '-'.join(patterns.UNSAFE_FILENAME_CHARS.sub('_', str(part))
+                   for part in (device_id, capability, action))
+    return os.path.join(profile_dir, f'autonet-arista-{tag}-{time.time_ns()}.prof')
+
+
+def prune_profiles(profile_dir: str, retention: int):
+    """
+    Removes all but the newest `retention` profiles from `profile_dir`.
+    :param profile_dir: The directory in which profiles are kept.
+    :param retention: The number of profiles to keep.
+    :return:
+    """
+    with _prune_lock:
+        paths = glob.glob(os.path.join(profile_dir, 'autonet-arista-*.prof'))
+        if len(paths) <= retention:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - retention]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+@contextmanager
+def profile(path: str, retention: int):
+    """
+    Profiles the enclosed block with cProfile and saves the result to
+    `path`, which can be loaded with :py:mod:`pstats` or a viewer such
+    as snakeviz.  The profile is saved even if the block raises, and
+    older profiles beyond `retention` are then removed.
+
+    Only one profiler may be active in a process at a time, so the
+    block runs unprofiled if another operation is being profiled.
+
+    :param path: The path to save the profile to.
+    :param retention: The number of profiles to keep.
+    :return:
+    """
+    if not _profiler_lock.acquire(blocking=False):
+        logging.debug(f"Another operation is being profiled, not saving {path}")
+        yield None
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        yield profiler
+    finally:
+        profiler.disable()
+        _profiler_lock.release()
+        _save_profile(profiler, path, retention)
+
+
+def _save_profile(profiler: cProfile.Profile, path: str, retention: int):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        profiler.dump_stats(path)
+        prune_profiles(os.path.dirname(path), retention)
+    except OSError as e:
+        logging.warning(f"Could not save profile to {path}: {e}")
+    else:
+        logging.info(f"Saved profile to {path}")
@@ -0,0 +1,97 @@
+import logging
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Optional, Union
+
+SAVE_SYNC = 'sync'
+SAVE_ASYNC = 'async'
+SAVE_NONE = 'none'
+SAVE_STRATEGIES = [SAVE_SYNC, SAVE_ASYNC, SAVE_NONE]
+"""Values accepted by the `save_strategy` option."""
+
+SAVE_WORKERS = 4
+"""The number of devices that may be saved in the background at once."""
+
+
+class BackgroundSaver(object):
+    """
+    Runs configuration saves in the background, after the API response
+    has been returned.
+
+    At most one save is queued per device.  A save requested while
+    another is still queued for the same device is dropped, since the
+    queued save will write the latest running config when it runs.
+    Once a save has started, a new request queues another save so that
+    changes committed during the save are not lost.
+
+    Saves for the same device run one at a time, so that a save of an
+    older running config can't finish after a save of a newer one.  A
+    save waiting for the previous one to finish is still queued.
+    """
+    def __init__(self, max_workers: int = SAVE_WORKERS):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='arista-save')
+        self._lock = threading.Lock()
+        self._queued = set()
+        self._futures = {}
+        self._device_locks = {}
+
+    def submit(self, device_id: Union[str, int],
+               save: Callable[[], None]) -> Optional[Future]:
+        """
+        Queue a save for a device.
+
+        :param device_id: The device ID.
+        :param save: Called in the background to save the config.
+        :return: The future for the queued save, or None if a save was
+                 already queued for the device.
+        """
+        with self._lock:
+            if device_id in self._queued:
+                return None
+            self._queued.add(device_id)
+            future = self._executor.submit(self._run, device_id, save)
+            self._futures[device_id] = future
+            return future
+
+    def _run(self, device_id: Union[str, int], save: Callable[[], None]):
+        with self._lock:
+            device_lock = self._device_locks.setdefault(device_id, threading.Lock())
+        with device_lock:
+            with self._lock:
+                self._queued.discard(device_id)
+            try:
+                save()
+            except Exception as e:
+                logging.exception(e)
+
+    def wait(self, device_id: Union[str, int], timeout: float = None):
+        """
+        Block until the latest save queued for a device has finished.
+
+        :param device_id: The device ID.
+        :param timeout: The maximum number of seconds to wait.
+        :return:
+        """
+        with self._lock:
+            future = self._futures.get(device_id)
+        if future:
+            wait([future], timeout=timeout)
+
+
+_saver = None
+_saver_lock = threading.Lock()
+
+
+def get_saver() -> BackgroundSaver:
+    """
+    Returns the background saver, creating it if required.
+
+    :return:
+    """
+    global _saver
+    with _saver_lock:
+        if _saver is None:
+            _saver = BackgroundSaver()
+        return _saver
@@ -0,0 +1,190 @@
+import logging
+import random
+import threading
+import time
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Optional, Tuple, Union
+
+SNAPSHOT_WORKERS = 4
+"""The number of snapshots that may be refreshed in the background at once."""
+
+IDLE_TIMEOUT = 900
+"""The number of seconds after its last read that a snapshot stops being refreshed."""
+
+
+class Snapshot(object):
+    __slots__ = ('value', 'fetched_at')
+
+    def __init__(self, value: Any, fetched_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+class SnapshotStore(object):
+    """
+    Holds the latest snapshots of a device's data, such as the list of
+    all its interfaces.
+
+    Snapshots are discarded when the device is changed.  A fetch that
+    was started before the change is not stored when it completes,
+    since it may not include the change.  Callers take the `generation`
+    before fetching and pass it to :py:meth:`set` for this reason.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots = {}
+        self.generation = 0
+
+    def get(self, key: Hashable) -> Optional[Snapshot]:
+        with self._lock:
+            return self._snapshots.get(key)
+
+    def set(self, key: Hashable, value: Any, generation: int):
+        with self._lock:
+            if generation == self.generation:
+                self._snapshots[key] = Snapshot(value, time.monotonic())
+
+    def invalidate(self):
+        """
+        Discards all snapshots, along with any fetches in progress.
+
+        :return:
+        """
+        with self._lock:
+            self._snapshots.clear()
+            self.generation += 1
+
+
+class SnapshotRefresher(object):
+    """
+    Refreshes snapshots in the background.
+
+    Each scheduled snapshot is refreshed every `interval` seconds, varied
+    by up to `jitter` as a fraction of the interval so that refreshes of
+    many devices don't run in lockstep.  At most `max_workers` refreshes
+    run at once, and a snapshot that is still being refreshed is not
+    refreshed again.  Snapshots that have not been read for
+    `IDLE_TIMEOUT` seconds are no longer refreshed.
+    """
+    def __init__(self, max_workers: int = SNAPSHOT_WORKERS):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='arista-snapshot')
+        self._condition = threading.Condition()
+        self._schedule = {}
+        self._in_flight = set()
+        self._thread = None
+
+    def schedule(self, device_id: Union[str, int], key: Hashable,
+                 refresh: Callable[[], Any], interval: float, jitter: float = 0):
+        """
+        Schedule a snapshot to be refreshed every `interval` seconds, or
+        update its schedule if it is already scheduled.  Calling this
+        also marks the snapshot as read.
+
+        :param device_id: The device ID.
+        :param key: Identifies the snapshot.
+        :param refresh: Called in the background to refresh the snapshot.
+        :param interval: The number of seconds between refreshes.
+        :param jitter: The fraction of `interval` by which to vary it.
+        :return:
+        """
+        now = time.monotonic()
+        with self._condition:
+            entry = self._schedule.get((device_id, key))
+            due = entry['due'] if entry else now + _get_delay(interval, jitter)
+            self._schedule[(device_id, key)] = {
+                'due': due, 'interval': interval, 'jitter': jitter,
+                'refresh': refresh, 'last_read': now}
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='arista-snapshot-scheduler', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def refresh(self, device_id: Union[str, int], key: Hashable,
+                refresh: Callable[[], Any]) -> Optional[Future]:
+        """
+        Refresh a snapshot in the background now.
+
+        :param device_id: The device ID.
+        :param key: Identifies the snapshot.
+        :param refresh: Called in the background to refresh the snapshot.
+        :return: The future for the refresh, or None if the snapshot was
+                 already being refreshed.
+        """
+        with self._condition:
+            return self._submit((device_id, key), refresh)
+
+    def _submit(self, item: Tuple, refresh: Callable[[], Any]) -> Optional[Future]:
+        if item in self._in_flight:
+            return None
+        self._in_flight.add(item)
+        return self._executor.submit(self._refresh, item, refresh)
+
+    def _refresh(self, item: Tuple, refresh: Callable[[], Any]):
+        try:
+            refresh()
+        except Exception as e:
+            logging.warning(f"Background refresh of {item[1]} on device "
+                            f"{item[0]} failed: {e}")
+        finally:
+            with self._condition:
+                self._in_flight.discard(item)
+
+    def _run(self):
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                for item, entry in list(self._schedule.items()):
+                    if now - entry['last_read'] > IDLE_TIMEOUT:
+                        del self._schedule[item]
+                    elif entry['due'] <= now:
+                        self._submit(item, entry['refresh'])
+                        entry['due'] = now + _get_delay(entry['interval'], entry['jitter'])
+                timeout = min([entry['due'] for entry in self._schedule.values()],
+                              default=now + IDLE_TIMEOUT) - now
+                self._condition.wait(max(timeout, 0))
+
+
+def _get_delay(interval: float, jitter: float) -> float:
+    return interval * (1 + random.uniform(-jitter, jitter))
+
+
+_snapshot_stores = {}
+_snapshot_stores_lock = threading.Lock()
+
+
+def get_snapshot_store(device_id: Union[str, int]) -> SnapshotStore:
+    """
+    Returns the snapshot store for a given device, creating it if
+    required.
+
+    :param device_id: The device ID.
+    :return:
+    """
+    with _snapshot_stores_lock:
+        if device_id not in _snapshot_stores:
+            _snapshot_stores[device_id] = SnapshotStore()
+        return _snapshot_stores[device_id]
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def get_refresher() -> SnapshotRefresher:
+    """
+    Returns the background refresher, creating it if required.
+
+    :return:
+    """
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = SnapshotRefresher()
+        return _refresher
@@ -1,9 +1,73 @@
-import re
+import threading
 
 from autonet.core.objects import vxlan as an_vxlan
 from autonet.core.objects import vrf as an_vrf
+from collections.abc import Mapping
 from typing import Tuple, Union
 
+from autonet_arista.eos import patterns
+from autonet_arista.eos import tracing
+from autonet_arista.eos.util import classify_if_name, intern_strings
+
+
+class Record(Mapping):
+    """
+    Base class for compact, read-only records of parsed device data.
+    Records store their values in slots rather than a per-instance
+    dict, but behave as mappings so that they can be used, and compared,
+    exactly like the dicts they replace.  Keys map to slot names via
+    `_fields`, and unset slots are treated as missing keys.
+    """
+    __slots__ = ()
+    _fields = {}
+
+    def __init__(self, values: dict = None):
+        for key, value in (values or {}).items():
+            object.__setattr__(self, self._fields[key], value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is read-only")
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self._fields[key])
+        except (KeyError, AttributeError):
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        return (key for key, slot in self._fields.items() if hasattr(self, slot))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({dict(self)!r})"
+
+
+class BgpTargets(Record):
+    """Route targets per address family for a BGP VRF."""
+    __slots__ = ('evpn', 'vpn_ipv4', 'vpn_ipv6')
+    _fields = {'evpn': 'evpn', 'vpn-ipv4': 'vpn_ipv4', 'vpn-ipv6': 'vpn_ipv6'}
+
+
+class BgpVrfNode(Record):
+    """A `vrf` block from the BGP configuration."""
+    __slots__ = ('rid', 'rd', 'import_targets', 'export_targets')
+    _fields = {name: name for name in __slots__}
+
+    def __init__(self, values: dict = None):
+        values = dict(values or {})
+        for targets in ('import_targets', 'export_targets'):
+            if targets in values:
+                values[targets] = BgpTargets(values[targets])
+        super().__init__(values)
+
+
+class BgpVlanNode(Record):
+    """A `vlan` block from the BGP configuration."""
+    __slots__ = ('rid', 'rd', 'import_targets', 'export_targets')
+    _fields = {name: name for name in __slots__}
+
 
 def get_fq_if_name(if_name: str) -> str:
     """
@@ -13,23 +77,7 @@ def get_fq_if_name(if_name: str) -> str:
     :param if_name:
     :return:
     """
-    match = re.search(r'(?P<if_type>[A-z-]*)(?P<if_id>[\d/]*)', if_name)
-    if_type = match.group('if_type')
-    if_id = match.group('if_id')
-    fq_names = ['Ethernet', 'Loopback', 'Management', 'Port-Channel',
-                'Tunnel', 'Vlan', 'Vxlan']
-    result = None
-    for fq_name in fq_names:
-        # we track if we've matched the entry before to see if the string
-        # passed in is too ambiguous.  EOS does the same thing.
-        matched = fq_name.lower().startswith(if_type.lower())
-        if matched and result:
-            raise ValueError("Provided shorthand name is ambiguous.")
-        if matched:
-            result = f'{fq_name}{if_id}'
-    if result:
-        return result
-    raise ValueError("Could not parse fully qualified interface name.")
+    return classify_if_name(if_name).name
 
 
 def get_if_parts(if_name: str) -> Tuple[str, str]:
@@ -40,16 +88,191 @@ def get_if_parts(if_name: str) -> Tuple[str, str]:
     :param if_name:
     :return:
     """
-    fq_name = get_fq_if_name(if_name)
-    matches = re.search(r'(?P<if_name>\D*)(?P<if_id>[\d/]*)$', fq_name)
-    return matches.group('if_name'), matches.group('if_id')
+    if_name = classify_if_name(if_name)
+    return if_name.type, if_name.id
 
 
-def parse_bgp_vpn_config(text_config: str) -> dict:
+def get_if_ranges(if_names: [str]) -> [str]:
+    """
+    Compresses a list of interface names into EOS interface range
+    names.  Contiguous interfaces of the same type and module become a
+    single range, for example "Ethernet1/1" through "Ethernet1/16"
+    becomes "Ethernet1/1-16".  Ranges are ordered by the first
+    appearance of their type and module, then numerically.
+    Subinterfaces, such as "Ethernet1.100", are not compressed and are
+    returned as given.
+
+    :param if_names: Interface names, shorthand or fully qualified.
+    :return:
+    """
+    groups = {}
+    for if_name in if_names:
+        if '.' in if_name:
+            groups.setdefault(if_name, set())
+            continue
+        if_name = classify_if_name(if_name)
+        module, sep, port = if_name.id.rpartition('/')
+        if not port.isdigit():
+            groups.setdefault(if_name.name, set())
+            continue
+        groups.setdefault(f'{if_name.type}{module}{sep}', set()).add(int(port))
+
+    ranges = []
+    for prefix, ports in groups.items():
+        if not ports:
+            ranges.append(prefix)
+            continue
+        ports = sorted(ports)
+        start = end = ports[0]
+        for port in ports[1:] + [None]:
+            if port == end + 1:
+                end = port
+                continue
+            ranges.append(f'{prefix}{start}' if start == end else f'{prefix}{start}-{end}')
+            start = end = port
+    return ranges
+
+
+def get_bgp_section_commands(vrf: str = None,
+                             vlan: Union[str, int] = None,
+                             header_only: bool = False) -> [str]:
+    """
+    Returns the show commands needed to fetch the BGP configuration.
+    When a VRF or VLAN is given, the commands fetch only the
+    `router bgp` header, router ID and the matching `vrf` or `vlan`
+    block rather than the entire BGP configuration.  The output
+    should be passed to :py:func:`get_bgp_section` before parsing.
+
+    :param vrf: The name of a VRF.
+    :param vlan: A VLAN ID.
+    :param header_only: When True, and no VRF or VLAN is given, only
+                        the `router bgp` header and router ID are
+                        fetched.
+    :return:
+    """
+    if vrf is None and vlan is None and not header_only:
+        return ['show running-config section bgp']
+    commands = ['show running-config section router-id']
+    if vrf is not None:
+        commands.append(f'show running-config section vrf {vrf}$')
+    if vlan is not None:
+        commands.append(f'show running-config section vlan {vlan}$')
+    return commands
+
+
+@tracing.traced
+def get_bgp_section(text_configs: [str]) -> str:
+    """
+    Returns only the `router bgp` blocks from one or more textual
+    configuration outputs.  Scoped sections may contain other blocks
+    that merely mention the VRF or VLAN, such as `vrf instance` or
+    interface configuration, which must not be parsed as BGP
+    configuration.
+
+    :param text_configs: A list of textual configuration outputs.
+    :return:
+    """
+    bgp_lines = []
+    for text_config in text_configs:
+        in_bgp = False
+        for config_line in text_config.split('\n'):
+            # Top level commands are not indented.  A new one ends the
+            # current block.
+            if config_line[:1] not in ('', ' '):
+                in_bgp = config_line.startswith('router bgp ')
+            if in_bgp:
+                bgp_lines.append(config_line)
+    return '\n'.join(bgp_lines)
+
+
+class BgpParseCache(object):
+    """
+    Holds the results of previous BGP configuration parses for a
+    device, so that :py:func:`parse_bgp_vpn_config` can reparse only
+    the top level `vrf` and `vlan` blocks that have changed.  Parsed
+    nodes are shared between results and must not be modified.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.text = None
+        self.result = None
+        self.blocks = {}
+        """Maps (`'vrfs'` or `'vlans'`, name) to the block text and node."""
+
+
+def split_bgp_blocks(text_config: str) -> Tuple[str, list]:
+    """
+    Splits textual BGP configuration into the top level `vrf` and
+    `vlan` blocks within `router bgp`, and the remaining lines.
+
+    :param text_config: The text configuration block.
+    :return: A tuple of the remaining lines as text and a list of
+             (`'vrfs'` or `'vlans'`, name, block text) tuples.
+    """
+    other_lines = []
+    blocks = []
+    block_lines = None
+    for config_line in text_config.split('\n'):
+        indent = len(config_line) - len(config_line.lstrip(' '))
+        # A line at the same or lower indent than a block's first line
+        # ends the block.
+        if indent <= 3 and config_line:
+            block_lines = None
+            if indent == 3 and (match := patterns.BGP_BLOCK.match(config_line)):
+                block_lines = [config_line]
+                blocks.append((f"{match.group('type')}s", match.group('name'), block_lines))
+                continue
+        if block_lines is not None:
+            block_lines.append(config_line)
+        else:
+            other_lines.append(config_line)
+    return '\n'.join(other_lines), [(block_type, name, '\n'.join(lines))
+                                   for block_type, name, lines in blocks]
+
+
+def _parse_bgp_vpn_config_incremental(text_config: str, cache: BgpParseCache,
+                                      partial: bool) -> dict:
+    with cache.lock:
+        if text_config == cache.text:
+            return cache.result
+        other_text, blocks = split_bgp_blocks(text_config)
+        if not partial:
+            # Blocks removed from the device are no longer needed.
+            present = {(block_type, name) for block_type, name, _ in blocks}
+            cache.blocks = {key: value for key, value in cache.blocks.items()
+                            if key in present}
+        bgp_config = parse_bgp_vpn_config(other_text)
+        for block_type, name, block_text in blocks:
+            cached_text, node = cache.blocks.get((block_type, name), (None, None))
+            if block_text != cached_text:
+                # Blocks the parser doesn't recognize, such as VLAN
+                # ranges, produce no node.
+                node = parse_bgp_vpn_config(block_text).get(block_type, {}).get(name)
+                cache.blocks[(block_type, name)] = (block_text, node)
+            if node is not None:
+                bgp_config.setdefault(block_type, {})[name] = node
+        cache.text = text_config
+        cache.result = bgp_config
+        return bgp_config
+
+
+@tracing.traced
+def parse_bgp_vpn_config(text_config: str, cache: BgpParseCache = None,
+                         partial: bool = False) -> dict:
     """
     Parses the textual BGP configuration block into a structured
     dictionary.
 
+    VRF and VLAN nodes are returned as read-only :py:class:`Record`
+    mappings, which compare equal to the dicts shown above.
+
+    When a `cache` is given, the configuration is parsed
+    incrementally.  Top level `vrf` and `vlan` blocks whose text is
+    unchanged since they were last parsed with the same cache are
+    reused rather than parsed again.  Blocks missing from the
+    configuration are removed from the cache, unless `partial` is set
+    because the configuration was scoped to a single VRF or VLAN.
+
     .. code-block::
         {
             'asn': 65500,
@@ -81,37 +304,39 @@ def parse_bgp_vpn_config(text_config: str) -> dict:
 
 
     :param text_config: The text configuration block.
+    :param cache: The parse cache for the device.
+    :param partial: The configuration only includes some of the
+                    device's `vrf` and `vlan` blocks.
     :return:
     """
+    if cache is not None:
+        return _parse_bgp_vpn_config_incremental(text_config, cache, partial)
     # TODO: (kvondersaar) This function is hilariously cumbersome and
     #  needs to be split into more discrete parts.
-    asn_regex = r'router bgp (?P<asn>[0-9]*$)'
-    rid_regex = r'router-id (?P<rid>[0-9\.]*)$'
-    vlan_regex = r'vlan (?P<vlan_id>[0-9]*$)'
-    vrf_regex = r'vrf (?P<vrf_name>[\S]*$)'
-    rt_regex = r'route-target (?P<direction>[\S]*) ?(?P<afi>evpn|vpn-ipv4|vpn-ipv6|) (?P<rt>[\d\.]*\:[\d]*)$'
-    rd_regex = r'rd (?P<rd>[\d\.]*\:[\d]*)$'
-
     config_lines = text_config.split('\n')
     bgp_config = {}
     node = {}
     context = None
     for config_line in config_lines:
-        if match := re.search(asn_regex, config_line):
+        if match := patterns.BGP_ASN.search(config_line):
             bgp_config['asn'] = match.group('asn')
-        if match := re.search(vlan_regex, config_line):
+            # A new `router bgp` block resets the context, which matters
+            # when several scoped sections are parsed together.
+            node = {}
+            context = None
+        if match := patterns.BGP_VLAN.search(config_line):
             node = bgp_config.setdefault('vlans', {}).setdefault(match.group('vlan_id'), {})
             context = 'vlan'
-        if match := re.search(vrf_regex, config_line):
+        if match := patterns.BGP_VRF.search(config_line):
             node = bgp_config.setdefault('vrfs', {}).setdefault(match.group('vrf_name'), {})
             context = 'vrf'
         # Once we have a node we can parse out the things that may belong to it.
-        if match := re.search(rid_regex, config_line):
-            if node:
+        if match := patterns.BGP_RID.search(config_line):
+            if context:
                 node['rid'] = match.group('rid')
             else:
                 bgp_config['rid'] = match.group('rid')
-        if match := re.search(rt_regex, config_line):
+        if match := patterns.BGP_RT.search(config_line):
             # when we match up on an RT we place it only in the AFI for which
             # it is defined.  If no AFI exists in the config, then it's explicitly
             # all AFIs.
@@ -142,12 +367,52 @@ def parse_bgp_vpn_config(text_config: str) -> dict:
                     targets = f"{match.group('direction')}_targets"
                     node.setdefault(targets, []).append(match.group('rt'))
 
-        if match := re.search(rd_regex, config_line):
+        if match := patterns.BGP_RD.search(config_line):
             node['rd'] = match.group('rd')
 
+    # Store the parsed nodes as compact records, with the route
+    # targets and distinguishers they repeat interned.
+    for name, node in bgp_config.get('vrfs', {}).items():
+        bgp_config['vrfs'][name] = BgpVrfNode(intern_strings(node))
+    for vlan_id, node in bgp_config.get('vlans', {}).items():
+        bgp_config['vlans'][vlan_id] = BgpVlanNode(intern_strings(node))
     return bgp_config
 
 
+@tracing.traced
+def get_bgp_facts(text_config: str) -> dict:
+    """
+    Returns the BGP ASN and router ID from the textual BGP
+    configuration.
+
+    .. code-block::
+        {
+            'asn': 65500,
+            'rid': 198.18.0.1
+        }
+
+    :param text_config: The text configuration block.
+    :return:
+    """
+    bgp_config = parse_bgp_vpn_config(text_config)
+    return {'asn': bgp_config.get('asn'), 'rid': bgp_config.get('rid')}
+
+
+def get_bgp_config(bgp_config: Union[str, dict]) -> dict:
+    """
+    Returns the structured BGP configuration.  Task functions accept
+    either the textual BGP configuration, which is parsed, or an
+    already structured configuration such as cached BGP facts or the
+    result of an incremental parse, which is returned as is.
+
+    :param bgp_config: The textual or structured BGP configuration.
+    :return:
+    """
+    if isinstance(bgp_config, dict):
+        return bgp_config
+    return parse_bgp_vpn_config(bgp_config)
+
+
 def generate_rt_commands(conf_obj: Union[an_vxlan.VXLAN, an_vrf.VRF],
                          bgp_asn: Union[str, int] = None) -> ([str], [str]):
     """
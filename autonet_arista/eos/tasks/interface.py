@@ -1,11 +1,17 @@
-import re
+import copy
+
+from functools import lru_cache
 from typing import Union
 
 from autonet.core.objects import interfaces as an_if
 from autonet.util import config_string
 
-from autonet_arista.eos.const import DESCRIPTION_TAG, SPEED_DUPLEX_MAP, VIRTUAL_INTERFACE_TYPES
+from autonet_arista.eos import patterns
+from autonet_arista.eos import tracing
+from autonet_arista.eos.const import ADDRESS_CACHE_SIZE, DESCRIPTION_TAG, SPEED_DUPLEX_MAP, \
+    VIRTUAL_INTERFACE_TYPES
 from autonet_arista.eos.exceptions import MixedAnycastUnicastError, NotSwitchport
+from autonet_arista.eos.tasks import common as common_task
 from autonet_arista.eos.util import get_v6_mask_length, is_switchport, is_virtual
 
 
@@ -40,6 +46,31 @@ def get_lag_map(eos_lags: dict) -> dict:
     return lag_map
 
 
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _get_validated_address(family: str, address: str,
+                           virtual_type: str = None) -> an_if.InterfaceAddress:
+    return an_if.InterfaceAddress(
+        family=family,
+        address=address,
+        virtual=True if virtual_type else False,
+        virtual_type=virtual_type
+    )
+
+
+def get_interface_address(family: str, address: str,
+                          virtual_type: str = None) -> an_if.InterfaceAddress:
+    """
+    Returns an `InterfaceAddress`.  Validating an address is far more
+    expensive than parsing it, so validated addresses are cached and
+    a copy of the cached address is returned.
+    :param family: The address family, `ipv4` or `ipv6`.
+    :param address: The address, formatted as address/mask.
+    :param virtual_type: The virtual address type, if any.
+    :return:
+    """
+    return copy.copy(_get_validated_address(family, address, virtual_type))
+
+
 def get_ipv4_addresses(addr_list: list) \
         -> list[an_if.InterfaceAddress]:
     """
@@ -60,20 +91,10 @@ def get_ipv4_addresses(addr_list: list) \
         addr_type = 'anycast' if addr_key == 'virtualIp' else None
         ip_addr = f"{if_addr[addr_key]['address']}/{if_addr[addr_key]['maskLen']}"
 
-        addresses.append(an_if.InterfaceAddress(
-            family='ipv4',
-            address=ip_addr,
-            virtual=True if addr_type else False,
-            virtual_type=addr_type
-        ))
-        for _, secondary in if_addr['secondaryIps'].items():
+        addresses.append(get_interface_address('ipv4', ip_addr, addr_type))
+        for secondary in if_addr['secondaryIps'].values():
             ip_addr = f"{secondary['address']}/{secondary['maskLen']}"
-            addresses.append(an_if.InterfaceAddress(
-                family='ipv4',
-                address=ip_addr,
-                virtual=False,
-                virtual_type=None
-            ))
+            addresses.append(get_interface_address('ipv4', ip_addr))
 
     return addresses
 
@@ -92,21 +113,14 @@ def get_ipv6_addresses(addr_list: list, virtual: False) \
     for if_addr in addr_list:
         v6_mask = get_v6_mask_length(if_addr['subnet'])
         v6_addr_string = f"{if_addr['address']}/{v6_mask}"
-        addresses.append(an_if.InterfaceAddress(
-            family='ipv6',
-            address=v6_addr_string,
-            virtual=True if addr_type else False,
-            virtual_type=addr_type
-        ))
+        addresses.append(get_interface_address('ipv6', v6_addr_string, addr_type))
     return addresses
 
 
-def get_route_attributes(interface: dict, eos_vrfs: dict) \
-        -> an_if.InterfaceRouteAttributes:
+def get_addresses(interface: dict) -> list[an_if.InterfaceAddress]:
     """
-    Builds the `InterfaceRouteAttributes` object for an interface.
+    Parse the IPv4 and IPv6 addresses of an interface.
     :param interface: Interface object from `show interfaces` command.
-    :param eos_vrfs: Output of `show vrf` command.
     :return:
     """
     addresses = get_ipv4_addresses(interface['interfaceAddress'])
@@ -114,8 +128,35 @@ def get_route_attributes(interface: dict, eos_vrfs: dict) \
         addresses += get_ipv6_addresses(
             interface['interfaceAddressIp6']['globalUnicastIp6s'],
             interface['interfaceAddressIp6']['globalAddressesAreVirtual'])
+    return addresses
 
-    vrf_map = get_interface_vrf_map(eos_vrfs)
+
+def get_interface_addresses(eos_interfaces: list) \
+        -> dict[str, list[an_if.InterfaceAddress]]:
+    """
+    Parse the addresses of every routed interface in a single pass.
+    :param eos_interfaces: Interface objects from `show interfaces` command.
+    :return: A map of interface names to their addresses.
+    """
+    return {interface['name']: get_addresses(interface)
+            for interface in eos_interfaces
+            if interface['forwardingModel'] == 'routed'}
+
+
+def get_route_attributes(interface: dict, eos_vrfs: dict, vrf_map: dict = None,
+                         addresses: list = None) -> an_if.InterfaceRouteAttributes:
+    """
+    Builds the `InterfaceRouteAttributes` object for an interface.
+    :param interface: Interface object from `show interfaces` command.
+    :param eos_vrfs: Output of `show vrf` command.
+    :param vrf_map: The output of `get_interface_vrf_map`, if already built.
+    :param addresses: The interface's addresses, if already parsed.
+    :return:
+    """
+    if addresses is None:
+        addresses = get_addresses(interface)
+    if vrf_map is None:
+        vrf_map = get_interface_vrf_map(eos_vrfs)
 
     return an_if.InterfaceRouteAttributes(
         vrf=vrf_map[interface['name']] if interface['name'] in vrf_map else None,
@@ -157,7 +198,8 @@ def get_bridge_attributes(interface: dict, eos_interfaces_vlans: dict) \
     )
 
 
-def get_attributes(interface: dict, eos_interfaces_vlans: dict, eos_vrfs: dict) \
+def get_attributes(interface: dict, eos_interfaces_vlans: dict, eos_vrfs: dict,
+                   vrf_map: dict = None, addresses: list = None) \
         -> Union[an_if.InterfaceRouteAttributes,
                  an_if.InterfaceBridgeAttributes]:
     """
@@ -165,9 +207,11 @@ def get_attributes(interface: dict, eos_interfaces_vlans: dict, eos_vrfs: dict)
     :param interface: Single interface from `show interfaces` output.
     :param eos_interfaces_vlans: Output from `show interfaces vlans`
     :param eos_vrfs: Output from `show vrf`
+    :param vrf_map: The output of `get_interface_vrf_map`, if already built.
+    :param addresses: The interface's addresses, if already parsed.
     :return:
     """
-    return get_route_attributes(interface, eos_vrfs) if \
+    return get_route_attributes(interface, eos_vrfs, vrf_map, addresses) if \
         interface['forwardingModel'] == 'routed' \
         else get_bridge_attributes(interface, eos_interfaces_vlans)
 
@@ -178,12 +222,13 @@ def get_parent_interface_name(interface_name: str) -> str:
     :param interface_name: Name of the child interface.
     :return:
     """
-    parent = re.findall(r"^([\w-]*)\.\d*$", interface_name)
+    parent = patterns.PARENT_IF_NAME.findall(interface_name)
     return parent[0] if len(parent) == 1 else None
 
 
 def get_interface_object(eos_interface: dict, eos_interfaces_vlans: dict,
-                         eos_vrfs: dict, eos_lags: dict) -> an_if.Interface:
+                         eos_vrfs: dict, eos_lags: dict, vrf_map: dict = None,
+                         lag_map: dict = None, addresses: list = None) -> an_if.Interface:
     """
     Parses outputs of `show interfaces` and `show interfaces vlans` to build
     an Interface instance.  Also uses the output of `show vrfs` to find VRF
@@ -192,6 +237,9 @@ def get_interface_object(eos_interface: dict, eos_interfaces_vlans: dict,
     :param eos_interfaces_vlans: The output from `show interfaces vlan`
     :param eos_vrfs: The output from `show vrf`
     :param eos_lags: The output from `show port-channel detailed`
+    :param vrf_map: The output of `get_interface_vrf_map`, if already built.
+    :param lag_map: The output of `get_lag_map`, if already built.
+    :param addresses: The interface's addresses, if already parsed.
     :return:
     """
     # Determine if duplex is applicable, and then format it accordingly.
@@ -211,7 +259,8 @@ def get_interface_object(eos_interface: dict, eos_interfaces_vlans: dict,
     # the LAG interface.
     if eos_interface['forwardingModel'] == 'dataLink':
         mode = 'aggregated'
-        lag_map = get_lag_map(eos_lags)
+        if lag_map is None:
+            lag_map = get_lag_map(eos_lags)
         parent = lag_map[eos_interface['name']]
     else:
         mode = eos_interface['forwardingModel']
@@ -220,7 +269,8 @@ def get_interface_object(eos_interface: dict, eos_interfaces_vlans: dict,
     if mode == 'aggregated':
         attributes = None
     else:
-        attributes = get_attributes(eos_interface, eos_interfaces_vlans, eos_vrfs)
+        attributes = get_attributes(eos_interface, eos_interfaces_vlans, eos_vrfs,
+                                    vrf_map, addresses)
     return an_if.Interface(
         name=eos_interface['name'],
         mode=mode,
@@ -237,6 +287,28 @@ def get_interface_object(eos_interface: dict, eos_interfaces_vlans: dict,
     )
 
 
+@tracing.traced
+def get_interface_objects(eos_interfaces: list, eos_interfaces_vlans: dict,
+                          eos_vrfs: dict, eos_lags: dict) -> list[an_if.Interface]:
+    """
+    Builds Interface instances for several interfaces.  The VRF and LAG
+    maps are built once, and addresses are parsed in a single pass,
+    rather than once per interface.
+    :param eos_interfaces: Interface objects from `show interfaces`
+    :param eos_interfaces_vlans: The output from `show interfaces vlan`
+    :param eos_vrfs: The output from `show vrf`
+    :param eos_lags: The output from `show port-channel detailed`
+    :return:
+    """
+    vrf_map = get_interface_vrf_map(eos_vrfs)
+    lag_map = get_lag_map(eos_lags)
+    addresses = get_interface_addresses(eos_interfaces)
+    return [get_interface_object(eos_interface, eos_interfaces_vlans, eos_vrfs,
+                                 eos_lags, vrf_map=vrf_map, lag_map=lag_map,
+                                 addresses=addresses.get(eos_interface['name']))
+            for eos_interface in eos_interfaces]
+
+
 def generate_common_interface_commands(interface: an_if.Interface,
                                        update: bool = False) -> [str]:
     """
@@ -378,6 +450,7 @@ def generate_routed_mode_commands(interface: an_if.Interface,
     return commands
 
 
+@tracing.traced
 def generate_interface_commands(interface: an_if.Interface,
                                 update: bool = False) -> [str]:
     """
@@ -410,6 +483,35 @@ def generate_interface_commands(interface: an_if.Interface,
     return commands
 
 
+@tracing.traced
+def generate_bulk_interface_commands(interfaces: [an_if.Interface],
+                                     update: bool = False) -> [str]:
+    """
+    Generate the config mode commands for several interfaces at once.
+    Interfaces whose generated configuration is identical are
+    configured together using interface ranges, so that applying the
+    same configuration to many ports produces a single block.
+    :param interfaces: A list of Autonet Interface objects.
+    :param update: Indicate if None values are to be interpreted as unset (`update=False`)
+                   or to be ignored (`update=True`)
+    :return:
+    """
+    # Group interface names by the commands that follow the
+    # `interface` line, preserving the order of first appearance.
+    groups = {}
+    for interface in interfaces:
+        body = tuple(generate_interface_commands(interface, update)[1:])
+        groups.setdefault(body, []).append(interface.name)
+
+    commands = []
+    for body, names in groups.items():
+        for if_range in common_task.get_if_ranges(names):
+            commands.append(f'interface {if_range}')
+            commands += body
+    return commands
+
+
+@tracing.traced
 def generate_delete_commands(interface_name: str):
     """
     Generates the commands required to reset an interface to its default
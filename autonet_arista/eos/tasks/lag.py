@@ -1,8 +1,8 @@
-import re
-
 from autonet.core.objects import lag as an_lag
 from typing import Union
 
+from autonet_arista.eos import patterns
+from autonet_arista.eos import tracing
 from autonet_arista.eos.tasks import common as common_task
 
 
@@ -30,9 +30,6 @@ def get_lag_esi(lag_name, show_run_port_channel) -> Union[str, None]:
     """
     config_lines = show_run_port_channel.split('\n')
 
-    if_context_regex = r'interface Port-Channel(?P<po_id>\d*)$'
-    es_context_regex = r'evpn ethernet-segment$'
-    esi_regex = r'identifier (?P<esi>([0-9abcdef]{4}:){4}[0-9abcdef]{4})$'
     _, lag_context = common_task.get_if_parts(lag_name)
 
     if_context = None
@@ -40,7 +37,7 @@ def get_lag_esi(lag_name, show_run_port_channel) -> Union[str, None]:
     for line in config_lines:
         # if we match an interface line, we set the interface context to
         # said result, and reset the value of evpn_es_context.
-        if match := re.search(if_context_regex, line):
+        if match := patterns.LAG_IF_CONTEXT.search(line):
             if_context = match.group('po_id')
             evpn_es_context = False
         # If we aren't in the right interface context, then we just skip
@@ -48,17 +45,18 @@ def get_lag_esi(lag_name, show_run_port_channel) -> Union[str, None]:
         if lag_context != if_context:
             continue
         # if we match evpn_es_context, then we set it true.
-        if re.search(es_context_regex, line):
+        if patterns.LAG_ES_CONTEXT.search(line):
             evpn_es_context = True
             continue
         # if we are in evpn_es_context and match an ESI we return the ESI.
-        if match := re.search(esi_regex, line):
+        if match := patterns.LAG_ESI.search(line):
             if evpn_es_context:
                 return match.group('esi')
 
     return None
 
 
+@tracing.traced
 def get_lags(show_port_channel: dict, show_run_port_channel: str,
              lag_name: str = None) -> [an_lag.LAG]:
     """
@@ -92,6 +90,7 @@ def get_lags(show_port_channel: dict, show_run_port_channel: str,
     return lags
 
 
+@tracing.traced
 def generate_lag_create_commands(lag: an_lag.LAG) -> [str]:
     """
     Generate a list of commands required to create a new LAG on the device.
@@ -105,30 +104,34 @@ def generate_lag_create_commands(lag: an_lag.LAG) -> [str]:
             'evpn ethernet-segment',
             f'identifier {format_esi(lag.evpn_esi)}'
         ]
-    # Bind member interfaces, if they are passed in.
+    # Bind member interfaces, if they are passed in.  Contiguous
+    # members are configured together as an interface range.
     if lag.members:
         _, lag_id = common_task.get_if_parts(lag.name)
-        for member in lag.members:
+        for member_range in common_task.get_if_ranges(lag.members):
             commands += [
-                f'default interface {member}',
-                f'interface {member}',
+                f'default interface {member_range}',
+                f'interface {member_range}',
                 f'channel-group {lag_id} mode active'
             ]
 
     return commands
 
 
+@tracing.traced
 def generate_lag_delete_commands(lag: an_lag.LAG) -> [str]:
     """
     Generate a list of commands to destroy a given LAG.
     :param lag: A `LAG` object.
     :return:
     """
-    commands = [f'default interface {member}' for member in lag.members]
+    commands = [f'default interface {member_range}'
+                for member_range in common_task.get_if_ranges(lag.members)]
     commands.append(f'no interface {lag.name}')
     return commands
 
 
+@tracing.traced
 def generate_lag_update_commands(new_lag: an_lag.LAG, old_lag: an_lag.LAG, update: bool) -> [str]:
     """
     Generates a list of commands to update a given lag from its current
@@ -154,7 +157,8 @@ def generate_lag_update_commands(new_lag: an_lag.LAG, old_lag: an_lag.LAG, updat
         new_members = new_lag.members or []
         remove_members = [member for member in old_lag.members
                           if member not in new_members]
-        commands += [f'default interface {member}' for member in remove_members]
+        commands += [f'default interface {member_range}'
+                     for member_range in common_task.get_if_ranges(remove_members)]
 
     # Now enter into the Port-Channel configuration block.
     commands.append(f'interface {new_lag.name}')
@@ -169,10 +173,11 @@ def generate_lag_update_commands(new_lag: an_lag.LAG, old_lag: an_lag.LAG, updat
     # And finally add new interfaces.
     _, lag_id = common_task.get_if_parts(new_lag.name)
     if new_lag.members:
-        for member in new_lag.members:
-            if member not in old_lag.members:
-                commands += [
-                    f'interface {member}',
-                    f'channel-group {lag_id} mode active'
-                ]
+        add_members = [member for member in new_lag.members
+                       if member not in old_lag.members]
+        for member_range in common_task.get_if_ranges(add_members):
+            commands += [
+                f'interface {member_range}',
+                f'channel-group {lag_id} mode active'
+            ]
     return commands
@@ -3,6 +3,8 @@ import pytest
 
 from autonet.core.objects import interfaces as an_if
 
+from autonet_arista.eos.tests.conftest import test_make_interface  # noqa: F401
+
 TEST_INTERFACE_1 = an_if.Interface(
     name='Loopback5', mode='routed', description='A test loopback',
     admin_enabled=True, attributes=an_if.InterfaceRouteAttributes(
@@ -32,11 +32,160 @@ def test_get_fq_if_name_error(test_name):
         common_task.get_fq_if_name(test_name)
 
 
+@pytest.mark.parametrize('test_names, expected', [
+    ([f'Ethernet{i}' for i in range(1, 49)], ['Ethernet1-48']),
+    (['Et6', 'Ethernet5', 'Ethernet8'], ['Ethernet5-6', 'Ethernet8']),
+    (['Ethernet2/1', 'Ethernet1/2', 'Ethernet1/1', 'Ethernet2/2'],
+     ['Ethernet2/1-2', 'Ethernet1/1-2']),
+    (['Ethernet49/1/1', 'Ethernet49/1/2', 'Ethernet50/1'],
+     ['Ethernet49/1/1-2', 'Ethernet50/1']),
+    (['Vxlan', 'Ethernet1', 'Ethernet1'], ['Vxlan', 'Ethernet1']),
+    (['Ethernet1.100'], ['Ethernet1.100']),
+    (['Ethernet1.100', 'Ethernet2.100', 'Ethernet1'],
+     ['Ethernet1.100', 'Ethernet2.100', 'Ethernet1']),
+    ([], []),
+])
+def test_get_if_ranges(test_names, expected):
+    assert common_task.get_if_ranges(test_names) == expected
+
+
 def test_parse_bgp_evpn_vxlan_config(test_bgp_text_config, test_bgp_config):
     cfg = common_task.parse_bgp_vpn_config(test_bgp_text_config)
     assert cfg == test_bgp_config
 
 
+def test_bgp_records(test_bgp_text_config):
+    cfg = common_task.parse_bgp_vpn_config(test_bgp_text_config)
+    vrf = cfg['vrfs']['blue']
+    assert isinstance(vrf, common_task.BgpVrfNode)
+    assert vrf['import_targets']['vpn-ipv4'] == ['65002:20001']
+    assert vrf.get('missing') is None
+    assert not hasattr(vrf, '__dict__')
+    with pytest.raises(AttributeError):
+        vrf.rd = '198.18.0.101:1'
+    vlan = common_task.BgpVlanNode({'rd': '198.18.0.101:71'})
+    assert vlan == {'rd': '198.18.0.101:71'}
+    assert 'import_targets' not in vlan
+    assert len(vlan) == 1
+
+
+def test_parse_bgp_vpn_config_incremental(test_bgp_text_config, test_bgp_config):
+    """
+    Test that an incremental parse matches a full parse, and that only
+    changed blocks are parsed again.
+    """
+    cache = common_task.BgpParseCache()
+    cfg = common_task.parse_bgp_vpn_config(test_bgp_text_config, cache=cache)
+    assert cfg == test_bgp_config
+    assert common_task.parse_bgp_vpn_config(test_bgp_text_config, cache=cache) is cfg
+
+    changed_text = test_bgp_text_config.replace(
+        'rd 198.18.0.101:4094', 'rd 198.18.0.101:4000')
+    changed = common_task.parse_bgp_vpn_config(changed_text, cache=cache)
+    assert changed == common_task.parse_bgp_vpn_config(changed_text)
+    assert changed['vrfs']['red']['rd'] == '198.18.0.101:4000'
+    assert changed['vrfs']['red'] is not cfg['vrfs']['red']
+    assert changed['vrfs']['blue'] is cfg['vrfs']['blue']
+    assert changed['vlans']['71'] is cfg['vlans']['71']
+
+
+def test_parse_bgp_vpn_config_incremental_prune(test_bgp_text_config):
+    """
+    Test that blocks removed from the device are dropped from the cache
+    by a full parse, but not by a parse scoped to a single block.
+    """
+    cache = common_task.BgpParseCache()
+    common_task.parse_bgp_vpn_config(test_bgp_text_config, cache=cache)
+    assert ('vrfs', 'red') in cache.blocks
+    scoped_text = 'router bgp 65002\n   vrf blue\n      rd 198.18.0.101:2'
+    common_task.parse_bgp_vpn_config(scoped_text, cache=cache, partial=True)
+    assert ('vrfs', 'red') in cache.blocks
+    common_task.parse_bgp_vpn_config(
+        scoped_text.replace('\n', '\n   router-id 198.18.0.101\n', 1), cache=cache)
+    assert list(cache.blocks) == [('vrfs', 'blue')]
+
+
+def test_split_bgp_blocks():
+    other_text, blocks = common_task.split_bgp_blocks(
+        'router bgp 65002\n'
+        '   router-id 198.18.0.101\n'
+        '   vlan 71\n'
+        '      rd 198.18.0.101:71\n'
+        '   address-family evpn\n'
+        '      neighbor overlay activate\n'
+        '   vrf red\n'
+        '      rd 198.18.0.101:4094')
+    assert other_text == ('router bgp 65002\n'
+                          '   router-id 198.18.0.101\n'
+                          '   address-family evpn\n'
+                          '      neighbor overlay activate')
+    assert blocks == [
+        ('vlans', '71', '   vlan 71\n      rd 198.18.0.101:71'),
+        ('vrfs', 'red', '   vrf red\n      rd 198.18.0.101:4094'),
+    ]
+
+
+@pytest.mark.parametrize('vrf, vlan, expected', [
+    (None, None, ['show running-config section bgp']),
+    ('red', None, ['show running-config section router-id',
+                   'show running-config section vrf red$']),
+    (None, 71, ['show running-config section router-id',
+                'show running-config section vlan 71$']),
+])
+def test_get_bgp_section_commands(vrf, vlan, expected):
+    assert common_task.get_bgp_section_commands(vrf=vrf, vlan=vlan) == expected
+
+
+def test_parse_scoped_bgp_sections():
+    """
+    Test that scoped section outputs are reduced to their `router bgp`
+    blocks and parse correctly when combined.
+    """
+    show_router_id = """router bgp 65002
+   router-id 198.18.0.101
+   vrf blue
+      router-id 198.18.0.102
+"""
+    show_vrf_red = """vrf instance red
+!
+interface Vlan10
+   vrf red
+   ip address virtual 10.0.0.1/24
+!
+ip routing vrf red
+!
+router bgp 65002
+   vrf red
+      rd 198.18.0.101:4094
+      route-target import evpn 65002:20000
+      route-target export evpn 65002:20000
+"""
+    bgp_text = common_task.get_bgp_section([show_router_id, show_vrf_red])
+    assert 'interface Vlan10' not in bgp_text
+    assert common_task.parse_bgp_vpn_config(bgp_text) == {
+        'asn': '65002',
+        'rid': '198.18.0.101',
+        'vrfs': {
+            'blue': {'rid': '198.18.0.102'},
+            'red': {
+                'rd': '198.18.0.101:4094',
+                'import_targets': {'evpn': ['65002:20000'], 'vpn-ipv4': [], 'vpn-ipv6': []},
+                'export_targets': {'evpn': ['65002:20000'], 'vpn-ipv4': [], 'vpn-ipv6': []},
+            }
+        }
+    }
+
+
+def test_get_bgp_facts(test_bgp_text_config):
+    assert common_task.get_bgp_facts(test_bgp_text_config) == {
+        'asn': '65002', 'rid': '198.18.0.101'}
+
+
+def test_get_bgp_config(test_bgp_text_config, test_bgp_config):
+    assert common_task.get_bgp_config(test_bgp_text_config) == test_bgp_config
+    assert common_task.get_bgp_config(test_bgp_config) is test_bgp_config
+
+
 @pytest.mark.parametrize('test_vxlan, expected_imports, expected_exports', [
     (an_vxlan.VXLAN(
         id=70002, layer=2, import_targets=['auto'], export_targets=['auto'],
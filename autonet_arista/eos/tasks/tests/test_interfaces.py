@@ -151,6 +151,25 @@ def test_get_interface_object(test_interface, test_eos_interfaces_vlans,
     assert if_obj == expected
 
 
+def test_get_interface_objects(test_routed_interface, test_bridge_interface,
+                               test_eos_interfaces_vlans, test_eos_vrfs,
+                               test_eos_lags):
+    eos_interfaces = [test_routed_interface, test_bridge_interface]
+    if_objs = if_tasks.get_interface_objects(eos_interfaces,
+                                             test_eos_interfaces_vlans,
+                                             test_eos_vrfs, test_eos_lags)
+    assert if_objs == [
+        if_tasks.get_interface_object(eos_interface, test_eos_interfaces_vlans,
+                                      test_eos_vrfs, test_eos_lags)
+        for eos_interface in eos_interfaces]
+
+
+def test_get_interface_address_copies():
+    address = if_tasks.get_interface_address('ipv4', '198.18.0.1/24')
+    address.virtual = True
+    assert not if_tasks.get_interface_address('ipv4', '198.18.0.1/24').virtual
+
+
 @pytest.mark.parametrize('test_interface_object, update, expected', [
     ('test_interface1', False, [
         'interface Loopback5',
@@ -442,6 +461,39 @@ def test_generate_interface_commands(test_interface_object, update, expected):
         test_interface_object, update) == expected
 
 
+def test_generate_bulk_interface_commands(test_make_interface):
+    interfaces = [test_make_interface(f'Ethernet{i}') for i in range(1, 49)
+                  if i != 24]
+    interfaces.append(test_make_interface('Ethernet24', pvid=20))
+    body = [
+        'no description',
+        'no shutdown',
+        'no mtu',
+        'switchport',
+        'switchport mode access',
+    ]
+    assert if_tasks.generate_bulk_interface_commands(interfaces) == [
+        'interface Ethernet1-23', *body, 'switchport access vlan 10',
+        'switchport trunk allowed vlan none',
+        'interface Ethernet25-48', *body, 'switchport access vlan 10',
+        'switchport trunk allowed vlan none',
+        'interface Ethernet24', *body, 'switchport access vlan 20',
+        'switchport trunk allowed vlan none',
+    ]
+
+
+def test_generate_bulk_interface_commands_subinterfaces(test_make_interface):
+    """
+    Test that subinterfaces are configured individually rather than as
+    a range of their parent interfaces.
+    """
+    interfaces = [test_make_interface(name, mode='routed')
+                  for name in ['Ethernet1.100', 'Ethernet2.100']]
+    commands = if_tasks.generate_bulk_interface_commands(interfaces)
+    assert [c for c in commands if c.startswith('interface')] == [
+        'interface Ethernet1.100', 'interface Ethernet2.100']
+
+
 @pytest.mark.parametrize('interface_name, expected',[
     ('Loopback1', ['no interface Loopback1']),
     ('Ethernet5', ['default interface Ethernet5']),
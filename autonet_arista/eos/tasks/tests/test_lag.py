@@ -59,13 +59,22 @@ def test_get_lags(test_lag_name, expected, test_show_port_channel, test_show_run
          'interface Port-Channel1',
          'evpn ethernet-segment',
          'identifier 00be:e9af:003f:6000:0000',
-         'default interface Ethernet6',
-         'interface Ethernet6',
-         'channel-group 1 mode active',
-         'default interface Ethernet5',
-         'interface Ethernet5',
+         'default interface Ethernet5-6',
+         'interface Ethernet5-6',
          'channel-group 1 mode active'
      ]),
+    (an_lag.LAG(name='Port-Channel10',
+                members=[f'Ethernet1/{i}' for i in range(1, 17)] + ['Ethernet2/1'],
+                evpn_esi=None),
+     [
+         'interface Port-Channel10',
+         'default interface Ethernet1/1-16',
+         'interface Ethernet1/1-16',
+         'channel-group 10 mode active',
+         'default interface Ethernet2/1',
+         'interface Ethernet2/1',
+         'channel-group 10 mode active'
+     ]),
     (an_lag.LAG(name='Port-Channel22',
                 members=['Ethernet8', 'Ethernet22', 'Ethernet48/1'],
                 evpn_esi=None),
@@ -152,8 +161,7 @@ def test_generate_lag_create_commands(test_lag, expected):
                        evpn_esi='00:be:e9:af:00:3f:60:00:00:00'),
             False,
             [
-                'default interface Ethernet6',
-                'default interface Ethernet5',
+                'default interface Ethernet5-6',
                 'interface Port-Channel1',
                 'evpn ethernet-segment',
                 'identifier 00be:e9af:003f:6000:0000'
@@ -170,8 +178,7 @@ def test_generate_lag_update_commands(test_new_lag, test_old_lag, update, expect
                 members=['Ethernet6', 'Ethernet5'],
                 evpn_esi='00:be:e9:af:00:3f:60:00:00:00'),
      [
-         'default interface Ethernet6',
-         'default interface Ethernet5',
+         'default interface Ethernet5-6',
          'no interface Port-Channel1'
      ]),
     (an_lag.LAG(name='Port-Channel22',
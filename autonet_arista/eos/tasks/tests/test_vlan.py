@@ -6,6 +6,15 @@ from autonet.core.objects import vlan as an_vlan
 from autonet_arista.eos.tasks import vlan as vlan_task
 
 
+@pytest.mark.parametrize('vlan_id, expected', [
+    (None, 'show vlan'),
+    (71, 'show vlan 71'),
+    ('2301', 'show vlan 2301'),
+])
+def test_get_show_vlan_command(vlan_id, expected):
+    assert vlan_task.get_show_vlan_command(vlan_id) == expected
+
+
 @pytest.mark.parametrize('vlan_id, expected', [
     (None, [
         an_vlan.VLAN(id=2301, name='VLAN2301',
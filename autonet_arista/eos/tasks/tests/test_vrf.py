@@ -5,6 +5,14 @@ from autonet.core.objects import vrf as an_vrf
 from autonet_arista.eos.tasks import vrf as vrf_task
 
 
+@pytest.mark.parametrize('vrf, expected', [
+    (None, 'show vrf'),
+    ('red', 'show vrf red'),
+])
+def test_get_show_vrf_command(vrf, expected):
+    assert vrf_task.get_show_vrf_command(vrf) == expected
+
+
 @pytest.mark.parametrize('vrf, expected', [
     (
             None,
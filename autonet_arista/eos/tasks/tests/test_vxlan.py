@@ -36,6 +36,16 @@ def test_get_vxlans(vnid, expected, test_show_int_vxlan, test_bgp_text_config):
         vnid) == expected
 
 
+@pytest.mark.parametrize('vnid, expected', [
+    (70001, {'vlan': '71'}),
+    (20000, {'vrf': 'red'}),
+    (11000, {}),
+    (99999, {}),
+])
+def test_get_vxlan_bgp_scope(vnid, expected, test_show_int_vxlan):
+    assert vxlan_task.get_vxlan_bgp_scope(test_show_int_vxlan, vnid) == expected
+
+
 def test_generate_l2_vxlan_create_commands():
     test_vxlan = an_vxlan.VXLAN(
         id=70002, layer=2, import_targets=['auto'], export_targets=['auto'],
@@ -302,3 +312,57 @@ def test_generate_vxlan_delete_commands(test_vxlan, expected, test_bgp_text_conf
     commands = vxlan_task.generate_vxlan_delete_commands(
         test_vxlan, test_bgp_text_config)
     assert commands == expected
+
+
+def test_generate_bulk_vxlan_commands(test_show_int_vxlan, test_bgp_text_config):
+    vxlans = [
+        an_vxlan.VXLAN(id=70000 + i, layer=2, import_targets=['auto'],
+                       export_targets=['auto'], route_distinguisher='auto',
+                       bound_object_id=i)
+        for i in (71, 72)
+    ] + [an_vxlan.VXLAN(id=20000, layer=3, import_targets=['65002:20000'],
+                        export_targets=['65002:20000'],
+                        route_distinguisher='198.18.0.101:4094',
+                        bound_object_id='red')]
+    assert vxlan_task.generate_bulk_vxlan_commands(vxlans) == [
+        'interface vxlan1',
+        'vxlan vlan 71 vni 70071',
+        'vxlan vlan 72 vni 70072',
+        'vxlan vrf red vni 20000'
+    ]
+    assert vxlan_task.generate_bulk_vxlan_evpn_commands(
+        vxlans, test_show_int_vxlan, test_bgp_text_config) == [
+        'router bgp 65002',
+        'vlan 71',
+        'redistribute learned',
+        'rd 198.18.0.101:71',
+        'route-target import 65002:70071',
+        'route-target export 65002:70071',
+        'exit',
+        'vlan 72',
+        'redistribute learned',
+        'rd 198.18.0.101:72',
+        'route-target import 65002:70072',
+        'route-target export 65002:70072',
+        'exit',
+        'vrf red',
+        'redistribute connected',
+        'redistribute attached-host',
+        'redistribute static',
+        'rd 198.18.0.101:4094',
+        'route-target import evpn 65002:20000',
+        'route-target export evpn 65002:20000',
+        'exit'
+    ]
+    assert vxlan_task.generate_bulk_vxlan_delete_commands(vxlans, test_bgp_text_config) == [
+        'interface vxlan1',
+        'no vxlan vlan 71 vni 70071',
+        'no vxlan vlan 72 vni 70072',
+        'no vxlan vrf red vni 20000',
+        'router bgp 65002',
+        'no vlan 71',
+        'no vlan 72',
+        'vrf red',
+        'no redistribute attached-host',
+        'exit'
+    ]
@@ -1,10 +1,11 @@
-import re
-
 from typing import Union
 
 from autonet.core import exceptions as exc
 from autonet.core.objects import vlan as an_vlan
 
+from autonet_arista.eos import patterns
+from autonet_arista.eos import tracing
+
 
 def verify_vlan_name(vlan_name: str) -> bool:
     """
@@ -13,9 +14,22 @@ def verify_vlan_name(vlan_name: str) -> bool:
     :param vlan_name: A VLAN name.
     :return:
     """
-    return bool(re.search(r'\s', vlan_name))
+    return bool(patterns.WHITESPACE.search(vlan_name))
+
+
+def get_show_vlan_command(vlan_id: Union[str, int] = None) -> str:
+    """
+    Generates the `show vlan` command for the requested VLAN, so that
+    the device only returns the VLAN that is needed.
+    :param vlan_id: A VLAN ID.  If not set, all VLANs are shown.
+    :return:
+    """
+    if not vlan_id:
+        return 'show vlan'
+    return f'show vlan {vlan_id}'
 
 
+@tracing.traced
 def get_vlans(show_vlan: dict, vlan_id: Union[str, int] = None):
     """
     Gets a list of `VLAN` objects.  If vlan_id is specified, then
@@ -42,6 +56,7 @@ def get_vlans(show_vlan: dict, vlan_id: Union[str, int] = None):
     return vlans
 
 
+@tracing.traced
 def generate_vlan_create_commands(vlan: an_vlan.VLAN) -> [str]:
     """
     Generates a list of commands required to create the VLAN defined
@@ -56,7 +71,7 @@ def generate_vlan_create_commands(vlan: an_vlan.VLAN) -> [str]:
         f'state {"active" if vlan.admin_enabled else "suspend"}'
     ]
     if vlan.name:
-        if re.search(r'\s', vlan.name):
+        if patterns.WHITESPACE.search(vlan.name):
             raise exc.AutonetException("VLAN name cannot contain whitespace.")
         else:
             commands.append(f'name {vlan.name}')
@@ -64,6 +79,7 @@ def generate_vlan_create_commands(vlan: an_vlan.VLAN) -> [str]:
     return commands
 
 
+@tracing.traced
 def generate_vlan_update_commands(vlan):
     """
     Generates a list of commands required to update a VLAN defined
@@ -77,6 +93,7 @@ def generate_vlan_update_commands(vlan):
     return commands
 
 
+@tracing.traced
 def generate_vlan_delete_commands(vlan_id: Union[str, int]) -> [str]:
     """
     Generates the list of commands required to delete the VLAN as
@@ -1,20 +1,35 @@
+from typing import Union
+
 from autonet.core.objects import vrf as an_vrf
+from autonet_arista.eos import tracing
 from autonet_arista.eos.tasks import common as common_task
 
 
-def get_vrfs(show_vrf: dict, bgp_text_config: str,
+def get_show_vrf_command(vrf: str = None) -> str:
+    """
+    Generates the `show vrf` command for the requested VRF, so that the
+    device only returns the VRF that is needed.
+    :param vrf: A VRF name.  If not set, all VRFs are shown.
+    :return:
+    """
+    return f'show vrf {vrf}' if vrf else 'show vrf'
+
+
+@tracing.traced
+def get_vrfs(show_vrf: dict, bgp_text_config: Union[str, dict],
              vrf: str = None) -> [an_vrf.VRF]:
     """
     Generate a list of configured VRFs and associated VPN data
     from the output of "show vrf" and the BGP text config.
     :param show_vrf: Output of the "show vrf" command.
-    :param bgp_text_config: The textual BGP configuration.
+    :param bgp_text_config: The textual BGP configuration, or the
+                            parsed BGP configuration.
     :param vrf: A VRF name.  If specified only the named VRF is
                 returned.
     :return:
     """
     excluded_vrfs = ['default', 'mgmt-if']
-    bgp_config = common_task.parse_bgp_vpn_config(bgp_text_config)
+    bgp_config = common_task.get_bgp_config(bgp_text_config)
     vrfs = []
     for vrf_name, vrf_data in show_vrf['vrfs'].items():
         if vrf_name in excluded_vrfs:
@@ -53,11 +68,13 @@ def get_vrfs(show_vrf: dict, bgp_text_config: str,
     return vrfs
 
 
-def generate_create_vrf_commands(vrf: an_vrf.VRF, show_bgp_config: str):
+@tracing.traced
+def generate_create_vrf_commands(vrf: an_vrf.VRF, show_bgp_config: Union[str, dict]):
     """
     Generate the commands needed to create a VRF.
     :param vrf: A `VRF` object.
-    :param show_bgp_config: The textual BGP configuration.
+    :param show_bgp_config: The textual BGP configuration, or the
+                            structured BGP facts.
     :return:
     """
     commands = [
@@ -73,7 +90,7 @@ def generate_create_vrf_commands(vrf: an_vrf.VRF, show_bgp_config: str):
     # If there's no RD there's no point in RTs either, so we
     # ignore the RTs if RD is not set.
     if vrf.route_distinguisher:
-        bgp_config = common_task.parse_bgp_vpn_config(show_bgp_config)
+        bgp_config = common_task.get_bgp_config(show_bgp_config)
         commands += [
             f'router bgp {bgp_config["asn"]}',
             f'vrf {vrf.name}',
@@ -89,14 +106,16 @@ def generate_create_vrf_commands(vrf: an_vrf.VRF, show_bgp_config: str):
     return commands
 
 
-def generate_delete_vrf_commands(vrf: an_vrf.VRF, show_bgp_config: str):
+@tracing.traced
+def generate_delete_vrf_commands(vrf: an_vrf.VRF, show_bgp_config: Union[str, dict]):
     """
     Generate the commands needed to delete a VRF.
     :param vrf: A `VRF` object.
-    :param show_bgp_config: The textual BGP configuration.
+    :param show_bgp_config: The textual BGP configuration, or the
+                            structured BGP facts.
     :return:
     """
-    bgp_config = common_task.parse_bgp_vpn_config(show_bgp_config)
+    bgp_config = common_task.get_bgp_config(show_bgp_config)
     return [
         f'no ip routing vrf {vrf.name}',
         f'no ipv6 unicast-routing vrf {vrf.name}',
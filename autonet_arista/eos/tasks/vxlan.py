@@ -1,16 +1,21 @@
+from typing import Union
+
 from autonet.core import exceptions as exc
 from autonet.core.objects import vxlan as an_vxlan
 
+from autonet_arista.eos import tracing
 from autonet_arista.eos.tasks import common as common_task
 
 
-def get_vxlans(show_int_vxlan: dict, show_bgp_config: str,
+@tracing.traced
+def get_vxlans(show_int_vxlan: dict, show_bgp_config: Union[str, dict],
                vnid: int = None) -> [an_vxlan.VXLAN]:
     """
     Parse VXLAN interface and BGP configuration to return a list
     of `VXLAN` objects.
     :param show_int_vxlan: Output from "show interfaces vxlan"
-    :param show_bgp_config: Textural BGP configuration.
+    :param show_bgp_config: Textural BGP configuration, or the parsed
+                            BGP configuration.
     :param vnid: When set only the VXLAN for the requested VNID is returned.
     :return:
     """
@@ -18,7 +23,7 @@ def get_vxlans(show_int_vxlan: dict, show_bgp_config: str,
     vtep_address = show_int_vxlan['interfaces']['Vxlan1']['srcIpAddr']
     l2_vnis = show_int_vxlan['interfaces']['Vxlan1']['vlanToVniMap']
     l3_vnis = show_int_vxlan['interfaces']['Vxlan1']['vrfToVniMap']
-    bgp_config = common_task.parse_bgp_vpn_config(show_bgp_config)
+    bgp_config = common_task.get_bgp_config(show_bgp_config)
     # parse l2 VNIS
     for vlan_id, l2_vni in l2_vnis.items():
         # If a VNID is requested, we check to see if this is it, otherwise
@@ -34,8 +39,8 @@ def get_vxlans(show_int_vxlan: dict, show_bgp_config: str,
             id=int(l2_vni['vni']),
             source_address=vtep_address,
             layer=2,
-            export_targets=bgp_config_node.get('export_targets', []),
-            import_targets=bgp_config_node.get('import_targets', []),
+            export_targets=list(bgp_config_node.get('export_targets', [])),
+            import_targets=list(bgp_config_node.get('import_targets', [])),
             route_distinguisher=bgp_config_node.get('rd', None),
             bound_object_id=int(vlan_id)
         ))
@@ -48,8 +53,8 @@ def get_vxlans(show_int_vxlan: dict, show_bgp_config: str,
             id=int(l3_vni),
             source_address=vtep_address,
             layer=3,
-            export_targets=bgp_config_node.get('export_targets', {}).get('evpn', []),
-            import_targets=bgp_config_node.get('import_targets', {}).get('evpn', []),
+            export_targets=list(bgp_config_node.get('export_targets', {}).get('evpn', [])),
+            import_targets=list(bgp_config_node.get('import_targets', {}).get('evpn', [])),
             route_distinguisher=bgp_config_node.get('rd', None),
             bound_object_id=vrf_name
         ))
@@ -57,6 +62,28 @@ def get_vxlans(show_int_vxlan: dict, show_bgp_config: str,
     return vxlans
 
 
+def get_vxlan_bgp_scope(show_int_vxlan: dict, vnid: int) -> dict:
+    """
+    Find the VLAN or VRF bound to a VNI, returned as keyword arguments
+    for :py:func:`common.get_bgp_section_commands` so that only the BGP
+    configuration for that VNI is fetched.  An empty dict is returned
+    if the VNI is not configured.
+    :param show_int_vxlan: Output from "show interfaces vxlan"
+    :param vnid: The VNI.
+    :return:
+    """
+    l2_vnis = show_int_vxlan['interfaces']['Vxlan1']['vlanToVniMap']
+    l3_vnis = show_int_vxlan['interfaces']['Vxlan1']['vrfToVniMap']
+    for vlan_id, l2_vni in l2_vnis.items():
+        # Skip VNIs observed from EVPN, as in `get_vxlans()`.
+        if int(l2_vni['vni']) == vnid and l2_vni['source'] != 'evpn':
+            return {'vlan': vlan_id}
+    for vrf_name, l3_vni in l3_vnis.items():
+        if int(l3_vni) == vnid:
+            return {'vrf': vrf_name}
+    return {}
+
+
 def generate_l2_vxlan_create_commands(vxlan: an_vxlan.VXLAN) -> [str]:
     """
     Generate the commands required to create a l2 vxlan as
@@ -83,6 +110,7 @@ def generate_l3_vxlan_create_commands(vxlan: an_vxlan.VXLAN) -> [str]:
     ]
 
 
+@tracing.traced
 def generate_vxlan_commands(vxlan: an_vxlan.VXLAN) -> [str]:
     """
     Generate the commands required to create given vxlan as
@@ -154,16 +182,18 @@ def generate_l3_vxlan_evpn_commands(vxlan: an_vxlan.VXLAN, show_int_vxlan: dict,
            ] + import_rt_cmds + export_rt_cmds
 
 
+@tracing.traced
 def generate_vxlan_evpn_commands(vxlan: an_vxlan.VXLAN, show_int_vxlan: dict,
-                                 show_bgp_config: str) -> [str]:
+                                 show_bgp_config: Union[str, dict]) -> [str]:
     """
     Generate BGP_EVPN commands to advertise a given VNI.
     :param vxlan: A `VXLAN` object.
     :param show_int_vxlan: Output from "show interfaces vxlan"
-    :param show_bgp_config: Textural BGP configuration.
+    :param show_bgp_config: Textural BGP configuration, or the structured
+                            BGP facts.
     :return:
     """
-    bgp_config = common_task.parse_bgp_vpn_config(show_bgp_config)
+    bgp_config = common_task.get_bgp_config(show_bgp_config)
     if vxlan.layer == 2:
         return generate_l2_vxlan_evpn_commands(
             vxlan, show_int_vxlan, bgp_config)
@@ -172,7 +202,9 @@ def generate_vxlan_evpn_commands(vxlan: an_vxlan.VXLAN, show_int_vxlan: dict,
             vxlan, show_int_vxlan, bgp_config)
 
 
-def generate_vxlan_delete_commands(vxlan: an_vxlan.VXLAN, show_bgp_config: str) -> [str]:
+@tracing.traced
+def generate_vxlan_delete_commands(vxlan: an_vxlan.VXLAN,
+                                   show_bgp_config: Union[str, dict]) -> [str]:
     """
     Generates a set of commands to remove a VXLAN tunnel from a device.
     For L2 VNIs, we will remove the vlan from the BGP EVPN configuration.
@@ -182,10 +214,11 @@ def generate_vxlan_delete_commands(vxlan: an_vxlan.VXLAN, show_bgp_config: str)
     the VRF itself would need to be made and are generally expected in
     teardown use cases.
     :param vxlan: A `VXLAN` object.
-    :param show_bgp_config: The active textual BGP configuration.
+    :param show_bgp_config: The active textual BGP configuration, or the
+                            structured BGP facts.
     :return:
     """
-    bgp_config = common_task.parse_bgp_vpn_config(show_bgp_config)
+    bgp_config = common_task.get_bgp_config(show_bgp_config)
     if vxlan.layer == 2:
         return [
             'interface vxlan1',
@@ -201,3 +234,66 @@ def generate_vxlan_delete_commands(vxlan: an_vxlan.VXLAN, show_bgp_config: str)
             f'vrf {vxlan.bound_object_id}',
             'no redistribute attached-host'
         ]
+
+
+@tracing.traced
+def generate_bulk_vxlan_commands(vxlans: [an_vxlan.VXLAN]) -> [str]:
+    """
+    Generate the commands to create several VXLAN tunnels, with all of
+    the VNI mappings in a single `interface vxlan1` block.
+    :param vxlans: A list of `VXLAN` objects.
+    :return:
+    """
+    commands = ['interface vxlan1']
+    for vxlan in vxlans:
+        # Drop the `interface vxlan1` line from each tunnel's commands.
+        commands += generate_vxlan_commands(vxlan)[1:]
+    return commands
+
+
+@tracing.traced
+def generate_bulk_vxlan_evpn_commands(vxlans: [an_vxlan.VXLAN], show_int_vxlan: dict,
+                                      show_bgp_config: Union[str, dict]) -> [str]:
+    """
+    Generate the BGP EVPN commands to advertise several VNIs, with all
+    of the VLAN and VRF blocks under a single `router bgp` block.
+    :param vxlans: A list of `VXLAN` objects.
+    :param show_int_vxlan: Output from "show interfaces vxlan", only
+                           required for L3 VNIs with an auto RD.
+    :param show_bgp_config: Textural BGP configuration, or the structured
+                            BGP facts.
+    :return:
+    """
+    bgp_config = common_task.get_bgp_config(show_bgp_config)
+    commands = [f'router bgp {bgp_config["asn"]}']
+    for vxlan in vxlans:
+        # Drop the `router bgp` line, and return to the `router bgp`
+        # level after each VLAN or VRF block.
+        commands += generate_vxlan_evpn_commands(vxlan, show_int_vxlan, bgp_config)[1:]
+        commands.append('exit')
+    return commands
+
+
+@tracing.traced
+def generate_bulk_vxlan_delete_commands(vxlans: [an_vxlan.VXLAN],
+                                        show_bgp_config: Union[str, dict]) -> [str]:
+    """
+    Generate the commands to remove several VXLAN tunnels, with all of
+    the VNI mappings removed in a single `interface vxlan1` block and
+    the BGP changes in a single `router bgp` block.  See
+    :py:func:`generate_vxlan_delete_commands` for what is removed.
+    :param vxlans: A list of `VXLAN` objects.
+    :param show_bgp_config: The active textual BGP configuration, or the
+                            structured BGP facts.
+    :return:
+    """
+    bgp_config = common_task.get_bgp_config(show_bgp_config)
+    vxlan_commands = ['interface vxlan1']
+    bgp_commands = [f'router bgp {bgp_config["asn"]}']
+    for vxlan in vxlans:
+        commands = generate_vxlan_delete_commands(vxlan, bgp_config)
+        vxlan_commands.append(commands[1])
+        bgp_commands += commands[3:]
+        if vxlan.layer == 3:
+            bgp_commands.append('exit')
+    return vxlan_commands + bgp_commands
@@ -0,0 +1,135 @@
+import json
+
+from functools import cached_property
+
+import pytest
+
+from autonet.core.device import AutonetDevice, AutonetDeviceCredentials
+from autonet.core.objects import interfaces as an_if
+
+from autonet_arista.eos import tracing
+from autonet_arista.eos.eos_driver import AristaDriver
+
+
+class FakeNode(object):
+    """
+    Stands in for a `pyeapi.client.Node`, recording the calls made to
+    it.  `responses` maps show commands to the result they return, and
+    `errors` maps method names to a list of exceptions to be raised by
+    successive calls to that method.  `hooks` maps method names to a
+    function called with each call to that method, before it returns.
+
+    Calls made to a node while another call to it is in progress are
+    recorded in `overlaps`, since an eAPI connection can't be shared
+    between threads.
+    """
+    def __init__(self, responses: dict = None):
+        self.responses = responses or {}
+        self.errors = {}
+        self.hooks = {}
+        self.calls = []
+        self.overlaps = []
+        self._active = 0
+
+    def share(self) -> 'FakeNode':
+        """
+        Returns a node for another connection to the same device, which
+        shares this node's responses, errors, hooks and recorded calls.
+        """
+        node = FakeNode(self.responses)
+        node.errors, node.hooks = self.errors, self.hooks
+        node.calls, node.overlaps = self.calls, self.overlaps
+        return node
+
+    def _call(self, *call):
+        self.calls.append(call)
+        if self._active:
+            self.overlaps.append(call)
+        self._active += 1
+        try:
+            if call[0] in self.hooks:
+                self.hooks[call[0]](*call[1:])
+            if self.errors.get(call[0]):
+                raise self.errors[call[0]].pop(0)
+        finally:
+            self._active -= 1
+
+    def enable(self, commands):
+        commands = [commands] if isinstance(commands, str) else list(commands)
+        self._call('enable', commands)
+        return [{'command': c, 'result': self.responses.get(c, {})}
+                for c in commands]
+
+    def configure_session(self):
+        self._call('configure_session')
+
+    def config(self, commands):
+        self._call('config', commands)
+
+    def commit(self):
+        self._call('commit')
+
+    def abort(self):
+        self._call('abort')
+
+    def run_commands(self, commands):
+        self._call('run_commands', commands)
+
+
+@pytest.fixture
+def test_device(request):
+    # Per-device state such as locks and circuit breakers is keyed by
+    # device ID, so each test gets a device of its own.
+    return AutonetDevice(
+        device_id=request.node.name,
+        address='192.0.2.1',
+        credentials=AutonetDeviceCredentials(username='admin', password='admin'),
+        driver='eos')
+
+
+@pytest.fixture
+def test_fake_node():
+    return FakeNode()
+
+
+@pytest.fixture
+def test_driver(test_device, test_fake_node, monkeypatch):
+    # Drivers created in the background, such as to confirm a commit,
+    # connect to the same fake device.
+    eapi = cached_property(lambda driver: test_fake_node.share())
+    eapi.__set_name__(AristaDriver, '_eapi')
+    monkeypatch.setattr(AristaDriver, '_eapi', eapi)
+    driver = AristaDriver(test_device)
+    driver._eapi = test_fake_node
+    return driver
+
+
+@pytest.fixture
+def test_spans(tmp_path):
+    """
+    Enables tracing for the duration of a test.  Returns a function
+    that reads the spans exported so far.
+    """
+    path = tmp_path / 'spans.jsonl'
+    tracing.configure(str(path))
+    yield lambda: [json.loads(line) for line in path.read_text().splitlines()] \
+        if path.exists() else []
+    tracing.configure(None)
+
+
+@pytest.fixture
+def test_make_interface():
+    """
+    Returns a factory for `Interface` objects.  Bridged interfaces are
+    access ports in `pvid`, and routed interfaces have no addresses.
+    """
+    def make_interface(name: str, mode: str = 'bridged', pvid: int = 10) -> an_if.Interface:
+        if mode == 'routed':
+            attributes = an_if.InterfaceRouteAttributes(addresses=[], vrf=None)
+        else:
+            attributes = an_if.InterfaceBridgeAttributes(
+                dot1q_enabled=False, dot1q_vids=[], dot1q_pvid=pvid)
+        return an_if.Interface(
+            name=name, mode=mode, description=None, admin_enabled=True,
+            mtu=None, attributes=attributes)
+    return make_interface
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from autonet_arista.eos import breaker, metrics
+from autonet_arista.eos.exceptions import DeviceUnavailable
+
+
+def _fail(test_breaker):
+    with pytest.raises(OSError):
+        with test_breaker.guard((OSError,)):
+            raise OSError('timed out')
+
+
+def _state_metric(test_breaker):
+    return metrics.get_value('arista_circuit_breaker_state', device=test_breaker.name)
+
+
+def test_breaker_opens():
+    test_breaker = breaker.CircuitBreaker('test-breaker-opens', 3, 60)
+    for _ in range(3):
+        assert test_breaker.state == breaker.CLOSED
+        _fail(test_breaker)
+    assert test_breaker.state == breaker.OPEN
+    assert _state_metric(test_breaker) == breaker.STATE_VALUES[breaker.OPEN]
+    with pytest.raises(DeviceUnavailable):
+        with test_breaker.guard((OSError,)):
+            pytest.fail('Call should not be allowed while the breaker is open.')
+    assert metrics.get_value('arista_circuit_breaker_rejected_total',
+                             device=test_breaker.name) == 1
+
+
+def test_breaker_success_resets_failures():
+    test_breaker = breaker.CircuitBreaker('test-breaker-resets', 2, 60)
+    _fail(test_breaker)
+    # Errors other than the failure types mean the device responded.
+    with pytest.raises(ValueError):
+        with test_breaker.guard((OSError,)):
+            raise ValueError('invalid command')
+    _fail(test_breaker)
+    assert test_breaker.state == breaker.CLOSED
+
+
+@pytest.mark.parametrize('probe_fails, expected', [
+    (False, breaker.CLOSED),
+    (True, breaker.OPEN)
+])
+def test_breaker_half_open(probe_fails, expected):
+    test_breaker = breaker.CircuitBreaker(f'test-breaker-half-open-{probe_fails}', 1, 0.05)
+    _fail(test_breaker)
+    time.sleep(0.06)
+    if probe_fails:
+        _fail(test_breaker)
+    else:
+        with test_breaker.guard((OSError,)):
+            assert test_breaker.state == breaker.HALF_OPEN
+            # Only one probe is allowed at a time.
+            with pytest.raises(DeviceUnavailable):
+                with test_breaker.guard((OSError,)):
+                    pass
+    assert test_breaker.state == expected
+    assert _state_metric(test_breaker) == breaker.STATE_VALUES[expected]
+
+
+def test_breaker_disabled():
+    test_breaker = breaker.CircuitBreaker('test-breaker-disabled', 0, 60)
+    for _ in range(10):
+        _fail(test_breaker)
+    assert test_breaker.state == breaker.CLOSED
@@ -0,0 +1,703 @@
+import os
+import threading
+
+import pytest
+
+from autonet.core.objects import vrf as an_vrf
+from autonet.core.objects import vxlan as an_vxlan
+from pyeapi.eapilib import CommandError, ConnectionError
+
+from autonet_arista.eos import exceptions
+from autonet_arista.eos import facts
+from autonet_arista.eos import jobs
+from autonet_arista.eos import metrics
+from autonet_arista.eos import save_queue
+from autonet_arista.eos import snapshots
+from autonet_arista.eos.eos_driver import AristaDriver
+
+
+def test_driver_timeouts(test_device):
+    test_device.metadata.update({'connect_timeout': 5, 'read_timeout': 30})
+    eapi_transport = AristaDriver(test_device)._eapi.connection.transport
+    assert eapi_transport.timeout == 5
+    assert eapi_transport.read_timeout == 30
+
+
+def test_driver_lazy_connection(test_device):
+    driver = AristaDriver(test_device)
+    assert '_eapi' not in vars(driver)
+    assert driver._eapi is driver._eapi
+
+
+def test_driver_shared_ssl_context(test_device):
+    context_a = AristaDriver(test_device)._eapi.connection.transport._context
+    context_b = AristaDriver(test_device)._eapi.connection.transport._context
+    assert context_a is context_b
+    test_device.metadata['tls_ciphers'] = 'HIGH'
+    context_c = AristaDriver(test_device)._eapi.connection.transport._context
+    assert context_c is not context_a
+
+
+@pytest.mark.parametrize('metadata, profile, expected', [
+    ({}, None, 0),
+    ({}, True, 1),
+    ({'profile_enabled': True}, None, 1),
+    ({'profile_enabled': True}, False, 0),
+    ({'profile_enabled': True, 'profile_sample_rate': 0}, None, 0),
+])
+def test_execute_profile(test_driver, tmp_path, monkeypatch, metadata, profile, expected):
+    test_driver.device.metadata.update(metadata, profile_dir=str(tmp_path))
+    monkeypatch.setattr(test_driver, '_bridge_vlan_read', lambda request_data: [])
+    assert test_driver.execute('bridge:vlan', 'read', profile=profile) == []
+    profiles = os.listdir(tmp_path)
+    assert len(profiles) == expected
+    if profiles:
+        assert '-bridge_vlan-read-' in profiles[0]
+
+
+def test_exec_config(test_driver, test_fake_node):
+    test_driver._exec_config(['vlan 10', 'name ten'])
+    assert test_fake_node.calls == [
+        ('configure_session',),
+        ('config', ['vlan 10', 'name ten']),
+        ('commit',),
+        ('run_commands', 'copy running-config startup-config')
+    ]
+
+
+def test_exec_config_spans(test_driver, test_fake_node, test_spans):
+    test_driver._exec_config(['vlan 10', 'name ten'])
+    spans = {span['name']: span for span in test_spans()}
+    session = spans['eapi.config_session']
+    assert session['attributes'] == {
+        'device.id': test_driver.device.device_id, 'eapi.command_count': 2,
+        'eapi.request_bytes': 15, 'eapi.batch_count': 1}
+    for name in ['eapi.session_open', 'eapi.config', 'eapi.commit', 'eapi.save']:
+        assert spans[name]['parent_id'] == session['span_id']
+
+
+def test_execute_spans(test_driver, test_fake_node, test_spans):
+    test_fake_node.responses['show vlan'] = {'vlans': {}}
+    test_driver.execute('bridge:vlan', 'read')
+    spans = {span['name']: span for span in test_spans()}
+    read = spans['AristaDriver._bridge_vlan_read']
+    assert read['attributes']['driver.capability'] == 'bridge:vlan'
+    assert spans['eapi.enable']['parent_id'] == read['span_id']
+    assert spans['eapi.enable']['attributes']['eapi.attempts'] == 1
+    assert spans['vlan.get_vlans']['parent_id'] == read['span_id']
+
+
+def test_exec_config_coalesced(test_driver, test_fake_node):
+    """
+    Test that concurrent writes within the coalescing window share a
+    single config session, with each batch sent separately.
+    """
+    test_driver.device.metadata['write_coalesce_window'] = 0.2
+    threads = [threading.Thread(target=test_driver._exec_config,
+                                args=([f'vlan {i}', f'name vlan{i}'],))
+               for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    calls = [call[0] for call in test_fake_node.calls]
+    assert calls == ['configure_session'] + ['config'] * 4 + ['commit', 'run_commands']
+
+
+def test_exec_admin_retries(test_driver, test_fake_node):
+    """
+    Test that reads are retried when the device can't be reached.
+    """
+    test_driver.device.metadata['retry_backoff'] = 0
+    test_fake_node.errors['enable'] = [ConnectionError('test', 'timed out')] * 2
+    test_fake_node.responses['show version'] = {'version': '4.28.0F'}
+    assert test_driver._exec_admin('show version') == ({'version': '4.28.0F'},)
+    assert len(test_fake_node.calls) == 3
+
+
+def test_exec_admin_retries_exhausted(test_driver, test_fake_node):
+    test_driver.device.metadata['retry_backoff'] = 0
+    test_driver.device.metadata['read_retries'] = 1
+    test_fake_node.errors['enable'] = [ConnectionError('test', 'timed out')] * 2
+    with pytest.raises(exceptions.DeviceCommunicationError):
+        test_driver._exec_admin('show version')
+    assert len(test_fake_node.calls) == 2
+
+
+def test_exec_admin_command_error(test_driver, test_fake_node):
+    """
+    Test that command errors are raised without being retried.
+    """
+    test_fake_node.errors['enable'] = [CommandError(1002, 'invalid command')]
+    with pytest.raises(CommandError):
+        test_driver._exec_admin('show bogus')
+    assert len(test_fake_node.calls) == 1
+
+
+@pytest.mark.parametrize('method, error, expected', [
+    ('config', CommandError(1002, 'invalid command'), exceptions.ConfigSessionError),
+    ('commit', ConnectionError('test', 'timed out'), exceptions.DeviceCommunicationError),
+])
+def test_exec_config_error(test_driver, test_fake_node, method, error, expected):
+    """
+    Test that failed config sessions are aborted and the error raised.
+    """
+    test_fake_node.errors[method] = [error]
+    with pytest.raises(expected):
+        test_driver._exec_config(['vlan 10'])
+    assert test_fake_node.calls[-1] == ('abort',)
+
+
+def test_exec_config_save_error(test_driver, test_fake_node):
+    test_fake_node.errors['run_commands'] = [ConnectionError('test', 'timed out')]
+    with pytest.raises(exceptions.ConfigSaveError):
+        test_driver._exec_config(['vlan 10'])
+    assert ('abort',) not in test_fake_node.calls
+
+
+def test_exec_config_save_none(test_driver, test_fake_node):
+    test_driver.device.metadata['save_strategy'] = 'none'
+    test_driver._exec_config(['vlan 10'])
+    assert test_fake_node.calls[-1] == ('commit',)
+    assert metrics.get_value('arista_config_saves_total', result='skipped',
+                             device=test_driver.device.device_id) == 1
+
+
+def test_exec_config_save_async(test_driver, test_fake_node):
+    """
+    Test that background save failures are reported through metrics
+    rather than raised.
+    """
+    test_driver.device.metadata['save_strategy'] = 'async'
+    test_fake_node.errors['run_commands'] = [ConnectionError('test', 'timed out')]
+    test_driver._exec_config(['vlan 10'])
+    save_queue.get_saver().wait(test_driver.device.device_id)
+    assert test_fake_node.calls[-1] == ('run_commands', 'copy running-config startup-config')
+    assert metrics.get_value('arista_config_saves_total', result='failure',
+                             device=test_driver.device.device_id) == 1
+
+
+def test_exec_config_save_async_concurrent_read(test_driver, test_fake_node):
+    """
+    Test that a background save runs on a connection of its own, and
+    that reads don't wait for it to finish.
+    """
+    test_driver.device.metadata['save_strategy'] = 'async'
+    saving, read_done = threading.Event(), threading.Event()
+    reads_waited = []
+
+    def save(commands):
+        saving.set()
+        reads_waited.append(read_done.wait(timeout=2))
+
+    test_fake_node.hooks['run_commands'] = save
+    test_driver._exec_config(['vlan 10'])
+    assert saving.wait(timeout=5)
+    test_driver._exec_admin('show vlan')
+    read_done.set()
+    save_queue.get_saver().wait(test_driver.device.device_id)
+    assert reads_waited == [True]
+    assert test_fake_node.overlaps == []
+
+
+def test_exec_config_commit_timer(test_driver, test_fake_node):
+    """
+    Test that commit timer mode returns a job, which is confirmed once
+    the health check passes.
+    """
+    test_driver.device.metadata['commit_timer'] = 300
+    job = test_driver._exec_config(['vlan 10'])
+    assert job.wait(timeout=5) == jobs.CONFIRMED
+    assert jobs.get_job(job.id) is job
+    session = f'configure session {job.session}'
+    assert test_fake_node.calls == [
+        ('run_commands', [session, 'vlan 10']),
+        ('run_commands', [session, 'commit timer 00:05:00']),
+        ('enable', ['show version']),
+        ('run_commands', [f'{session} commit']),
+        ('run_commands', 'copy running-config startup-config')
+    ]
+
+
+def test_exec_config_commit_timer_health_check(test_driver, test_fake_node):
+    """
+    Test that a commit is rolled back when the health check fails, and
+    that cached reads and facts that may include it are discarded.
+    """
+    test_driver.device.metadata.update(
+        {'commit_timer': 300, 'read_retries': 0})
+    test_fake_node.errors['enable'] = [ConnectionError('test', 'timed out')]
+    read_done = threading.Event()
+    test_fake_node.hooks['enable'] = lambda commands: read_done.wait(timeout=5)
+    job = test_driver._exec_config(['vlan 10'])
+    # Reads made while the commit timer runs include the change.
+    test_driver._snapshots.set('bridge:vlan', ['vlan 10'], test_driver._snapshots.generation)
+    test_driver._facts.set(facts.BGP_FACTS, {'asn': '65002', 'rid': '198.18.0.101'})
+    read_done.set()
+    assert job.wait(timeout=5) == jobs.ROLLED_BACK
+    assert test_fake_node.calls[-1] == (
+        'run_commands', [f'configure session {job.session}', 'abort'])
+    assert test_driver._snapshots.get('bridge:vlan') is None
+    assert test_driver._facts.get(facts.BGP_FACTS, 60) is None
+
+
+def test_exec_config_commit_timer_abort_error(test_driver, test_fake_node):
+    """
+    Test that caches are discarded again once the commit timer expires
+    if the session couldn't be aborted.
+    """
+    test_driver.device.metadata.update(
+        {'commit_timer': 0.2, 'read_retries': 0})
+    test_fake_node.errors['enable'] = [ConnectionError('test', 'timed out')]
+
+    def abort(commands):
+        if commands[-1] == 'abort':
+            raise ConnectionError('test', 'timed out')
+
+    test_fake_node.hooks['run_commands'] = abort
+    job = test_driver._exec_config(['vlan 10'])
+    assert job.wait(timeout=5) == jobs.ROLLED_BACK
+    # A read made before the timer expires still includes the change.
+    test_driver._snapshots.set('bridge:vlan', ['vlan 10'], test_driver._snapshots.generation)
+    threading.Event().wait(0.4)
+    assert test_driver._snapshots.get('bridge:vlan') is None
+
+
+def test_exec_config_commit_timer_concurrent_read(test_driver, test_fake_node):
+    """
+    Test that a commit is confirmed on a connection of its own, so that
+    the request's driver can keep reading while the health check runs.
+    """
+    test_driver.device.metadata['commit_timer'] = 300
+    checking, read_done = threading.Event(), threading.Event()
+
+    def health_check(commands):
+        if commands == ['show version']:
+            checking.set()
+            assert read_done.wait(timeout=5)
+
+    test_fake_node.hooks['enable'] = health_check
+    job = test_driver._exec_config(['vlan 10'])
+    assert checking.wait(timeout=5)
+    test_driver._exec_admin('show vlan')
+    read_done.set()
+    assert job.wait(timeout=5) == jobs.CONFIRMED
+    assert test_fake_node.overlaps == []
+    assert ('enable', ['show vlan']) in test_fake_node.calls
+
+
+def test_exec_config_commit_timer_error(test_driver, test_fake_node):
+    test_driver.device.metadata['commit_timer'] = 300
+    test_fake_node.errors['run_commands'] = [CommandError(1002, 'invalid command')]
+    with pytest.raises(exceptions.ConfigSessionError):
+        test_driver._exec_config(['vlan 10'])
+    assert test_fake_node.calls[-1][1][1] == 'abort'
+
+
+def test_exec_admin_breaker(test_driver, test_fake_node):
+    """
+    Test that the driver fails fast once the device breaker opens.
+    """
+    test_driver.device.metadata.update({'retry_backoff': 0, 'read_retries': 0})
+    test_driver._breaker.failure_threshold = 2
+    test_fake_node.errors['enable'] = [ConnectionError('test', 'timed out')] * 2
+    for _ in range(2):
+        with pytest.raises(exceptions.DeviceCommunicationError):
+            test_driver._exec_admin('show version')
+    with pytest.raises(exceptions.DeviceUnavailable):
+        test_driver._exec_admin('show version')
+    with pytest.raises(exceptions.DeviceUnavailable):
+        test_driver._exec_config(['vlan 10'])
+    assert len(test_fake_node.calls) == 2
+
+
+
+def test_exec_admin_breaker_waits_for_lock(test_driver, test_fake_node):
+    """
+    Test that a read waiting behind a writer doesn't take the half-open
+    breaker's probe until it reaches the device.
+    """
+    test_driver.device.metadata.update({'retry_backoff': 0, 'read_retries': 0})
+    test_driver._breaker.failure_threshold = 1
+    test_driver._breaker.reset_timeout = 0
+    test_fake_node.responses['show version'] = {}
+    test_fake_node.errors['enable'] = [ConnectionError('test', 'timed out')]
+    with pytest.raises(exceptions.DeviceCommunicationError):
+        test_driver._exec_admin('show version')
+    with test_driver._lock.write():
+        thread = threading.Thread(target=test_driver._exec_admin, args=('show version',))
+        thread.start()
+        threading.Event().wait(0.1)
+        assert not test_driver._breaker._probing
+    thread.join()
+    assert test_driver._breaker.state == 'closed'
+    assert len(test_fake_node.calls) == 2
+
+def test_vrf_read_scoped(test_driver, test_fake_node):
+    """
+    Test that reading a single VRF fetches only its BGP configuration.
+    """
+    test_fake_node.responses.update({
+        'show vrf red': {'vrfs': {'red': {
+            'routeDistinguisher': '198.18.0.101:4094',
+            'protocols': {'ipv4': {'routingState': 'up'},
+                          'ipv6': {'routingState': 'down'}}}}},
+        'show running-config section router-id': {
+            'output': 'router bgp 65002\n   router-id 198.18.0.101\n'},
+        'show running-config section vrf red$': {
+            'output': 'vrf instance red\n!\nrouter bgp 65002\n   vrf red\n'
+                      '      rd 198.18.0.101:4094\n'
+                      '      route-target import vpn-ipv4 65002:1\n'},
+    })
+    vrf = test_driver._vrf_read('red')
+    assert vrf.import_targets == ['65002:1']
+    assert test_fake_node.calls == [('enable', [
+        'show vrf red',
+        'show running-config section router-id',
+        'show running-config section vrf red$'])]
+
+
+def test_exec_admin_bgp_fallback(test_driver, test_fake_node):
+    """
+    Test that the full BGP config is fetched when the scoped sections
+    don't contain the `router bgp` header.
+    """
+    test_fake_node.responses.update({
+        'show running-config section router-id': {'output': ''},
+        'show running-config section vrf green$': {'output': 'vrf instance green\n'},
+        'show running-config section bgp': {'output': 'router bgp 65002\n'}})
+    show_bgp_config, = test_driver._exec_admin_bgp(vrf='green')
+    assert show_bgp_config == 'router bgp 65002\n'
+    assert test_fake_node.calls[-1] == ('enable', ['show running-config section bgp'])
+
+
+def test_vrf_bulk(test_driver, test_fake_node):
+    """
+    Test that bulk VRF changes fetch the BGP facts once, apply all VRFs
+    in one config session and read back once.
+    """
+    vrf_data = {'routeDistinguisher': '',
+                'protocols': {'ipv4': {'routingState': 'up'},
+                              'ipv6': {'routingState': 'down'}}}
+    test_fake_node.responses.update({
+        'show vrf': {'vrfs': {name: vrf_data for name in ('red', 'blue', 'green')}},
+        'show running-config section router-id': {
+            'output': 'router bgp 65002\n   router-id 198.18.0.101\n'},
+        'show running-config section bgp': {'output': 'router bgp 65002\n' + ''.join(
+            f'   vrf {name}\n      rd 198.18.0.101:1\n'
+            f'      route-target import vpn-ipv4 65002:1\n'
+            f'      route-target export vpn-ipv4 65002:1\n'
+            for name in ('red', 'blue', 'green'))},
+    })
+    requested = [an_vrf.VRF(name=name, ipv4=True, ipv6=False, import_targets=[],
+                            export_targets=[], route_distinguisher=None)
+                 for name in ('green', 'red')]
+    results = test_driver._vrf_bulk_create(requested)
+    assert [vrf.name for vrf in results] == ['green', 'red']
+    assert [call[0] for call in test_fake_node.calls] == [
+        'enable', 'configure_session', 'config', 'config', 'commit', 'run_commands',
+        'enable']
+
+    test_fake_node.calls.clear()
+    test_driver._vrf_bulk_delete(['red', 'blue', 'yellow'])
+    # The BGP facts are still cached from the create.
+    assert [call[0] for call in test_fake_node.calls] == [
+        'enable', 'configure_session', 'config', 'config', 'commit', 'run_commands']
+    assert test_fake_node.calls[2] == ('config', [
+        'no ip routing vrf red',
+        'no ipv6 unicast-routing vrf red',
+        'no vrf instance red',
+        'router bgp 65002',
+        'no vrf red'])
+
+
+def test_vrf_bulk_coalesced(test_driver, test_fake_node):
+    """
+    Test that bulk VRF changes share a config session with concurrent
+    writes when a coalescing window is set.
+    """
+    test_driver.device.metadata['write_coalesce_window'] = 0.2
+    bgp_config = {'output': 'router bgp 65002\n   router-id 198.18.0.101\n'}
+    test_fake_node.responses.update({
+        'show vrf': {'vrfs': {}},
+        'show running-config section router-id': bgp_config,
+        'show running-config section bgp': bgp_config})
+    thread = threading.Thread(target=test_driver._exec_config, args=(['vlan 10'],))
+    thread.start()
+    test_driver._vrf_bulk_create([
+        an_vrf.VRF(name=name, ipv4=True, ipv6=False, import_targets=[],
+                   export_targets=[], route_distinguisher=None)
+        for name in ('green', 'red')])
+    thread.join()
+    calls = [call[0] for call in test_fake_node.calls if call[0] != 'enable']
+    assert calls == ['configure_session', 'config', 'config', 'config', 'commit',
+                     'run_commands']
+
+
+def test_tunnels_vxlan_bulk(test_driver, test_fake_node):
+    """
+    Test that bulk VXLAN creation runs a first stage only for L3 VNIs
+    with an auto RD, and applies everything else in one config session.
+    """
+    test_fake_node.responses.update({
+        'show interfaces vxlan1': {'interfaces': {'Vxlan1': {
+            'srcIpAddr': '192.168.0.101',
+            'vrfToVniMap': {'blue': 20001},
+            'vlanToVniMap': {'4093': {'source': 'evpn', 'vni': 20001},
+                             '71': {'source': '', 'vni': 70071},
+                             '72': {'source': '', 'vni': 70072}}}}},
+        'show running-config section router-id': {
+            'output': 'router bgp 65002\n   router-id 198.18.0.101\n'},
+        'show running-config section bgp': {
+            'output': 'router bgp 65002\n   vlan 71\n      rd 198.18.0.101:71\n'
+                      '   vlan 72\n      rd 198.18.0.101:72\n'
+                      '   vrf blue\n      rd 198.18.0.101:4093\n'},
+    })
+    requested = [
+        an_vxlan.VXLAN(id=70072, layer=2, import_targets=['auto'], export_targets=['auto'],
+                       route_distinguisher='auto', bound_object_id=72),
+        an_vxlan.VXLAN(id=20001, layer=3, import_targets=['auto'], export_targets=['auto'],
+                       route_distinguisher='auto', bound_object_id='blue'),
+        an_vxlan.VXLAN(id=70071, layer=2, import_targets=['auto'], export_targets=['auto'],
+                       route_distinguisher='auto', bound_object_id=71),
+    ]
+    results = test_driver._tunnels_vxlan_bulk_create(requested)
+    assert [vxlan.id for vxlan in results] == [70072, 20001, 70071]
+    config_calls = [call[1] for call in test_fake_node.calls if call[0] == 'config']
+    assert config_calls[0] == ['interface vxlan1', 'vxlan vrf blue vni 20001']
+    assert config_calls[1][:3] == ['interface vxlan1', 'vxlan vlan 72 vni 70072',
+                                   'vxlan vlan 71 vni 70071']
+    assert 'rd 198.18.0.101:4093' in config_calls[1]
+    assert len(config_calls) == 2
+
+    test_fake_node.calls.clear()
+    test_driver._tunnels_vxlan_bulk_delete(['70071', '20001', '10'])
+    config_calls = [call[1] for call in test_fake_node.calls if call[0] == 'config']
+    assert config_calls == [[
+        'interface vxlan1',
+        'no vxlan vlan 71 vni 70071',
+        'no vxlan vrf blue vni 20001',
+        'router bgp 65002',
+        'no vlan 71',
+        'vrf blue',
+        'no redistribute attached-host',
+        'exit'
+    ]]
+
+
+def test_bridge_vlan_read_not_found(test_driver, test_fake_node):
+    test_fake_node.errors['enable'] = [CommandError(1000, 'VLAN 10 not found')]
+    assert test_driver._bridge_vlan_read(10) == []
+    assert test_fake_node.calls == [('enable', ['show vlan 10'])]
+
+
+@pytest.mark.parametrize('read', ['_bridge_vlan_read', '_vrf_read'])
+def test_read_all_command_error(test_driver, test_fake_node, read):
+    """
+    Test that a failed read of all VLANs or VRFs is not mistaken for
+    an empty result.
+    """
+    test_fake_node.errors['enable'] = [CommandError(1002, 'invalid command')]
+    with pytest.raises(CommandError):
+        getattr(test_driver, read)(None)
+
+
+def test_conditional_read(test_driver, test_fake_node):
+    """
+    Test that reads are served from the cache while the change probe
+    output is unchanged, and fetched again after it changes or after
+    the driver changes the configuration.
+    """
+    device_id = test_driver.device.device_id
+    test_driver.device.metadata['change_probe_command'] = 'show probe'
+    test_fake_node.responses['show probe'] = {'checksum': 'a'}
+    test_fake_node.responses['show vlan'] = {'vlans': {'10': {
+        'name': 'ten', 'status': 'active', 'dynamic': False, 'interfaces': {}}}}
+    vlans = test_driver._bridge_vlan_read(None)
+    assert test_driver._bridge_vlan_read(None) == vlans
+    test_fake_node.responses['show probe'] = {'checksum': 'b'}
+    test_driver._bridge_vlan_read(None)
+    test_driver._exec_config(['vlan 20'])
+    test_driver._bridge_vlan_read(None)
+    assert [call for call in test_fake_node.calls if call[0] == 'enable'] == [
+        ('enable', ['show probe']), ('enable', ['show vlan', 'show probe']),
+        ('enable', ['show probe']),
+        ('enable', ['show probe']), ('enable', ['show vlan', 'show probe']),
+        ('enable', ['show probe']), ('enable', ['show vlan', 'show probe'])
+    ]
+    assert metrics.get_value('arista_conditional_reads_total',
+                             device=device_id, result='hit') == 1
+    assert metrics.get_value('arista_conditional_reads_total',
+                             device=device_id, result='miss') == 3
+
+
+def test_conditional_read_copies(test_driver, test_fake_node):
+    """
+    Test that changes made by a caller to the output it reads are not
+    seen by later reads from the cache.
+    """
+    test_driver.device.metadata['change_probe_command'] = 'show probe'
+    test_fake_node.responses['show vlan'] = {'vlans': {}}
+    test_driver._exec_admin_conditional('show vlan')[0]['vlans']['10'] = {}
+    test_driver._exec_admin_conditional('show vlan')[0]['vlans']['20'] = {}
+    assert test_driver._exec_admin_conditional('show vlan') == ({'vlans': {}},)
+
+
+def test_conditional_read_changed(test_driver, test_fake_node):
+    """
+    Test that output is not cached if the configuration changed while
+    it was being fetched, so it isn't returned if the change is undone.
+    """
+    test_driver.device.metadata['change_probe_command'] = 'show probe'
+    probes = iter(['a', 'b', 'a', 'a'])
+    test_fake_node.hooks['enable'] = lambda commands: \
+        test_fake_node.responses.update({'show probe': {'checksum': next(probes)}})
+    test_driver._exec_admin_conditional('show vlan')
+    test_driver._exec_admin_conditional('show vlan')
+    assert test_fake_node.calls[-1] == ('enable', ['show vlan', 'show probe'])
+
+
+def test_conditional_read_write_paths(test_driver, test_fake_node):
+    """
+    Test that reads made while changing the device bypass the cache.
+    """
+    test_driver.device.metadata['change_probe_command'] = 'show probe'
+    test_fake_node.responses['show vlan'] = {'vlans': {}}
+    test_driver._exec_admin_conditional('show vlan')
+    test_fake_node.calls.clear()
+    with test_driver._uncached_reads():
+        test_driver._exec_admin_conditional('show vlan')
+    test_driver._exec_admin_conditional('show vlan')
+    assert test_fake_node.calls == [('enable', ['show vlan']), ('enable', ['show probe'])]
+
+
+def test_snapshot_read(test_driver, test_fake_node, monkeypatch):
+    """
+    Test that reads of all VLANs are served from the snapshot, that a
+    stale snapshot is refreshed in the background, and that a change
+    discards it.
+    """
+    test_driver.device.metadata['snapshot_refresh_interval'] = 60
+    reads = []
+    monkeypatch.setattr(test_driver, '_bridge_vlan_read',
+                        lambda request_data: reads.append(request_data) or ['vlan'])
+    refreshes = []
+    monkeypatch.setattr(snapshots.get_refresher(), 'schedule', lambda *args: None)
+    monkeypatch.setattr(snapshots.get_refresher(), 'refresh',
+                        lambda *args: refreshes.append(args[:2]))
+    assert test_driver.execute('bridge:vlan', 'read') == ['vlan']
+    assert test_driver.execute('bridge:vlan', 'read') == ['vlan']
+    assert reads == [None]
+    # Single VLAN reads always go to the device.
+    test_driver.execute('bridge:vlan', 'read', 10)
+    assert reads == [None, 10]
+
+    test_driver.device.metadata['snapshot_refresh_interval'] = 0.01
+    threading.Event().wait(0.02)
+    assert test_driver.execute('bridge:vlan', 'read') == ['vlan']
+    assert refreshes == [(test_driver.device.device_id, 'bridge:vlan')]
+
+    test_driver._exec_config(['vlan 20'])
+    test_driver.execute('bridge:vlan', 'read')
+    assert reads == [None, 10, None]
+
+
+def test_snapshot_read_copies(test_driver, monkeypatch):
+    """
+    Test that changes made by a caller to the objects it reads are not
+    seen by later reads of the snapshot.
+    """
+    test_driver.device.metadata['snapshot_refresh_interval'] = 60
+    monkeypatch.setattr(test_driver, '_bridge_vlan_read', lambda request_data: [{'id': 10}])
+    monkeypatch.setattr(snapshots.get_refresher(), 'schedule', lambda *args: None)
+    test_driver.execute('bridge:vlan', 'read')[0]['id'] = 20
+    test_driver.execute('bridge:vlan', 'read')[0]['id'] = 30
+    assert test_driver.execute('bridge:vlan', 'read') == [{'id': 10}]
+
+
+def test_bgp_facts_cached(test_driver, test_fake_node):
+    """
+    Test that BGP facts are fetched once, and fetched again after a
+    change to the router ID.
+    """
+    test_fake_node.responses['show running-config section router-id'] = {
+        'output': 'router bgp 65002\n   router-id 198.18.0.101\n'}
+    expected = {'asn': '65002', 'rid': '198.18.0.101'}
+    assert test_driver._get_bgp_facts() == expected
+    assert test_driver._get_bgp_facts() == expected
+    assert len(test_fake_node.calls) == 1
+    test_driver._exec_config(['interface Ethernet1', 'no shutdown'])
+    test_driver._get_bgp_facts()
+    assert test_fake_node.calls[-1][0] == 'run_commands'
+    test_driver._exec_config(['router bgp 65002', 'router-id 198.18.0.102'])
+    test_driver._get_bgp_facts()
+    assert test_fake_node.calls[-1] == ('enable', ['show running-config section router-id'])
+
+
+def test_bgp_facts_vrf_create(test_driver, test_fake_node):
+    """
+    Test that creating VRFs, which enters `router bgp`, doesn't discard
+    the BGP facts.
+    """
+    test_fake_node.responses['show running-config section router-id'] = {
+        'output': 'router bgp 65002\n   router-id 198.18.0.101\n'}
+    for name in ('red', 'blue'):
+        test_fake_node.responses.update({
+            f'show vrf {name}': {'vrfs': {}},
+            f'show running-config section vrf {name}$': {'output': ''}})
+        test_driver._vrf_create(an_vrf.VRF(
+            name=name, ipv4=True, ipv6=False, import_targets=[], export_targets=[],
+            route_distinguisher='198.18.0.101:1'))
+    assert ('config', ['vrf instance blue', 'ip routing vrf blue', 'router bgp 65002',
+                       'vrf blue', 'rd 198.18.0.101:1']) in test_fake_node.calls
+    assert test_fake_node.calls.count(
+        ('enable', ['show running-config section router-id'])) == 1
+
+
+def test_bgp_facts_not_configured(test_driver, test_fake_node):
+    """
+    Test that facts are not cached for a device without BGP.
+    """
+    test_fake_node.responses.update({
+        'show running-config section router-id': {'output': ''},
+        'show running-config section bgp': {'output': ''}})
+    assert test_driver._get_bgp_facts() == {'asn': None, 'rid': None}
+    test_driver._get_bgp_facts()
+    assert test_fake_node.calls.count(
+        ('enable', ['show running-config section router-id'])) == 2
+
+
+def test_interface_bulk_apply(test_driver, test_fake_node, test_make_interface,
+                              monkeypatch):
+    """
+    Test that bulk interface changes are applied in one config session
+    and read back once.
+    """
+    reads = []
+    monkeypatch.setattr(test_driver, '_interface_read', lambda: reads.append(1) or [
+        test_make_interface(f'Ethernet{i}') for i in range(1, 49)])
+    requested = [test_make_interface(f'Et{i}') for i in (3, 1, 2)]
+    results = test_driver._interface_bulk_apply(requested)
+    assert [r.name for r in results] == ['Ethernet3', 'Ethernet1', 'Ethernet2']
+    assert len(reads) == 1
+    config_calls = [call for call in test_fake_node.calls if call[0] == 'config']
+    assert len(config_calls) == 1
+    assert config_calls[0][1][0] == 'interface Ethernet1-3'
+
+
+def test_interface_bulk_apply_subinterfaces(test_driver, test_fake_node,
+                                            test_make_interface, monkeypatch):
+    """
+    Test that subinterfaces are configured and returned, rather than
+    their parent interfaces.
+    """
+    names = ['Ethernet1', 'Ethernet2', 'Ethernet1.100', 'Ethernet2.100']
+    monkeypatch.setattr(test_driver, '_interface_read', lambda: [
+        test_make_interface(name, mode='routed') for name in names])
+    requested = [test_make_interface(name, mode='routed')
+                 for name in ['Ethernet2.100', 'Ethernet1.100']]
+    results = test_driver._interface_bulk_apply(requested)
+    assert [r.name for r in results] == ['Ethernet2.100', 'Ethernet1.100']
+    config_call, = [call for call in test_fake_node.calls if call[0] == 'config']
+    assert [c for c in config_call[1] if c.startswith('interface')] == [
+        'interface Ethernet2.100', 'interface Ethernet1.100']
@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from autonet_arista.eos import facts
+
+
+def test_facts_cache_ttl():
+    cache = facts.FactsCache()
+    cache.set(facts.BGP_FACTS, {'asn': '65002'})
+    assert cache.get(facts.BGP_FACTS, 60) == {'asn': '65002'}
+    time.sleep(0.02)
+    assert cache.get(facts.BGP_FACTS, 0.01) is None
+    # Expired facts are removed.
+    assert cache.get(facts.BGP_FACTS, 60) is None
+
+
+@pytest.mark.parametrize('commands, invalidated', [
+    (['router bgp 65002', 'vrf red', 'rd 198.18.0.1:1'], False),
+    (['interface vxlan1', 'vxlan vlan 10 vni 10010', '   Router BGP 65003'], True),
+    (['no router bgp 65002'], True),
+    (['router bgp 65002', '   router-id 198.18.0.102'], True),
+    (['router bgp 65002', 'no router-id'], True),
+    (['interface Ethernet1', 'description router bgp peer'], False),
+    (['vlan 10', 'name ten'], False),
+])
+def test_invalidate_for_commands(commands, invalidated):
+    cache = facts.FactsCache()
+    cache.set(facts.BGP_FACTS, {'asn': '65002'})
+    cache.invalidate_for_commands(commands)
+    assert (cache.get(facts.BGP_FACTS, 60) is None) == invalidated
+
+
+def test_get_facts_cache():
+    cache = facts.get_facts_cache('test-get-facts-cache')
+    assert facts.get_facts_cache('test-get-facts-cache') is cache
+
+
+def test_read_cache():
+    cache = facts.ReadCache(max_entries=2)
+    cache.set(('show vlan',), 'a', ({'vlans': {}},))
+    assert cache.get(('show vlan',), 'a') == ({'vlans': {}},)
+    assert cache.get(('show vlan',), 'b') is None
+    cache.set(('show vrf',), 'a', ({'vrfs': {}},))
+    # The least recently used entry is discarded.
+    cache.get(('show vlan',), 'a')
+    cache.set(('show version',), 'a', ({},))
+    assert cache.get(('show vrf',), 'a') is None
+    assert cache.get(('show vlan',), 'a') is not None
+    cache.invalidate()
+    assert cache.get(('show vlan',), 'a') is None
@@ -0,0 +1,18 @@
+from autonet_arista.eos import jobs
+
+
+def test_job_lifecycle():
+    job = jobs.create_job('leaf1', 'autonet-test')
+    assert jobs.get_job(job.id) is job
+    assert job.wait(timeout=0) == jobs.PENDING
+    job.complete(jobs.FAILED, 'commit failed')
+    assert job.wait() == jobs.FAILED
+    assert job.error == 'commit failed'
+
+
+def test_finished_jobs_expire():
+    job = jobs.create_job('leaf1', 'autonet-test')
+    job.complete(jobs.CONFIRMED)
+    job.finished_at -= jobs.JOB_RETENTION + 1
+    jobs.create_job('leaf1', 'autonet-test-2')
+    assert jobs.get_job(job.id) is None
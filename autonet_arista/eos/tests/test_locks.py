@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+from autonet_arista.eos import locks
+
+
+@pytest.fixture(params=['local', 'file'])
+def test_device_lock(request, tmp_path):
+    if request.param == 'file':
+        return locks.FileDeviceLock(locks.get_lock_path(str(tmp_path), 'dev1'))
+    return locks.DeviceLock()
+
+
+def test_concurrent_readers(test_device_lock):
+    """
+    Test that readers do not block each other.
+    """
+    barrier = threading.Barrier(3, timeout=5)
+
+    def reader():
+        with test_device_lock.read():
+            barrier.wait()
+
+    threads = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    # All three parties reach the barrier only if both readers hold
+    # the lock at the same time.
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+
+
+def test_writer_is_exclusive(test_device_lock):
+    """
+    Test that a writer waits for readers, and readers wait for a writer.
+    """
+    events = []
+
+    def writer():
+        with test_device_lock.write():
+            events.append('write')
+
+    with test_device_lock.read():
+        thread = threading.Thread(target=writer)
+        thread.start()
+        time.sleep(0.05)
+        events.append('read')
+    thread.join()
+    assert events == ['read', 'write']
+
+
+@pytest.mark.parametrize('device_id, expected', [
+    ('leaf1', 'autonet-arista-leaf1.lock'),
+    (42, 'autonet-arista-42.lock'),
+    ('../spine/1', 'autonet-arista-.._spine_1.lock'),
+])
+def test_get_lock_path(device_id, expected):
+    assert locks.get_lock_path('/tmp', device_id) == f'/tmp/{expected}'
+
+
+def test_get_device_lock():
+    lock = locks.get_device_lock('test-get-device-lock')
+    assert isinstance(lock, locks.DeviceLock)
+    assert locks.get_device_lock('test-get-device-lock') is lock
+    assert locks.get_device_lock('test-get-device-lock-2') is not lock
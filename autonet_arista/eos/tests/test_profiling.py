@@ -0,0 +1,52 @@
+import os
+import pstats
+
+import pytest
+
+from autonet_arista.eos import profiling
+
+
+def test_get_profile_path(tmp_path):
+    path = profiling.get_profile_path(str(tmp_path), 'leaf 1', 'tunnels:vxlan', 'read')
+    assert os.path.dirname(path) == str(tmp_path)
+    assert os.path.basename(path).startswith('autonet-arista-leaf_1-tunnels_vxlan-read-')
+
+
+def test_profile(tmp_path):
+    path = str(tmp_path / 'profiles' / 'autonet-arista-test.prof')
+    with profiling.profile(path, 10) as profiler:
+        assert profiler is not None
+        sorted(range(1000))
+    assert 'sorted' in str(pstats.Stats(path).stats)
+
+
+def test_profile_saved_on_error(tmp_path):
+    path = str(tmp_path / 'autonet-arista-test.prof')
+    with pytest.raises(ValueError):
+        with profiling.profile(path, 10):
+            raise ValueError()
+    assert os.path.exists(path)
+
+
+def test_profile_nested(tmp_path):
+    """
+    Test that only one profile is taken at a time.
+    """
+    outer = str(tmp_path / 'autonet-arista-outer.prof')
+    inner = str(tmp_path / 'autonet-arista-inner.prof')
+    with profiling.profile(outer, 10):
+        with profiling.profile(inner, 10) as profiler:
+            assert profiler is None
+    assert os.path.exists(outer)
+    assert not os.path.exists(inner)
+
+
+def test_prune_profiles(tmp_path):
+    for i in range(5):
+        path = tmp_path / f'autonet-arista-{i}.prof'
+        path.write_text('')
+        os.utime(path, (i, i))
+    (tmp_path / 'other.prof').write_text('')
+    profiling.prune_profiles(str(tmp_path), 2)
+    assert sorted(os.listdir(tmp_path)) == [
+        'autonet-arista-3.prof', 'autonet-arista-4.prof', 'other.prof']
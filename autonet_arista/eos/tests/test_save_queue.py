@@ -0,0 +1,68 @@
+import threading
+
+from autonet_arista.eos import save_queue
+
+
+def test_saver_skips_queued_saves():
+    """
+    Test that saves requested while one is queued are dropped, and that
+    a save requested once the queued save has started runs again.
+    """
+    saver = save_queue.BackgroundSaver(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+    saves = []
+
+    def blocking_save():
+        started.set()
+        release.wait()
+        saves.append('blocking')
+
+    # Occupy the only worker so that later saves stay queued.
+    assert saver.submit('other', blocking_save)
+    started.wait()
+    assert saver.submit('leaf1', lambda: saves.append('first'))
+    assert saver.submit('leaf1', lambda: saves.append('second')) is None
+    release.set()
+    saver.wait('leaf1')
+    assert saver.submit('leaf1', lambda: saves.append('third'))
+    saver.wait('leaf1')
+    assert saves == ['blocking', 'first', 'third']
+
+
+def test_saver_serializes_device_saves():
+    """
+    Test that a save queued while another save for the same device is
+    running waits for it to finish.
+    """
+    saver = save_queue.BackgroundSaver()
+    started = threading.Event()
+    release = threading.Event()
+    saves = []
+
+    def blocking_save():
+        started.set()
+        release.wait(timeout=5)
+        saves.append('first')
+
+    saver.submit('leaf1', blocking_save)
+    started.wait()
+    assert saver.submit('leaf1', lambda: saves.append('second'))
+    # Saves requested while the second waits are coalesced into it.
+    assert saver.submit('leaf1', lambda: saves.append('third')) is None
+    release.set()
+    saver.wait('leaf1')
+    assert saves == ['first', 'second']
+
+
+def test_saver_logs_errors():
+    def failing_save():
+        raise RuntimeError('save failed')
+
+    saver = save_queue.BackgroundSaver()
+    future = saver.submit('leaf1', failing_save)
+    assert future.result() is None
+
+
+def test_get_saver():
+    assert save_queue.get_saver() is save_queue.get_saver()
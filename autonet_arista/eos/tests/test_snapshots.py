@@ -0,0 +1,66 @@
+import threading
+
+from autonet_arista.eos import snapshots
+
+
+def test_snapshot_store_invalidate():
+    """
+    Test that snapshots are discarded by a change, and that a fetch
+    started before the change is not stored.
+    """
+    store = snapshots.SnapshotStore()
+    store.set('vrf', ['red'], store.generation)
+    assert store.get('vrf').value == ['red']
+    generation = store.generation
+    store.invalidate()
+    assert store.get('vrf') is None
+    store.set('vrf', ['red'], generation)
+    assert store.get('vrf') is None
+
+
+def test_refresher_schedule():
+    refresher = snapshots.SnapshotRefresher()
+    refreshed = threading.Semaphore(0)
+    refresher.schedule('leaf1', 'vrf', refreshed.release, 0.01, jitter=0.5)
+    # Refreshes repeat on schedule.
+    for _ in range(3):
+        assert refreshed.acquire(timeout=5)
+
+
+def test_refresher_skips_in_flight():
+    refresher = snapshots.SnapshotRefresher()
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_refresh():
+        started.set()
+        release.wait()
+
+    future = refresher.refresh('leaf1', 'vrf', blocking_refresh)
+    started.wait()
+    assert refresher.refresh('leaf1', 'vrf', blocking_refresh) is None
+    assert refresher.refresh('leaf1', 'interface', lambda: None)
+    release.set()
+    future.result()
+    assert refresher.refresh('leaf1', 'vrf', lambda: None)
+
+
+def test_refresher_idle(monkeypatch):
+    """
+    Test that snapshots that are no longer read stop being refreshed.
+    """
+    monkeypatch.setattr(snapshots, 'IDLE_TIMEOUT', 0)
+    refresher = snapshots.SnapshotRefresher()
+    refreshes = []
+    refresher.schedule('leaf1', 'vrf', lambda: refreshes.append(1), 0.01)
+    threading.Event().wait(0.1)
+    assert refreshes == []
+    assert not refresher._schedule
+
+
+def test_refresher_logs_errors():
+    def failing_refresh():
+        raise RuntimeError('refresh failed')
+
+    refresher = snapshots.SnapshotRefresher()
+    assert refresher.refresh('leaf1', 'vrf', failing_refresh).result() is None
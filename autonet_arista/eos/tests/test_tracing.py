@@ -0,0 +1,50 @@
+import pytest
+
+from autonet_arista.eos import tracing
+
+
+def test_span_disabled(tmp_path):
+    with tracing.span('test') as span:
+        assert span is None
+    assert tracing.get_exporter() is None
+
+
+def test_span_nesting(test_spans):
+    with tracing.span('outer', {'device.id': 'leaf1'}):
+        with tracing.span('inner') as inner:
+            inner.set_attribute('eapi.command_count', 2)
+    inner, outer = test_spans()
+    assert (inner['name'], outer['name']) == ('inner', 'outer')
+    assert inner['trace_id'] == outer['trace_id']
+    assert inner['parent_id'] == outer['span_id']
+    assert outer['parent_id'] is None
+    assert outer['attributes'] == {'device.id': 'leaf1'}
+    assert inner['attributes'] == {'eapi.command_count': 2}
+    assert outer['end_time'] >= inner['end_time'] >= inner['start_time'] >= outer['start_time']
+
+
+def test_span_error(test_spans):
+    with pytest.raises(ValueError):
+        with tracing.span('test'):
+            raise ValueError('failed')
+    span, = test_spans()
+    assert span['status'] == 'error'
+    assert span['attributes']['error'] == "ValueError('failed')"
+
+
+def test_traced(test_spans):
+    @tracing.traced
+    def generate_commands(name):
+        return [f'vlan {name}']
+
+    assert generate_commands(10) == ['vlan 10']
+    span, = test_spans()
+    assert span['name'] == 'test_tracing.test_traced.<locals>.generate_commands'
+
+
+@pytest.mark.parametrize('commands, expected', [
+    ('show version', {'eapi.command_count': 1, 'eapi.request_bytes': 12}),
+    (['vlan 10', 'name ten'], {'eapi.command_count': 2, 'eapi.request_bytes': 15}),
+])
+def test_get_command_attributes(commands, expected):
+    assert tracing.get_command_attributes(commands) == expected
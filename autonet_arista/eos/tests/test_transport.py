@@ -0,0 +1,77 @@
+import ssl
+
+from autonet_arista.eos import metrics
+from autonet_arista.eos import transport
+
+
+class FakeSocket(object):
+    def setsockopt(self, *args):
+        pass
+
+
+class FakeSSLSocket(object):
+    def __init__(self, session=None):
+        self.session = session
+        self.session_reused = session is not None
+        self.timeout = None
+
+    def settimeout(self, timeout):
+        self.timeout = timeout
+
+    def close(self):
+        pass
+
+
+class FakeSSLContext(object):
+    verify_mode = ssl.CERT_NONE
+    check_hostname = False
+
+    def __init__(self):
+        self.offered_sessions = []
+
+    def wrap_socket(self, sock, server_hostname=None, session=None):
+        self.offered_sessions.append(session)
+        return FakeSSLSocket(session)
+
+
+def get_test_connection(context, session_key):
+    conn = transport.TimeoutHttpsConnection(
+        '/command-api', 'leaf1', 443, context=context, timeout=5,
+        read_timeout=30, session_key=session_key)
+    conn._create_connection = lambda *args, **kwargs: FakeSocket()
+    return conn
+
+
+def test_ssl_context_cache():
+    context = transport.get_ssl_context(True, 'DEFAULT')
+    assert transport.get_ssl_context(True, 'DEFAULT') is context
+    assert transport.get_ssl_context(False, 'DEFAULT') is not context
+
+
+def test_tls_session_resumption(request):
+    key = request.node.name
+    context = FakeSSLContext()
+    conn = get_test_connection(context, key)
+    conn.connect()
+    assert conn.sock.timeout == 30
+    conn.sock.session = 'session-1'
+    conn.close()
+    assert transport.get_tls_session(key, context) == 'session-1'
+
+    conn = get_test_connection(context, key)
+    conn.connect()
+    assert context.offered_sessions == [None, 'session-1']
+    assert metrics.get_value('arista_tls_sessions_resumed_total', device=key) == 1
+
+
+def test_tls_session_other_context(request):
+    key = request.node.name
+    transport.save_tls_session(key, FakeSSLContext(), 'session-1')
+    assert transport.get_tls_session(key, FakeSSLContext()) is None
+
+
+def test_tls_session_reuse_disabled():
+    context = FakeSSLContext()
+    conn = get_test_connection(context, None)
+    conn.connect()
+    assert context.offered_sessions == [None]
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from autonet_arista.eos import util
@@ -33,12 +35,34 @@ def test_get_v6_mask_length_failure():
         util.get_v6_mask_length('not_an_ipv6_prefix')
 
 
+@pytest.mark.parametrize('test_name, expected', [
+    ('Po22', util.InterfaceName(
+        'Port-Channel22', 'Port-Channel', '22', True, True)),
+    ('e52/1', util.InterfaceName(
+        'Ethernet52/1', 'Ethernet', '52/1', False, True)),
+    ('Loopback0', util.InterfaceName(
+        'Loopback0', 'Loopback', '0', True, False)),
+    ('vl101', util.InterfaceName(
+        'Vlan101', 'Vlan', '101', True, False)),
+])
+def test_classify_if_name(test_name, expected):
+    assert util.classify_if_name(test_name) == expected
+    # A second lookup is served from the cache.
+    hits = util.classify_if_name.cache_info().hits
+    assert util.classify_if_name(test_name) == expected
+    assert util.classify_if_name.cache_info().hits == hits + 1
+
+
 @pytest.mark.parametrize('name, expected', [
     ('Ethernet5', False),
     ('Lo22', True),
     ('po1', True),
     ('Vlan88', True),
-    ('eth9', False)
+    ('eth9', False),
+    ('vl10', True),
+    ('Ethernet1.10', False),
+    ('Vx1', False),
+    ('bogus1', False)
 ])
 def test_is_virtual(name, expected):
     assert util.is_virtual(name) == expected
@@ -49,7 +73,45 @@ def test_is_virtual(name, expected):
     ('Lo22', False),
     ('po1', True),
     ('Vlan88', False),
-    ('eth9', True)
+    ('eth9', True),
+    ('Po10.1', True),
+    ('Vx1', False),
+    ('bogus1', False)
 ])
 def test_is_switchport(name, expected):
     assert util.is_switchport(name) == expected
+
+
+@pytest.mark.parametrize('attempt, base, maximum, ceiling', [
+    (0, 0.5, 8, 0.5),
+    (2, 0.5, 8, 2),
+    (10, 0.5, 8, 8),
+])
+def test_get_backoff_delay(attempt, base, maximum, ceiling):
+    for _ in range(20):
+        assert 0 <= util.get_backoff_delay(attempt, base, maximum) <= ceiling
+
+
+@pytest.mark.parametrize('seconds, expected', [
+    (300, '00:05:00'),
+    (0.5, '00:00:01'),
+    (3725, '01:02:05'),
+])
+def test_get_commit_timer(seconds, expected):
+    assert util.get_commit_timer(seconds) == expected
+
+
+def test_intern_strings():
+    data = json.loads('[{"vrfs": {"red": {"interfaces": ["Vlan10"]}}},'
+                      ' {"vrfs": {"red": {"interfaces": ["Vlan10"]}}}]')
+    assert data[0]['vrfs']['red']['interfaces'][0] is not data[1]['vrfs']['red']['interfaces'][0]
+    interned = util.intern_strings(data)
+    assert interned == data
+    assert interned[0]['vrfs']['red']['interfaces'][0] is interned[1]['vrfs']['red']['interfaces'][0]
+    assert list(interned[0]['vrfs'])[0] is list(interned[1]['vrfs'])[0]
+
+
+def test_get_fingerprint():
+    assert util.get_fingerprint({'a': 1, 'b': [1, 2]}) == \
+        util.get_fingerprint({'b': [1, 2], 'a': 1})
+    assert util.get_fingerprint({'a': 1}) != util.get_fingerprint({'a': 2})
@@ -0,0 +1,81 @@
+import threading
+
+from autonet_arista.eos import write_queue
+
+
+def _submit_concurrently(queue, batches, executor):
+    results = {}
+
+    def submit(commands):
+        try:
+            results[commands[0]] = queue.submit(commands, executor)
+        except Exception as e:
+            results[commands[0]] = e
+
+    threads = [threading.Thread(target=submit, args=(batch,))
+               for batch in batches]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_write_queue_coalesces():
+    """
+    Test that commands submitted within the window are applied in a
+    single call to the executor, and every caller gets the result.
+    """
+    calls = []
+
+    def executor(batches):
+        calls.append(batches)
+        return 'committed'
+
+    queue = write_queue.DeviceWriteQueue(window=0.2)
+    batches = [[f'interface Ethernet{i}', 'no shutdown'] for i in range(5)]
+    results = _submit_concurrently(queue, batches, executor)
+    assert len(calls) == 1
+    assert sorted(calls[0]) == sorted(batches)
+    assert set(results.values()) == {'committed'}
+
+
+def test_write_queue_fans_out_errors():
+    """
+    Test that a failed session raises in every waiting caller.
+    """
+    def executor(batches):
+        raise RuntimeError('commit failed')
+
+    queue = write_queue.DeviceWriteQueue(window=0.2)
+    batches = [[f'vlan {i}'] for i in range(3)]
+    results = _submit_concurrently(queue, batches, executor)
+    assert len(results) == 3
+    assert all(isinstance(r, RuntimeError) for r in results.values())
+
+
+def test_write_queue_sequential():
+    """
+    Test that a submission after a completed session starts a new one.
+    """
+    calls = []
+    queue = write_queue.DeviceWriteQueue(window=0)
+    queue.submit(['vlan 1'], calls.append)
+    queue.submit(['vlan 2'], calls.append)
+    assert calls == [[['vlan 1']], [['vlan 2']]]
+
+
+def test_write_queue_submit_batches():
+    """
+    Test that batches submitted together are kept as separate batches.
+    """
+    calls = []
+    queue = write_queue.DeviceWriteQueue(window=0)
+    queue.submit_batches([['vrf instance red'], ['vrf instance blue']], calls.append)
+    assert calls == [[['vrf instance red'], ['vrf instance blue']]]
+
+
+def test_get_write_queue():
+    queue = write_queue.get_write_queue('test-get-write-queue', 0.1)
+    assert write_queue.get_write_queue('test-get-write-queue', 0.5) is queue
+    assert queue.window == 0.5
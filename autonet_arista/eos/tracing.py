@@ -0,0 +1,161 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Callable, Iterable, Optional, Union
+
+
+class Span(object):
+    """
+    A timed operation within a trace.  Spans started while another span
+    is active in the same context become its children.
+    """
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'attributes',
+                 'status', 'start_time', 'end_time')
+
+    def __init__(self, name: str, parent: 'Span' = None, attributes: dict = None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = dict(attributes or {})
+        self.status = 'ok'
+        self.start_time = time.time_ns()
+        self.end_time = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'duration_ms': (self.end_time - self.start_time) / 1e6,
+            'status': self.status,
+            'attributes': self.attributes
+        }
+
+
+class FileExporter(object):
+    """
+    Writes finished spans to a file as JSON lines, one span per line,
+    for loading into a trace viewer or forwarding to a collector.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str) + '\n'
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', buffering=1)
+            self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+_current_span = contextvars.ContextVar('arista_current_span', default=None)
+
+
+def configure(path: Optional[str]):
+    """
+    Export spans to the file at `path`, or disable tracing if `path`
+    is empty.  Calling this again with the same path has no effect.
+
+    :param path: The file to write spans to.
+    :return:
+    """
+    global _exporter
+    with _exporter_lock:
+        if (_exporter.path if _exporter else None) == (path or None):
+            return
+        if _exporter:
+            _exporter.close()
+        _exporter = FileExporter(path) if path else None
+
+
+def get_exporter() -> Optional[FileExporter]:
+    """
+    Returns the span exporter, or None if tracing is disabled.
+
+    :return:
+    """
+    return _exporter
+
+
+@contextmanager
+def span(name: str, attributes: dict = None):
+    """
+    Trace the enclosed block as a span.  The span is marked as an error
+    if the block raises.  When tracing is disabled None is yielded and
+    nothing is recorded.
+
+    :param name: The span name.
+    :param attributes: Attributes to record on the span.
+    :return:
+    """
+    exporter = _exporter
+    if exporter is None:
+        yield None
+        return
+    current = Span(name, _current_span.get(), attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.status = 'error'
+        current.set_attribute('error', repr(e))
+        raise
+    finally:
+        current.end_time = time.time_ns()
+        _current_span.reset(token)
+        exporter.export(current)
+
+
+def traced(func: Callable) -> Callable:
+    """
+    Decorator that traces each call to `func` as a span named after the
+    function and its module.
+
+    :param func: The function to trace.
+    :return:
+    """
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _exporter is None:
+            return func(*args, **kwargs)
+        with span(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def get_command_attributes(commands: Union[str, Iterable[str]]) -> dict:
+    """
+    Returns the command count and request size attributes for a batch
+    of eAPI commands.
+
+    :param commands: A command or list of commands.
+    :return:
+    """
+    if isinstance(commands, str):
+        commands = [commands]
+    return {'eapi.command_count': len(commands),
+            'eapi.request_bytes': sum(len(command) for command in commands)}
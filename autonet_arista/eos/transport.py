@@ -0,0 +1,125 @@
+import ssl
+import threading
+
+from functools import lru_cache
+from http.client import HTTPConnection
+from typing import Hashable, Optional
+
+from pyeapi.eapilib import HttpsConnection, HttpsEapiConnection
+
+from autonet_arista.eos import metrics
+
+_tls_sessions = {}
+_tls_sessions_lock = threading.Lock()
+
+
+def get_tls_session(key: Hashable, context: ssl.SSLContext) -> Optional[ssl.SSLSession]:
+    """
+    Returns the TLS session saved for `key`, or None if there isn't
+    one.  Sessions can only be resumed with the context that created
+    them, so a session saved with a different context is ignored.
+
+    :param key: Identifies the device, typically its device ID.
+    :param context: The SSL context the session will be used with.
+    :return:
+    """
+    with _tls_sessions_lock:
+        saved_context, session = _tls_sessions.get(key, (None, None))
+    return session if saved_context is context else None
+
+
+def save_tls_session(key: Hashable, context: ssl.SSLContext,
+                     session: ssl.SSLSession):
+    """
+    Save a TLS session so that later connections to the same device
+    can resume it with an abbreviated handshake.
+
+    :param key: Identifies the device, typically its device ID.
+    :param context: The SSL context that created the session.
+    :param session: The session to save.
+    :return:
+    """
+    with _tls_sessions_lock:
+        _tls_sessions[key] = (context, session)
+
+
+class TimeoutHttpsConnection(HttpsConnection):
+    """
+    An eAPI HTTPS transport with separate connect and read timeouts.
+    The connect timeout covers the TCP connection and TLS handshake,
+    after which the socket timeout is changed to the read timeout for
+    the request itself.
+    """
+    def __init__(self, path, *args, read_timeout: float = None,
+                 session_key: Hashable = None, **kwargs):
+        super().__init__(path, *args, **kwargs)
+        self.read_timeout = read_timeout
+        self.session_key = session_key
+
+    def connect(self):
+        if self.session_key is None:
+            super().connect()
+        else:
+            # Same as HTTPSConnection.connect(), but offering the saved
+            # session so that the device can resume it.
+            HTTPConnection.connect(self)
+            server_hostname = self._tunnel_host or self.host
+            self.sock = self._context.wrap_socket(
+                self.sock, server_hostname=server_hostname,
+                session=get_tls_session(self.session_key, self._context))
+            if self.sock.session_reused:
+                metrics.increment('arista_tls_sessions_resumed_total',
+                                  device=str(self.session_key))
+        if self.read_timeout is not None:
+            self.sock.settimeout(self.read_timeout)
+
+    def close(self):
+        # TLS 1.3 session tickets arrive after the handshake, so the
+        # session is saved once the request is complete.
+        if self.session_key is not None and self.sock is not None:
+            session = getattr(self.sock, 'session', None)
+            if session is not None:
+                save_tls_session(self.session_key, self._context, session)
+        super().close()
+
+
+class EapiConnection(HttpsEapiConnection):
+    """
+    An eAPI connection using :py:class:`TimeoutHttpsConnection` as
+    its transport.  When `session_key` is given, TLS sessions are saved
+    under that key and resumed by later connections.
+    """
+    def __init__(self, host: str, username: str, password: str,
+                 context: ssl.SSLContext, connect_timeout: float,
+                 read_timeout: float, port: int = None, path: str = None,
+                 session_key: Hashable = None):
+        super().__init__(host, port=port, path=path, username=username,
+                         password=password, context=context,
+                         timeout=connect_timeout)
+        self.transport = TimeoutHttpsConnection(
+            self.transport.path, self.transport.host, self.transport.port,
+            context=context, timeout=connect_timeout,
+            read_timeout=read_timeout, session_key=session_key)
+
+
+@lru_cache(maxsize=None)
+def get_ssl_context(verify: bool, ciphers: str) -> ssl.SSLContext:
+    """
+    Returns the SSL context used for eAPI connections.  Contexts are
+    cached and shared by every connection with the same settings, since
+    creating one loads the system CA certificates.
+
+    :param verify: When False, certificate and hostname verification
+                   are disabled.
+    :param ciphers: The cipher list to offer, formatted as an OpenSSL
+                    cipher list.  See
+                    https://www.openssl.org/docs/man1.1.1/man1/ciphers.html
+                    for more information.
+    :return:
+    """
+    context = ssl.create_default_context()
+    if not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    context.set_ciphers(ciphers)
+    return context
@@ -1,5 +1,14 @@
-import logging
-import re
+import hashlib
+import json
+import math
+import random
+import sys
+
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+from autonet_arista.eos import patterns
+from autonet_arista.eos.const import IF_NAME_CACHE_SIZE
 
 
 def get_v6_mask_length(addr: str) -> str:
@@ -9,13 +18,67 @@ def get_v6_mask_length(addr: str) -> str:
     :param addr:
     :return:
     """
-    regex = r".*/([0-9]*)"
-    result = re.search(pattern=regex, string=addr)
-    try:
-        return result.group(1)
-    except Exception as e:
-        logging.exception(e)
+    _, separator, mask_length = addr.rpartition('/')
+    if not separator:
         raise ValueError(f"Could not parse prefix length from {addr}")
+    return mask_length
+
+
+class InterfaceName(NamedTuple):
+    """
+    Classification of an interface name as produced by
+    :py:func:`classify_if_name`.
+    """
+    name: str
+    """The fully qualified interface name."""
+    type: str
+    """The fully qualified interface type, such as "Port-Channel"."""
+    id: str
+    """The interface identifier, such as "22" or "52/1"."""
+    virtual: bool
+    """True if the interface is a virtual interface type."""
+    switchport: bool
+    """True if the interface supports switchport commands."""
+
+
+_fq_if_names = ['Ethernet', 'Loopback', 'Management', 'Port-Channel',
+                'Tunnel', 'Vlan', 'Vxlan']
+_virtual_if_types = ['Loopback', 'Port-Channel', 'Vlan']
+_switchport_if_types = ['Ethernet', 'Port-Channel']
+
+
+@lru_cache(maxsize=IF_NAME_CACHE_SIZE)
+def classify_if_name(if_name: str) -> InterfaceName:
+    """
+    Classifies an interface name, shorthand or fully qualified, and
+    returns an :py:class:`InterfaceName` record.  Results are cached
+    by the raw name since the same names are evaluated repeatedly
+    when generating and normalizing interface configuration.
+
+    :param if_name: The interface name.
+    :return:
+    """
+    match = patterns.IF_NAME.search(if_name)
+    if_type = match.group('if_type').lower()
+    if_id = match.group('if_id')
+    result = None
+    for fq_name in _fq_if_names:
+        # we track if we've matched the entry before to see if the string
+        # passed in is too ambiguous.  EOS does the same thing.
+        matched = fq_name.lower().startswith(if_type)
+        if matched and result:
+            raise ValueError("Provided shorthand name is ambiguous.")
+        if matched:
+            result = fq_name
+    if not result:
+        raise ValueError("Could not parse fully qualified interface name.")
+    return InterfaceName(
+        name=f'{result}{if_id}',
+        type=result,
+        id=if_id,
+        virtual=result in _virtual_if_types,
+        switchport=result in _switchport_if_types
+    )
 
 
 def is_virtual(name: str) -> bool:
@@ -25,11 +88,10 @@ def is_virtual(name: str) -> bool:
     :param name: The interface name.
     :return:
     """
-    if_type = re.search(r"([A-z-]*)\d*", name).group(1)
-    for virtual_type in ['loopback', 'vlan', 'port-channel']:
-        if if_type.lower() in virtual_type:
-            return True
-    return False
+    try:
+        return classify_if_name(name).virtual
+    except ValueError:
+        return False
 
 
 def is_switchport(name: str) -> bool:
@@ -39,8 +101,69 @@ def is_switchport(name: str) -> bool:
     :param name: The interface name.
     :return:
     """
-    if_type = re.search(r"([A-z-]*)\d*", name).group(1)
-    for virtual_type in ['ethernet', 'port-channel']:
-        if if_type.lower() in virtual_type:
-            return True
-    return False
+    try:
+        return classify_if_name(name).switchport
+    except ValueError:
+        return False
+
+
+def get_backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """
+    Returns the number of seconds to wait before retrying, using
+    exponential backoff with full jitter.
+
+    :param attempt: The number of attempts already made, starting at 0.
+    :param base: The delay ceiling for the first retry.
+    :param maximum: The maximum delay ceiling.
+    :return:
+    """
+    return random.uniform(0, min(maximum, base * 2 ** attempt))
+
+
+def get_commit_timer(seconds: float) -> str:
+    """
+    Returns a duration formatted for the `commit timer` command, rounded
+    up to a whole number of seconds.
+
+    :param seconds: The duration in seconds.
+    :return:
+    """
+    seconds = max(1, math.ceil(seconds))
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def get_fingerprint(value: Any) -> str:
+    """
+    Returns a digest of JSON serializable data, such that equal data
+    always has the same fingerprint.
+
+    :param value: The data to fingerprint.
+    :return:
+    """
+    data = json.dumps(value, sort_keys=True, default=str).encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+def intern_strings(value: Any) -> Any:
+    """
+    Returns a copy of decoded JSON data, or similar nested dicts and
+    lists, with every string key and value interned.  Names such as
+    interfaces, VRFs and route targets repeat many times across
+    outputs and devices, so interning data that is held in memory
+    lets each repeated string share one object.
+
+    :param value: The data to intern.
+    :return:
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {sys.intern(k) if isinstance(k, str) else k: intern_strings(v)
+                for k, v in value.items()}
+    if isinstance(value, list):
+        return [intern_strings(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(intern_strings(v) for v in value)
+    return value
@@ -0,0 +1,111 @@
+import threading
+import time
+
+from typing import Any, Callable, List, Union
+
+
+class PendingWrite(object):
+    """
+    One or more batches of configuration commands waiting in a
+    :py:class:`DeviceWriteQueue`, along with the outcome of the config
+    session they were eventually applied in.
+    """
+    def __init__(self, batches: List[List[str]]):
+        self.batches = batches
+        self.result = None
+        self.error = None
+        self._done = threading.Event()
+
+    def complete(self, result: Any = None, error: Exception = None):
+        self.result = result
+        self.error = error
+        self._done.set()
+
+    def wait(self) -> Any:
+        self._done.wait()
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class DeviceWriteQueue(object):
+    """
+    Coalesces configuration commands submitted for a single device.
+
+    The first caller to submit commands becomes the leader.  It waits
+    for `window` seconds, collecting commands submitted by other
+    callers in the meantime, then applies every collected batch in a
+    single config session.  The outcome of that session is returned
+    (or raised) to every caller whose commands were included.
+    """
+    def __init__(self, window: float):
+        self.window = window
+        self._lock = threading.Lock()
+        self._pending: List[PendingWrite] = []
+        self._leader_active = False
+
+    def submit(self, commands: List[str],
+               executor: Callable[[List[List[str]]], Any]) -> Any:
+        """
+        Submit commands to the queue and block until they have been
+        applied.
+
+        :param commands: The configuration commands to apply.
+        :param executor: Called by the leader with the list of command
+                         batches to apply in one config session.
+        :return: The value returned by `executor`.
+        """
+        return self.submit_batches([commands], executor)
+
+    def submit_batches(self, batches: List[List[str]],
+                       executor: Callable[[List[List[str]]], Any]) -> Any:
+        """
+        Submit several batches of commands to the queue, to be applied
+        together in the same config session, and block until they have
+        been applied.
+
+        :param batches: The batches of configuration commands to apply.
+        :param executor: Called by the leader with the list of command
+                         batches to apply in one config session.
+        :return: The value returned by `executor`.
+        """
+        pending = PendingWrite(batches)
+        with self._lock:
+            self._pending.append(pending)
+            leader = not self._leader_active
+            self._leader_active = True
+        if leader:
+            time.sleep(self.window)
+            with self._lock:
+                batch, self._pending = self._pending, []
+                self._leader_active = False
+            try:
+                result = executor([commands for p in batch for commands in p.batches])
+            except Exception as e:
+                for p in batch:
+                    p.complete(error=e)
+            else:
+                for p in batch:
+                    p.complete(result=result)
+        return pending.wait()
+
+
+_write_queues = {}
+_write_queues_lock = threading.Lock()
+
+
+def get_write_queue(device_id: Union[str, int], window: float) -> DeviceWriteQueue:
+    """
+    Returns the write queue for a given device, creating it if required.
+
+    :param device_id: The device ID.
+    :param window: The number of seconds to collect commands before
+                   applying them.
+    :return:
+    """
+    with _write_queues_lock:
+        if device_id not in _write_queues:
+            _write_queues[device_id] = DeviceWriteQueue(window)
+        queue = _write_queues[device_id]
+        queue.window = window
+        return queue
@@ -0,0 +1,194 @@
+"""
+Benchmark for parsing interfaces with many addresses.
+
+Builds Interface objects for a large set of routed SVIs, each with
+secondary IPv4 addresses and an IPv6 address.  The baseline is a copy
+of the functions `_interface_read` used before, which parsed one
+interface at a time, rebuilding the VRF map and validating every
+address for each.  It is compared with the batch path, which builds the
+VRF and LAG maps once and reuses validated addresses between reads.
+
+Run from the repository root with ``python -m benchmarks.bench_addresses``.
+"""
+import logging
+import re
+import timeit
+
+from autonet.core.objects import interfaces as an_if
+
+from autonet_arista.eos.const import DESCRIPTION_TAG, VIRTUAL_INTERFACE_TYPES
+from autonet_arista.eos.tasks import interface as if_task
+
+SVIS = 2000
+SECONDARIES = 2
+VRFS = 20
+ROUNDS = 3
+
+
+def _baseline_get_v6_mask_length(addr: str) -> str:
+    result = re.search(pattern=r".*/([0-9]*)", string=addr)
+    try:
+        return result.group(1)
+    except Exception as e:
+        logging.exception(e)
+        raise ValueError(f"Could not parse prefix length from {addr}")
+
+
+def _baseline_get_ipv4_addresses(addr_list: list) -> list:
+    addresses = []
+    for if_addr in addr_list:
+        if if_addr['primaryIp']['maskLen'] != 0:
+            addr_key = 'primaryIp'
+        elif if_addr['virtualIp']['maskLen'] != 0:
+            addr_key = 'virtualIp'
+        else:
+            continue
+        addr_type = 'anycast' if addr_key == 'virtualIp' else None
+        ip_addr = f"{if_addr[addr_key]['address']}/{if_addr[addr_key]['maskLen']}"
+        addresses.append(an_if.InterfaceAddress(
+            family='ipv4',
+            address=ip_addr,
+            virtual=True if addr_type else False,
+            virtual_type=addr_type
+        ))
+        for _, secondary in if_addr['secondaryIps'].items():
+            ip_addr = f"{secondary['address']}/{secondary['maskLen']}"
+            addresses.append(an_if.InterfaceAddress(
+                family='ipv4',
+                address=ip_addr,
+                virtual=False,
+                virtual_type=None
+            ))
+    return addresses
+
+
+def _baseline_get_ipv6_addresses(addr_list: list, virtual: bool) -> list:
+    addresses = []
+    addr_type = 'anycast' if virtual else None
+    for if_addr in addr_list:
+        v6_mask = _baseline_get_v6_mask_length(if_addr['subnet'])
+        addresses.append(an_if.InterfaceAddress(
+            family='ipv6',
+            address=f"{if_addr['address']}/{v6_mask}",
+            virtual=True if addr_type else False,
+            virtual_type=addr_type
+        ))
+    return addresses
+
+
+def _baseline_get_route_attributes(interface: dict, eos_vrfs: dict) \
+        -> an_if.InterfaceRouteAttributes:
+    addresses = _baseline_get_ipv4_addresses(interface['interfaceAddress'])
+    if 'interfaceAddressIp6' in interface:
+        addresses += _baseline_get_ipv6_addresses(
+            interface['interfaceAddressIp6']['globalUnicastIp6s'],
+            interface['interfaceAddressIp6']['globalAddressesAreVirtual'])
+    vrf_map = if_task.get_interface_vrf_map(eos_vrfs)
+    return an_if.InterfaceRouteAttributes(
+        vrf=vrf_map[interface['name']] if interface['name'] in vrf_map else None,
+        addresses=addresses
+    )
+
+
+def _baseline_get_interface_object(eos_interface: dict, eos_interfaces_vlans: dict,
+                                   eos_vrfs: dict, eos_lags: dict) -> an_if.Interface:
+    duplex = eos_interface['duplex'] if 'duplex' in eos_interface else 'duplexFull'
+    duplex = 'full' if duplex and duplex == 'duplexFull' else 'half'
+    speed = eos_interface['bandwidth'] / 1000000 if 'bandwidth' in eos_interface and eos_interface[
+        'bandwidth'] else None
+    physical_address = eos_interface['physicalAddress'] \
+        if 'physicalAddress' in eos_interface \
+        else '00:00:00:00:00:00'
+    parent = re.findall(r"^([\w-]*)\.\d*$", eos_interface['name'])
+    parent = parent[0] if len(parent) == 1 else None
+    if eos_interface['forwardingModel'] == 'dataLink':
+        mode = 'aggregated'
+        parent = if_task.get_lag_map(eos_lags)[eos_interface['name']]
+    else:
+        mode = eos_interface['forwardingModel']
+    if mode == 'aggregated':
+        attributes = None
+    elif mode == 'routed':
+        attributes = _baseline_get_route_attributes(eos_interface, eos_vrfs)
+    else:
+        attributes = if_task.get_bridge_attributes(eos_interface, eos_interfaces_vlans)
+    return an_if.Interface(
+        name=eos_interface['name'],
+        mode=mode,
+        description=eos_interface['description'].removesuffix(DESCRIPTION_TAG),
+        virtual=True if eos_interface['hardware'] in VIRTUAL_INTERFACE_TYPES else False,
+        attributes=attributes,
+        admin_enabled=True if eos_interface['interfaceStatus'] != 'disabled' else False,
+        physical_address=physical_address,
+        child=True if parent else False,
+        parent=parent,
+        speed=int(speed) if speed else None,
+        duplex=duplex,
+        mtu=eos_interface['mtu'] if 'mtu' in eos_interface else 65535
+    )
+
+
+def _address(address: str, mask_len: int) -> dict:
+    return {'address': address, 'maskLen': mask_len}
+
+
+def _eos_interface(vlan_id: int) -> dict:
+    a, b = divmod(vlan_id, 256)
+    return {
+        'name': f'Vlan{vlan_id}',
+        'forwardingModel': 'routed',
+        'hardware': 'vlan',
+        'description': '',
+        'interfaceStatus': 'connected',
+        'physicalAddress': '0c:fe:87:5f:8c:bd',
+        'mtu': 1500,
+        'interfaceAddress': [{
+            'primaryIp': _address(f'10.{a}.{b}.1', 24),
+            'virtualIp': _address('0.0.0.0', 0),
+            'secondaryIps': {
+                f'10.{100 + i}.{b}.1': _address(f'10.{100 + i}.{b}.1', 24)
+                for i in range(SECONDARIES)
+            },
+        }],
+        'interfaceAddressIp6': {
+            'globalUnicastIp6s': [{'address': f'2001:db8:{vlan_id:x}::1',
+                                   'subnet': f'2001:db8:{vlan_id:x}::/64'}],
+            'globalAddressesAreVirtual': False,
+        },
+    }
+
+
+def main():
+    eos_interfaces = [_eos_interface(vlan_id) for vlan_id in range(2, SVIS + 2)]
+    eos_vrfs = {'vrfs': {f'vrf{i}': {'interfaces': [
+        interface['name'] for interface in eos_interfaces[i::VRFS]]}
+        for i in range(VRFS)}}
+    eos_interfaces_vlans = {'interfaces': {}}
+    eos_lags = {'portChannels': {}}
+
+    def baseline():
+        for eos_interface in eos_interfaces:
+            _baseline_get_interface_object(eos_interface, eos_interfaces_vlans,
+                                           eos_vrfs, eos_lags)
+
+    def batch():
+        if_task.get_interface_objects(eos_interfaces, eos_interfaces_vlans,
+                                      eos_vrfs, eos_lags)
+
+    def batch_cold():
+        if_task._get_validated_address.cache_clear()
+        batch()
+
+    addresses = SVIS * (SECONDARIES + 2)
+    print(f'{SVIS} interfaces, {addresses} addresses')
+    results = {}
+    for name, func in [('baseline', baseline),
+                       ('batch, cold', batch_cold), ('batch', batch)]:
+        results[name] = min(timeit.repeat(func, number=1, repeat=ROUNDS))
+    for name, elapsed in results.items():
+        speedup = results['baseline'] / elapsed
+        print(f'{name + ":":15} {elapsed * 1e3:7.1f} ms/read  ({speedup:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
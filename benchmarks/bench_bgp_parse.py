@@ -0,0 +1,58 @@
+"""
+Benchmark for incremental BGP configuration parsing.
+
+Parses a BGP configuration with many VRFs and VLANs in full, and
+incrementally after a change to a single VRF, as happens when a device
+is read again after a small change.
+
+Run from the repository root with ``python -m benchmarks.bench_bgp_parse``.
+"""
+import timeit
+
+from autonet_arista.eos.tasks import common as common_task
+
+VRFS = 1000
+VLANS = 1000
+ROUNDS = 20
+
+
+def _bgp_text_config(changed_vrf: int = None) -> str:
+    lines = ['router bgp 65002', '   router-id 198.18.0.101']
+    for vlan_id in range(1, VLANS + 1):
+        lines += [f'   vlan {vlan_id}',
+                  f'      rd 198.18.0.101:{vlan_id}',
+                  f'      route-target both 65002:{vlan_id}',
+                  '      redistribute learned']
+    for i in range(VRFS):
+        rd = 9999 if i == changed_vrf else i
+        lines += [f'   vrf vrf{i}',
+                  f'      rd 198.18.0.101:{rd}',
+                  f'      route-target import evpn 65002:{i}',
+                  f'      route-target export evpn 65002:{i}',
+                  f'      route-target both vpn-ipv4 65002:{i}',
+                  '      redistribute connected']
+    return '\n'.join(lines)
+
+
+def main():
+    texts = [_bgp_text_config(changed_vrf=i % VRFS) for i in range(ROUNDS)]
+    cache = common_task.BgpParseCache()
+    common_task.parse_bgp_vpn_config(_bgp_text_config(), cache=cache)
+
+    def full():
+        for text in texts:
+            common_task.parse_bgp_vpn_config(text)
+
+    def incremental():
+        for text in texts:
+            common_task.parse_bgp_vpn_config(text, cache=cache)
+
+    full_time = min(timeit.repeat(full, number=1, repeat=3)) / ROUNDS
+    incremental_time = min(timeit.repeat(incremental, number=1, repeat=3)) / ROUNDS
+    print(f'full:        {full_time * 1e3:.1f} ms/parse')
+    print(f'incremental: {incremental_time * 1e3:.1f} ms/parse')
+    print(f'speedup:     {full_time / incremental_time:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
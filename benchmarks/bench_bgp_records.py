@@ -0,0 +1,52 @@
+"""
+Memory benchmark for parsed BGP configuration records.
+
+Compares the memory held by a parsed BGP configuration with many VRFs
+and VLANs, using the slotted records returned by
+:py:func:`autonet_arista.eos.tasks.common.parse_bgp_vpn_config`, with
+the same data held as nested dicts.
+
+Run from the repository root with ``python -m benchmarks.bench_bgp_records``.
+"""
+import tracemalloc
+
+from collections.abc import Mapping
+
+from autonet_arista.eos.tasks import common as common_task
+from benchmarks.bench_bgp_parse import _bgp_text_config
+
+
+def _to_dicts(value):
+    if isinstance(value, Mapping):
+        return {key: _to_dicts(item) for key, item in value.items()}
+    return value
+
+
+def _measure(factory) -> (object, int):
+    tracemalloc.start()
+    result = factory()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    text = _bgp_text_config()
+    records = common_task.parse_bgp_vpn_config(text)
+    # Strings are shared by both representations, so only the
+    # containers are measured.
+    _, records_size = _measure(lambda: {
+        'vrfs': {name: common_task.BgpVrfNode(_to_dicts(node))
+                 for name, node in records['vrfs'].items()},
+        'vlans': {vlan_id: common_task.BgpVlanNode(_to_dicts(node))
+                  for vlan_id, node in records['vlans'].items()}})
+    _, dicts_size = _measure(lambda: _to_dicts(records))
+    nodes = len(records['vrfs']) + len(records['vlans'])
+    print(f'nodes:   {nodes}')
+    print(f'dicts:   {dicts_size / 1024:.0f} KiB ({dicts_size / nodes:.0f} B/node)')
+    print(f'records: {records_size / 1024:.0f} KiB ({records_size / nodes:.0f} B/node)')
+    print(f'saving:  {1 - records_size / dicts_size:.0%}')
+
+
+if __name__ == '__main__':
+    main()
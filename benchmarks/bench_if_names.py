@@ -0,0 +1,90 @@
+"""
+Micro-benchmark for interface name classification.
+
+Compares the cached classification layer in
+:py:mod:`autonet_arista.eos.tasks.common` and :py:mod:`autonet_arista.eos.util`
+with the regex based functions it replaced, which are copied below.
+
+Run from the repository root with ``python -m benchmarks.bench_if_names``.
+"""
+import re
+import timeit
+
+from autonet_arista.eos import util
+from autonet_arista.eos.tasks import common as common_task
+
+NAMES = [f'Ethernet{i}/1' for i in range(1, 49)] + \
+        [f'eth{i}' for i in range(1, 49)] + \
+        [f'Po{i}' for i in range(1, 33)] + \
+        [f'vl{i}' for i in range(100, 132)] + \
+        ['Loopback0', 'lo1', 'Vxlan1', 'Management1']
+ROUNDS = 200
+
+
+def _baseline_get_fq_if_name(if_name: str) -> str:
+    match = re.search(r'(?P<if_type>[A-z-]*)(?P<if_id>[\d/]*)', if_name)
+    if_type = match.group('if_type')
+    if_id = match.group('if_id')
+    fq_names = ['Ethernet', 'Loopback', 'Management', 'Port-Channel',
+                'Tunnel', 'Vlan', 'Vxlan']
+    result = None
+    for fq_name in fq_names:
+        matched = fq_name.lower().startswith(if_type.lower())
+        if matched and result:
+            raise ValueError("Provided shorthand name is ambiguous.")
+        if matched:
+            result = f'{fq_name}{if_id}'
+    if result:
+        return result
+    raise ValueError("Could not parse fully qualified interface name.")
+
+
+def _baseline_get_if_parts(if_name: str):
+    fq_name = _baseline_get_fq_if_name(if_name)
+    matches = re.search(r'(?P<if_name>\D*)(?P<if_id>[\d/]*)$', fq_name)
+    return matches.group('if_name'), matches.group('if_id')
+
+
+def _baseline_is_virtual(name: str) -> bool:
+    if_type = re.search(r"([A-z-]*)\d*", name).group(1)
+    for virtual_type in ['loopback', 'vlan', 'port-channel']:
+        if if_type.lower() in virtual_type:
+            return True
+    return False
+
+
+def _baseline_is_switchport(name: str) -> bool:
+    if_type = re.search(r"([A-z-]*)\d*", name).group(1)
+    for virtual_type in ['ethernet', 'port-channel']:
+        if if_type.lower() in virtual_type:
+            return True
+    return False
+
+
+def _baseline():
+    for name in NAMES:
+        _baseline_get_fq_if_name(name)
+        _baseline_get_if_parts(name)
+        _baseline_is_virtual(name)
+        _baseline_is_switchport(name)
+
+
+def _cached():
+    for name in NAMES:
+        common_task.get_fq_if_name(name)
+        common_task.get_if_parts(name)
+        util.is_virtual(name)
+        util.is_switchport(name)
+
+
+def main():
+    baseline = min(timeit.repeat(_baseline, number=ROUNDS, repeat=5))
+    cached = min(timeit.repeat(_cached, number=ROUNDS, repeat=5))
+    calls = len(NAMES) * ROUNDS
+    print(f'baseline: {baseline / calls * 1e6:.3f} us/name')
+    print(f'cached:   {cached / calls * 1e6:.3f} us/name')
+    print(f'speedup:  {baseline / cached:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Memory benchmark for interning cached device outputs.
+
+Builds a synthetic cache of decoded `show interfaces`, `show interfaces
+vlans` and `show vrf` outputs for 1000 devices, with and without
+:py:func:`autonet_arista.eos.util.intern_strings`, and reports the peak
+RSS of each.  Each variant runs in its own process so that the peaks
+don't overlap.
+
+Run from the repository root with ``python -m benchmarks.bench_intern``.
+"""
+import json
+import resource
+import subprocess
+import sys
+
+from autonet_arista.eos.util import intern_strings
+
+DEVICES = 1000
+INTERFACES = 52
+VRFS = 20
+
+
+def _device_outputs(device: int) -> str:
+    interfaces = {}
+    vlans = {}
+    for i in range(1, INTERFACES + 1):
+        name = f'Ethernet{i}'
+        interfaces[name] = {
+            'name': name, 'hardware': 'ethernet', 'forwardingModel': 'bridged',
+            'interfaceStatus': 'connected', 'description': '', 'mtu': 9214,
+            'duplex': 'duplexFull', 'bandwidth': 25000000000,
+            'physicalAddress': f'00:1c:73:{device % 256:02x}:00:{i:02x}',
+            'interfaceAddress': [],
+        }
+        vlans[name] = {'untaggedVlan': 10, 'taggedVlans': [10, 20, 30]}
+    vrfs = {f'tenant-{v}': {
+        'routeDistinguisher': f'198.18.{device // 256}.{device % 256}:{v}',
+        'protocols': {'ipv4': {'routingState': 'up'}, 'ipv6': {'routingState': 'down'}},
+        'interfaces': [f'Vlan{100 + v}'],
+    } for v in range(VRFS)}
+    # Decode from JSON, as eAPI responses are, so that no strings are
+    # shared between devices to begin with.
+    return json.dumps([{'interfaces': interfaces}, {'interfaces': vlans}, {'vrfs': vrfs}])
+
+
+def _build_cache(intern: bool):
+    cache = {}
+    for device in range(DEVICES):
+        outputs = json.loads(_device_outputs(device))
+        cache[f'device{device}'] = intern_strings(outputs) if intern else outputs
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(peak)
+
+
+def main():
+    if len(sys.argv) > 1:
+        _build_cache(sys.argv[1] == 'intern')
+        return
+    results = {}
+    for variant in ('plain', 'intern'):
+        output = subprocess.run([sys.executable, '-m', 'benchmarks.bench_intern', variant],
+                                capture_output=True, text=True, check=True).stdout
+        results[variant] = int(output.strip())
+    print(f'devices:       {DEVICES}')
+    print(f'peak RSS:      {results["plain"] / 1024:.0f} MiB')
+    print(f'interned peak: {results["intern"] / 1024:.0f} MiB')
+    print(f'saving:        {1 - results["intern"] / results["plain"]:.0%}')
+
+
+if __name__ == '__main__':
+    main()
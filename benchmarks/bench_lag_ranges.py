@@ -0,0 +1,65 @@
+"""
+Benchmark for LAG member range compression.
+
+Compares the commands generated for LAGs with many members against
+configuring each member individually, as the driver did previously.
+Commit time on a device scales with the number of commands EOS has to
+process, so the command count and the size of the eAPI request body
+are reported alongside the generation time.
+
+Run from the repository root with ``python -m benchmarks.bench_lag_ranges``.
+"""
+import json
+import timeit
+
+from autonet.core.objects import lag as an_lag
+
+from autonet_arista.eos.tasks import common as common_task
+from autonet_arista.eos.tasks import lag as lag_task
+
+LAGS = {
+    '16 members': an_lag.LAG(name='Port-Channel10', evpn_esi=None,
+                             members=[f'Ethernet1/{i}' for i in range(1, 17)]),
+    '32 members': an_lag.LAG(name='Port-Channel20', evpn_esi=None,
+                             members=[f'Ethernet{i}' for i in range(1, 33)]),
+    '2x16 members': an_lag.LAG(name='Port-Channel30', evpn_esi=None,
+                               members=[f'Ethernet{m}/{i}' for m in (3, 4)
+                                        for i in range(1, 17)]),
+}
+ROUNDS = 2000
+
+
+def _per_member_commands(lag: an_lag.LAG) -> [str]:
+    commands = [f'interface {lag.name}']
+    _, lag_id = common_task.get_if_parts(lag.name)
+    for member in lag.members:
+        commands += [
+            f'default interface {member}',
+            f'interface {member}',
+            f'channel-group {lag_id} mode active'
+        ]
+    return commands
+
+
+def _request_size(commands: [str]) -> int:
+    return len(json.dumps({'jsonrpc': '2.0', 'method': 'runCmds',
+                           'params': {'version': 1, 'cmds': commands}}))
+
+
+def main():
+    for label, lag in LAGS.items():
+        before = _per_member_commands(lag)
+        after = lag_task.generate_lag_create_commands(lag)
+        before_time = min(timeit.repeat(lambda: _per_member_commands(lag),
+                                        number=ROUNDS, repeat=5))
+        after_time = min(timeit.repeat(lambda: lag_task.generate_lag_create_commands(lag),
+                                       number=ROUNDS, repeat=5))
+        print(f'{label}:')
+        print(f'  commands:      {len(before)} -> {len(after)}')
+        print(f'  request bytes: {_request_size(before)} -> {_request_size(after)}')
+        print(f'  generation:    {before_time / ROUNDS * 1e6:.1f} us -> '
+              f'{after_time / ROUNDS * 1e6:.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark for the precompiled regular expressions in
+:py:mod:`autonet_arista.eos.patterns`.
+
+Matches representative lines with each pattern precompiled, and with
+the pattern passed to `re.search` as a string as the task functions
+used to.  Inline patterns are looked up in the `re` module's cache on
+every call, and recompiled when other code has evicted them, which is
+measured by purging the cache between rounds.
+
+Run from the repository root with ``python -m benchmarks.bench_patterns``.
+"""
+import re
+import timeit
+
+from autonet_arista.eos import patterns
+
+ROUNDS = 10000
+SAMPLES = [
+    (patterns.BGP_ASN, 'router bgp 65002'),
+    (patterns.BGP_RID, '   router-id 198.18.0.101'),
+    (patterns.BGP_VLAN, '   vlan 100'),
+    (patterns.BGP_VRF, '   vrf blue'),
+    (patterns.BGP_RT, '      route-target import evpn 65002:100'),
+    (patterns.BGP_RD, '      rd 198.18.0.101:100'),
+    (patterns.LAG_IF_CONTEXT, 'interface Port-Channel10'),
+    (patterns.LAG_ESI, '      identifier 0000:0000:0000:0000:0010'),
+    (patterns.IF_NAME, 'Ethernet1/1'),
+    (patterns.WHITESPACE, 'vlan-name'),
+]
+
+
+def main():
+    def precompiled():
+        for pattern, line in SAMPLES:
+            pattern.search(line)
+
+    def inline():
+        for pattern, line in SAMPLES:
+            re.search(pattern.pattern, line)
+
+    def inline_cold():
+        re.purge()
+        inline()
+
+    calls = ROUNDS * len(SAMPLES)
+    results = {}
+    for name, func in [('precompiled', precompiled), ('inline', inline),
+                       ('inline, cold', inline_cold)]:
+        elapsed = min(timeit.repeat(func, number=ROUNDS, repeat=3))
+        results[name] = elapsed / calls
+    for name, per_call in results.items():
+        speedup = per_call / results['precompiled']
+        print(f'{name + ":":14} {per_call * 1e9:7.0f} ns/match  ({speedup:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()